@@ -1,14 +1,24 @@
 # This makes the scripts directory a Python package
-from .publish_posts import main
-from .convert_markdown import MarkdownConverter
-from .publish_medium import MediumPublisher
-from .publish_devto import DevToPublisher
-from .post_tracker import PostTracker
+from importlib import import_module
 
-__all__ = [
-    'main',
-    'MarkdownConverter',
-    'MediumPublisher',
-    'DevToPublisher',
-    'PostTracker'
-]
\ No newline at end of file
+# Public names and the modules defining them. They are imported on first access,
+# so importing one module (e.g. scripts.post_tracker) does not load every publisher.
+_EXPORTS = {
+    'main': 'publish_posts',
+    'MarkdownConverter': 'convert_markdown',
+    'BasePublisher': 'base_publisher',
+    'PublisherRegistry': 'publisher_registry',
+    'register_publisher': 'publisher_registry',
+    'MediumPublisher': 'publish_medium',
+    'DevToPublisher': 'publish_devto',
+    'PostTracker': 'post_tracker'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,93 @@
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json
+import threading
+import time
+from .utils.hashing import text_digest
+from .utils.journal import write_json_atomic
+from .utils.logger import get_logger
+from .config.settings import Settings
+
+class AccountCache:
+    """Per-account platform metadata (such as the Medium user ID) reused between runs"""
+
+    def __init__(self, base_dir: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Initialize the cache in the tracking directory
+
+        The file is gitignored: its keys are fingerprints of the credentials.
+
+        Args:
+            base_dir: Project root (defaults to the current directory)
+            ttl: Seconds an entry stays valid (defaults to Settings.ACCOUNT_CACHE_TTL)
+        """
+        base_dir = Path(base_dir) if base_dir else Path.cwd()
+        self.cache_file = base_dir / '.tracking' / 'account_cache.json'
+        self.ttl = Settings.ACCOUNT_CACHE_TTL if ttl is None else ttl
+        self.logger = get_logger(__name__)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if self.cache_file.exists():
+            try:
+                with self.cache_file.open('r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable account cache: {e}")
+
+    @staticmethod
+    def account_key(platform: str, credential: Optional[str]) -> str:
+        """
+        Identify an account without storing its credential
+
+        A rotated token maps to a new key, so metadata of the old account is
+        never reused.
+        """
+        return f"{platform}:{text_digest(credential or '')[:16]}"
+
+    def get(self, platform: str, credential: Optional[str], field: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            platform: Platform the account belongs to
+            credential: API token or key of the account
+            field: Metadata name
+
+        Returns:
+            The value, or None if it is missing or older than the TTL
+        """
+        with self.lock:
+            entry = self.entries.get(self.account_key(platform, credential), {}).get(field)
+        if not entry or time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        return entry.get('value')
+
+    def set(self, platform: str, credential: Optional[str], field: str, value: Any):
+        """
+        Store a value and persist the cache
+
+        Args:
+            platform: Platform the account belongs to
+            credential: API token or key of the account
+            field: Metadata name
+            value: JSON serializable value
+        """
+        with self.lock:
+            account = self.entries.setdefault(self.account_key(platform, credential), {})
+            account[field] = {'value': value, 'fetched_at': time.time()}
+            self._save()
+
+    def invalidate(self, platform: str, credential: Optional[str]):
+        """Forget everything cached for an account"""
+        with self.lock:
+            if self.entries.pop(self.account_key(platform, credential), None) is not None:
+                self._save()
+
+    def _save(self):
+        """Write the cache file (caller holds the lock)"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.cache_file, self.entries)
+        except OSError as e:
+            # The cache only saves a round trip, failing to persist it is not fatal
+            self.logger.warning(f"Could not save account cache: {e}")
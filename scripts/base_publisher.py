@@ -0,0 +1,160 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import time
+import requests
+from .utils.logger import get_logger
+from .utils.http import create_session, check_response_status, classify_request_error
+from .utils.rate_limiter import TokenBucket, rate_limited_request
+from .utils.validators import validate_publication_data
+from .utils.metrics import metrics
+from .utils.tracing import tracer
+from .config.settings import Settings
+
+class BasePublisher:
+    """
+    Plugin interface shared by every platform publisher
+
+    Subclasses set ``platform`` and implement ``publish`` or
+    ``publish_async`` (each defaults to the other), ``_prepare_content`` and
+    ``extract_reference``. The pooled session, token bucket, error
+    classification and Settings-driven construction are provided here.
+    """
+    # Platform name used in Settings.PLATFORMS, tracking data and errors
+    platform: str = ''
+    # Whether find_existing can verify publications interrupted by a crash
+    supports_lookup = False
+    # Converted post representation sent as the body ('html' or 'markdown')
+    content_format = 'html'
+    # Fields the prepared API payload must contain
+    required_fields: List[str] = []
+
+    def __init__(self, headers: Dict[str, str], pool_size: int = 4, rate_limit: Optional[float] = None,
+                 rate_burst: Optional[int] = None, api_base: Optional[str] = None):
+        """
+        Initialize the shared HTTP plumbing
+
+        Args:
+            headers: Default headers sent with every request
+            pool_size: Maximum kept-alive connections (match the platform concurrency)
+            rate_limit: Requests per minute (defaults to the platform config)
+            rate_burst: Token bucket capacity (defaults to the platform config)
+            api_base: API root URL (defaults to the platform config)
+        """
+        config = Settings.get_platform_config(self.platform)
+        self.api_base = (api_base or config.get('api_base', '')).rstrip('/')
+        self.logger = get_logger(type(self).__module__)
+        self.headers = headers
+        # Shared keep-alive session reused by every API call
+        self.session = create_session(self.headers, pool_size=pool_size)
+        # Every API call passes through the platform token bucket (rate_limit is per minute)
+        rate_limit = config.get('rate_limit', 60) if rate_limit is None else rate_limit
+        rate_burst = config.get('rate_burst', Settings.RATE_LIMIT_BURST) if rate_burst is None else rate_burst
+        self.rate_limiter = TokenBucket(rate=rate_limit / 60.0, capacity=rate_burst)
+
+    @classmethod
+    def from_settings(cls, account_cache: Optional[Any] = None) -> 'BasePublisher':
+        """
+        Create a publisher from its platform config
+
+        Args:
+            account_cache: Per-account metadata cache, for publishers that use one
+
+        Returns:
+            Publisher with a connection pool sized to the platform concurrency
+        """
+        config = Settings.get_platform_config(cls.platform)
+        return cls(config.get('credential'), pool_size=config.get('concurrency', 1))
+
+    def close(self):
+        """Close the pooled HTTP session"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send an API request through the rate limiter and classify failures"""
+        start = time.perf_counter()
+        status = 'error'
+        with tracer.span('http', category='http', method=method, url=url) as span:
+            try:
+                response = rate_limited_request(
+                    self.session, self.rate_limiter, self.platform, method, url,
+                    default_delay=Settings.RATE_LIMIT_DELAY,
+                    wait_timeout=Settings.RATE_LIMIT_DELAY,
+                    **kwargs
+                )
+                status = str(response.status_code)
+            except requests.RequestException as e:
+                raise classify_request_error(e, method, self.platform)
+            finally:
+                span.set(http_status=status)
+                # Includes time spent waiting for rate limit tokens
+                metrics.observe('http_request_seconds', time.perf_counter() - start,
+                                platform=self.platform, method=method, status=status)
+        check_response_status(response, self.platform)
+        return response
+
+    def validate_payload(self, payload: Dict[str, Any]):
+        """
+        Check a prepared payload carries the platform's required fields
+
+        Raises:
+            ValidationError: If a required field is missing
+        """
+        validate_publication_data(payload, self.platform, self.required_fields)
+
+    def build_payload(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Build and validate the API payload of a converted post, timing the stage"""
+        with metrics.timer('payload', platform=self.platform):
+            return self._prepare_content(content)
+
+    def _prepare_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the API payload for a converted post"""
+        raise NotImplementedError
+
+    def extract_reference(self, result: Dict[str, Any]) -> Tuple[Optional[str], Optional[Any]]:
+        """Extract the post URL and platform ID from a publish result"""
+        raise NotImplementedError
+
+    def find_existing(self, title: str) -> Optional[Dict[str, Any]]:
+        """Look up an existing post by title (platforms without a listing API return None)"""
+        return None
+
+    def publish(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Publish a converted post
+
+        Args:
+            content: Converted post
+
+        Returns:
+            Platform API response data
+
+        Raises:
+            PublishError: If publication fails
+        """
+        if type(self).publish_async is BasePublisher.publish_async:
+            raise NotImplementedError(f"{type(self).__name__} implements neither publish nor publish_async")
+        # Called from engine worker threads, which have no running event loop
+        return asyncio.run(self.publish_async(content))
+
+    async def publish_async(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Publish a converted post from a coroutine
+
+        Args:
+            content: Converted post
+
+        Returns:
+            Platform API response data
+
+        Raises:
+            PublishError: If publication fails
+        """
+        if type(self).publish is BasePublisher.publish:
+            raise NotImplementedError(f"{type(self).__name__} implements neither publish nor publish_async")
+        return await asyncio.to_thread(self.publish, content)
@@ -0,0 +1,15 @@
+# Benchmark suite: synthetic corpora, stub publishers and baseline comparison
+from .corpus import generate_corpus
+from .fake_api import FakeApiConfig, FakeApiServer, LatencyModel
+from .suite import BENCHMARKS, TIERS, compare_reports, run_suite
+
+__all__ = [
+    'generate_corpus',
+    'FakeApiConfig',
+    'FakeApiServer',
+    'LatencyModel',
+    'BENCHMARKS',
+    'TIERS',
+    'compare_reports',
+    'run_suite'
+]
@@ -0,0 +1,132 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import argparse
+import logging
+import sys
+import time
+from . import stubs
+from .fake_api import FakeApiConfig, FakeApiServer, LatencyModel
+from .suite import BENCHMARKS, TIERS, compare_reports, load_report, run_suite, save_report
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """Render comparison rows as a text table"""
+    def seconds(value: Optional[float]) -> str:
+        return '-' if value is None else f"{value * 1000:.1f}ms"
+
+    lines = [f"{'tier':<5} {'benchmark':<22} {'baseline':>12} {'current':>12} {'change':>8}  status"]
+    for row in rows:
+        change = '-' if row['ratio'] is None else f"{(row['ratio'] - 1) * 100:+.1f}%"
+        lines.append(
+            f"{row['tier']:<5} {row['benchmark']:<22} {seconds(row['baseline']):>12} "
+            f"{seconds(row['current']):>12} {change:>8}  {row['status']}"
+        )
+    return '\n'.join(lines)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(prog='python -m scripts.benchmarks',
+                                     description="Benchmark the publishing hot paths on synthetic corpora")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Run the suite and write a JSON report")
+    run.add_argument('--tiers', default='10,1k', help=f"Comma separated tiers out of {', '.join(TIERS)}")
+    run.add_argument('--benchmarks', default=None, help=f"Comma separated subset of {', '.join(BENCHMARKS)}")
+    run.add_argument('--repeat', type=int, default=3, help="Timed repetitions per benchmark")
+    run.add_argument('--seed', type=int, default=0, help="Corpus random seed")
+    run.add_argument('--latency', type=float, default=0.0, help="Seconds each stubbed or fake API call takes")
+    run.add_argument('--work-dir', default=str(Settings.BENCHMARK_DIR / 'work'),
+                     help="Directory for generated corpora, reused between runs")
+    run.add_argument('--output', default=str(Settings.BENCHMARK_DIR / 'latest.json'), help="Report file")
+    run.add_argument('--baseline', default=None, help="Compare the new report with this baseline")
+    run.add_argument('--verbose', action='store_true', help="Keep the pipeline's INFO logging")
+
+    compare = commands.add_parser('compare', help="Compare two reports")
+    compare.add_argument('baseline', help="Baseline report")
+    compare.add_argument('current', nargs='?', default=str(Settings.BENCHMARK_DIR / 'latest.json'),
+                         help="Report to check (defaults to the latest run)")
+
+    serve = commands.add_parser('serve', help="Serve the fake Medium and Dev.to API")
+    serve.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+    serve.add_argument('--port', type=int, default=8089, help="Port to listen on")
+    serve.add_argument('--latency', default='0', help="Delay as seconds or distribution:mean[:spread]")
+    serve.add_argument('--rate-limit-probability', type=float, default=0.0, help="Chance of a 429")
+    serve.add_argument('--retry-after', type=float, default=1.0, help="Retry-After seconds on random 429s")
+    serve.add_argument('--error-probability', type=float, default=0.0, help="Chance of starting a 5xx burst")
+    serve.add_argument('--error-burst', type=int, default=3, help="Requests failed per burst")
+    serve.add_argument('--error-status', type=int, default=503, help="Status code of burst errors")
+    serve.add_argument('--timeout-probability', type=float, default=0.0, help="Chance of never answering")
+    serve.add_argument('--hang-seconds', type=float, default=35.0, help="How long unanswered requests are held")
+    serve.add_argument('--quota', type=int, default=None, help="Requests per API key and window")
+    serve.add_argument('--quota-window', type=float, default=60.0, help="Quota window in seconds")
+    serve.add_argument('--seed', type=int, default=None, help="Random seed")
+
+    for command in (run, compare):
+        command.add_argument('--threshold', type=float, default=0.2,
+                             help="Relative slowdown treated as a regression (0.2 = 20%%)")
+        command.add_argument('--min-delta', type=float, default=0.001,
+                             help="Differences below this many seconds are treated as noise")
+    return parser.parse_args(argv)
+
+def serve(args: argparse.Namespace):
+    """Run the fake API until interrupted"""
+    config = FakeApiConfig(
+        latency=LatencyModel.parse(args.latency),
+        rate_limit_probability=args.rate_limit_probability, retry_after=args.retry_after,
+        error_probability=args.error_probability, error_burst=args.error_burst, error_status=args.error_status,
+        timeout_probability=args.timeout_probability, hang_seconds=args.hang_seconds,
+        quota=args.quota, quota_window=args.quota_window, seed=args.seed
+    )
+    server = FakeApiServer(config, host=args.host, port=args.port).start()
+    for name, value in server.settings().items():
+        print(f"export {name}={value}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logger = get_logger(__name__)
+    args = parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args)
+        return 0
+    if args.command == 'run':
+        stubs.STUB_LATENCY = args.latency
+        if not args.verbose:
+            # Per-post INFO lines would otherwise dominate the timings of the larger tiers
+            logging.disable(logging.INFO)
+        try:
+            report = run_suite(
+                args.tiers.split(','), Path(args.work_dir),
+                benchmarks=args.benchmarks.split(',') if args.benchmarks else None,
+                repeat=max(1, args.repeat), seed=args.seed,
+                progress=lambda tier, name, result: print(
+                    f"[{tier}] {name}: {result['median'] * 1000:.1f}ms median over {len(result['runs'])} run(s)",
+                    flush=True
+                )
+            )
+        finally:
+            logging.disable(logging.NOTSET)
+        logger.info(f"Wrote benchmark report to {save_report(report, Path(args.output))}")
+        if not args.baseline:
+            return 0
+        baseline, current = load_report(Path(args.baseline)), report
+    else:
+        baseline, current = load_report(Path(args.baseline)), load_report(Path(args.current))
+
+    rows = compare_reports(baseline, current, threshold=args.threshold, min_delta=args.min_delta)
+    print(format_comparison(rows))
+    regressions = [row for row in rows if row['status'] == 'regression']
+    if regressions:
+        logger.error(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
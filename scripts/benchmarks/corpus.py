@@ -0,0 +1,187 @@
+from pathlib import Path
+from typing import List
+import json
+import random
+from PIL import Image
+
+# Shared figures referenced by the generated posts, like a real posts/images directory
+IMAGE_COUNT = 8
+IMAGE_SIZE = (1600, 900)
+
+_WORDS = (
+    "cluster pod deployment service ingress volume secret config container image registry "
+    "pipeline workflow runner cache artifact release version rollout canary metric alert "
+    "latency throughput request response queue worker schedule retry timeout backoff token "
+    "database index query migration schema replica shard backup restore snapshot network "
+    "policy namespace node scaling autoscaler resource limit budget cost log trace span"
+).split()
+
+_TAGS = (
+    "kubernetes devops docker python automation cloud aws terraform github ci cd "
+    "monitoring security linux networking databases testing performance tutorial"
+).split()
+
+_CODE_SAMPLES = {
+    'python': (
+        "def handler(event, context):\n"
+        "    records = [r for r in event['Records'] if r.get('body')]\n"
+        "    for record in records:\n"
+        "        process(json.loads(record['body']))\n"
+        "    return {'processed': len(records)}\n"
+    ),
+    'bash': (
+        "kubectl create namespace staging\n"
+        "kubectl apply -f deployment.yaml -n staging\n"
+        "kubectl rollout status deployment/api -n staging --timeout=120s\n"
+    ),
+    'yaml': (
+        "apiVersion: apps/v1\n"
+        "kind: Deployment\n"
+        "metadata:\n"
+        "  name: api\n"
+        "spec:\n"
+        "  replicas: 3\n"
+        "  template:\n"
+        "    spec:\n"
+        "      containers:\n"
+        "        - name: api\n"
+        "          image: registry.example.com/api:1.4.2\n"
+    ),
+    'json': (
+        "{\n"
+        "  \"name\": \"api\",\n"
+        "  \"version\": \"1.4.2\",\n"
+        "  \"dependencies\": {\"requests\": \"^2.31\", \"pyyaml\": \"^6.0\"}\n"
+        "}\n"
+    )
+}
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(8, 18))
+    return ' '.join(words).capitalize() + '.'
+
+def _paragraph(rng: random.Random) -> str:
+    text = ' '.join(_sentence(rng) for _ in range(rng.randint(3, 6)))
+    # Sprinkle inline markup the renderer has to handle
+    bold, code = rng.sample(_WORDS, k=2)
+    return text.replace(f" {bold} ", f" **{bold}** ", 1).replace(f" {code} ", f" `{code}` ", 1)
+
+def _table(rng: random.Random) -> str:
+    columns = rng.sample(_WORDS, k=rng.randint(3, 5))
+    rows = [
+        '| ' + ' | '.join(column.title() for column in columns) + ' |',
+        '| ' + ' | '.join('---' for _ in columns) + ' |'
+    ]
+    for _ in range(rng.randint(3, 8)):
+        rows.append('| ' + ' | '.join(str(rng.randint(1, 999)) for _ in columns) + ' |')
+    return '\n'.join(rows)
+
+def _section(rng: random.Random, index: int, image_count: int) -> str:
+    parts = [f"## {' '.join(rng.sample(_WORDS, k=3)).title()} {index}", _paragraph(rng)]
+    block = rng.random()
+    if block < 0.35:
+        language = rng.choice(list(_CODE_SAMPLES))
+        parts.append(f"```{language}\n{_CODE_SAMPLES[language]}```")
+    elif block < 0.55:
+        parts.append(_table(rng))
+    elif block < 0.7:
+        parts.append('\n'.join(f"- {_sentence(rng)}" for _ in range(rng.randint(3, 6))))
+    elif block < 0.8:
+        parts.append(f"> {_sentence(rng)}")
+    if image_count and rng.random() < 0.3:
+        figure = rng.randrange(image_count)
+        parts.append(f"![Figure {figure}](images/figure-{figure}.png)")
+    elif rng.random() < 0.1:
+        parts.append(f"![Diagram](https://images.example.com/diagrams/{rng.randint(1, 500)}.png)")
+    parts.append(_paragraph(rng))
+    return '\n\n'.join(parts)
+
+def generate_post(rng: random.Random, index: int, image_count: int = IMAGE_COUNT) -> str:
+    """
+    Generate one post with frontmatter, code fences, tables, lists and images
+
+    Args:
+        rng: Random source, seeded for reproducible corpora
+        index: Post number, used to keep titles unique
+        image_count: Shared figures the post may reference
+
+    Returns:
+        Markdown text of the post
+    """
+    tags = rng.sample(_TAGS, k=rng.randint(1, 6))
+    metadata = {
+        'title': f"{' '.join(rng.sample(_WORDS, k=4)).title()} ({index})",
+        'description': _sentence(rng),
+        # Posts in the repo use both tag styles
+        'tags': ','.join(tags) if rng.random() < 0.5 else tags
+    }
+    if rng.random() < 0.3:
+        metadata['canonical_url'] = f"https://blog.example.com/posts/{index}"
+    if rng.random() < 0.4:
+        metadata['published'] = rng.random() < 0.8
+    if image_count and rng.random() < 0.2:
+        metadata['cover_image'] = f"images/figure-{rng.randrange(image_count)}.png"
+
+    # Frontmatter written as JSON-compatible YAML keeps strings with colons quoted
+    header = '\n'.join(f"{key}: {json.dumps(value)}" for key, value in metadata.items())
+    body = '\n\n'.join(_section(rng, section, image_count) for section in range(rng.randint(3, 10)))
+    return f"---\n{header}\n---\n\n{_paragraph(rng)}\n\n{body}\n"
+
+def generate_images(images_dir: Path, count: int = IMAGE_COUNT, size=IMAGE_SIZE):
+    """Write the shared figures, larger than IMAGE_MAX_WIDTH so optimization has work to do"""
+    images_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        path = images_dir / f"figure-{index}.png"
+        if path.exists():
+            continue
+        gradient = Image.linear_gradient('L').resize(size)
+        bands = (gradient, gradient.rotate(45 * index), gradient.rotate(180))
+        Image.merge('RGB', bands).save(path)
+
+def generate_corpus(posts_dir: Path, count: int, seed: int = 0,
+                    image_count: int = IMAGE_COUNT) -> List[Path]:
+    """
+    Generate a reproducible synthetic posts directory
+
+    An existing corpus generated with the same count and seed is reused.
+    The corpus.json manifest marks a directory as generated; only such a
+    directory (or an empty one) is written to, and regenerating it only
+    replaces the generator's own post-*.md files.
+
+    Args:
+        posts_dir: Directory receiving the posts
+        count: Number of posts
+        seed: Random seed
+        image_count: Shared figures written to posts_dir/images
+
+    Returns:
+        Paths of the generated posts
+
+    Raises:
+        ValueError: If posts_dir holds files the generator did not create
+    """
+    posts_dir = Path(posts_dir)
+    manifest_file = posts_dir / 'corpus.json'
+    manifest = {'count': count, 'seed': seed, 'image_count': image_count}
+    files = [posts_dir / f"post-{index:05d}.md" for index in range(count)]
+    if manifest_file.exists() and json.loads(manifest_file.read_text(encoding='utf-8')) == manifest:
+        return files
+
+    if not manifest_file.exists() and posts_dir.exists() and any(posts_dir.iterdir()):
+        raise ValueError(
+            f"Refusing to generate a corpus in {posts_dir}: it is not empty and has no {manifest_file.name}"
+        )
+    posts_dir.mkdir(parents=True, exist_ok=True)
+    for stale in posts_dir.glob('post-*.md'):
+        stale.unlink()
+    if image_count:
+        generate_images(posts_dir / 'images', image_count)
+    rng = random.Random(seed)
+    for index, path in enumerate(files):
+        path.write_text(generate_post(rng, index, image_count), encoding='utf-8')
+    manifest_file.write_text(json.dumps(manifest), encoding='utf-8')
+    return files
+
+def corpus_size(files: List[Path]) -> int:
+    """Total bytes of a corpus"""
+    return sum(path.stat().st_size for path in files)
@@ -0,0 +1,378 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from ..utils.logger import get_logger
+
+MEDIUM_PREFIX = '/medium/v1'
+DEVTO_PREFIX = '/devto/api'
+
+class LatencyModel:
+    """Distribution of the delay added before every response"""
+    DISTRIBUTIONS = ('constant', 'uniform', 'exponential', 'lognormal')
+
+    def __init__(self, distribution: str = 'constant', mean: float = 0.0, spread: float = 0.5,
+                 max_delay: Optional[float] = None):
+        """
+        Initialize the model
+
+        Args:
+            distribution: One of DISTRIBUTIONS
+            mean: Mean delay in seconds
+            spread: Relative width for 'uniform', sigma for 'lognormal'
+            max_delay: Upper bound applied to every sample
+
+        Raises:
+            ValueError: If the distribution is unknown
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}'")
+        self.distribution = distribution
+        self.mean = mean
+        self.spread = spread
+        self.max_delay = max_delay
+
+    @classmethod
+    def parse(cls, spec: str) -> 'LatencyModel':
+        """
+        Build a model from "distribution:mean[:spread]", e.g. "lognormal:0.2:0.8"
+
+        A bare number is a constant delay.
+        """
+        parts = spec.split(':')
+        if len(parts) == 1:
+            return cls('constant', float(parts[0]))
+        return cls(parts[0], float(parts[1]), *(float(part) for part in parts[2:3]))
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay in seconds"""
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == 'uniform':
+            delay = rng.uniform(self.mean * (1 - self.spread), self.mean * (1 + self.spread))
+        elif self.distribution == 'exponential':
+            delay = rng.expovariate(1 / self.mean)
+        elif self.distribution == 'lognormal':
+            # mu chosen so the distribution's mean equals self.mean
+            delay = rng.lognormvariate(math.log(self.mean) - self.spread ** 2 / 2, self.spread)
+        else:
+            delay = self.mean
+        delay = max(0.0, delay)
+        return min(delay, self.max_delay) if self.max_delay is not None else delay
+
+class FakeApiConfig:
+    """Behaviour of the fake API: latency and injected faults"""
+
+    def __init__(self, latency: Optional[LatencyModel] = None,
+                 rate_limit_probability: float = 0.0, retry_after: float = 1.0,
+                 error_probability: float = 0.0, error_burst: int = 3, error_status: int = 503,
+                 timeout_probability: float = 0.0, hang_seconds: float = 35.0,
+                 quota: Optional[int] = None, quota_window: float = 60.0,
+                 api_keys: Optional[List[str]] = None, seed: Optional[int] = None):
+        """
+        Initialize the configuration
+
+        Args:
+            latency: Delay added to every response (none by default)
+            rate_limit_probability: Chance of a 429 carrying Retry-After
+            retry_after: Seconds sent in Retry-After on random 429s
+            error_probability: Chance of starting a burst of server errors
+            error_burst: Consecutive requests failed by each burst
+            error_status: Status code of burst errors (e.g. 500, 502, 503)
+            timeout_probability: Chance of holding a request without answering
+            hang_seconds: How long a held request waits before the connection is dropped
+            quota: Requests allowed per API key and window (unlimited by default)
+            quota_window: Quota window in seconds
+            api_keys: Accepted credentials (any non-empty credential by default)
+            seed: Random seed for reproducible fault sequences
+        """
+        self.latency = latency or LatencyModel()
+        self.rate_limit_probability = rate_limit_probability
+        self.retry_after = retry_after
+        self.error_probability = error_probability
+        self.error_burst = error_burst
+        self.error_status = error_status
+        self.timeout_probability = timeout_probability
+        self.hang_seconds = hang_seconds
+        self.quota = quota
+        self.quota_window = quota_window
+        self.api_keys = set(api_keys) if api_keys else None
+        self.seed = seed
+
+def user_id_for(key: str) -> str:
+    """Medium user ID the fake API assigns to a token"""
+    return 'user-' + hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes requests to the owning FakeApiServer"""
+    # Keep-alive, like the real APIs, so the publishers' connection pools are exercised
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.fake.handle(self)
+
+    def do_POST(self):
+        self.server.fake.handle(self)
+
+    def log_message(self, format, *args):
+        # Request logging goes through FakeApiServer.log instead
+        pass
+
+class FakeApiServer:
+    """
+    Local stand-in for the Medium and Dev.to APIs
+
+    Serves the endpoints the publishers use under ``/medium/v1`` (``/me``,
+    ``/users/{id}/posts``, ``/images``) and ``/devto/api`` (``/articles``,
+    ``/articles/me/all``) on a background thread. Point
+    Settings.MEDIUM_API_BASE / DEVTO_API_BASE at ``medium_base`` /
+    ``devto_base`` (see ``settings()``) to run the real publishers against it.
+    """
+
+    def __init__(self, config: Optional[FakeApiConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the server
+
+        Args:
+            config: Latency and fault injection settings
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+        """
+        self.config = config or FakeApiConfig()
+        self.host = host
+        self.port = port
+        self.logger = get_logger(__name__)
+        self.lock = threading.Lock()
+        self.rng = random.Random(self.config.seed)
+        self.stopping = threading.Event()
+        # Published content per platform, as the API returned it
+        self.posts: Dict[str, List[Dict[str, Any]]] = {'medium': [], 'devto': []}
+        # One entry per request: method, path, platform, key, status
+        self.log: List[Dict[str, Any]] = []
+        self._burst_remaining = 0
+        self._quotas: Dict[str, Tuple[float, int]] = {}
+        self._next_id = 1
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def medium_base(self) -> str:
+        return self.url + MEDIUM_PREFIX
+
+    @property
+    def devto_base(self) -> str:
+        return self.url + DEVTO_PREFIX
+
+    def settings(self) -> Dict[str, str]:
+        """Settings (or environment variables) routing the built-in publishers here"""
+        return {'MEDIUM_API_BASE': self.medium_base, 'DEVTO_API_BASE': self.devto_base}
+
+    def start(self) -> 'FakeApiServer':
+        """Start serving on a daemon thread"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self.port = self._server.server_address[1]
+        self.stopping.clear()
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-api', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Fake API listening on {self.url}")
+        return self
+
+    def stop(self):
+        """Stop serving, releasing requests held by timeout faults"""
+        if self._server is None:
+            return
+        self.stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start_error_burst(self, requests: Optional[int] = None):
+        """Fail the next requests with the configured error status, simulating an outage"""
+        with self.lock:
+            self._burst_remaining = self.config.error_burst if requests is None else requests
+
+    def count(self, **filters) -> int:
+        """Number of logged requests matching every filter, e.g. count(status=429)"""
+        with self.lock:
+            return sum(all(entry.get(k) == v for k, v in filters.items()) for entry in self.log)
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        """Answer one request, applying the configured latency and faults"""
+        path = urlsplit(request.path).path
+        if path.startswith(MEDIUM_PREFIX):
+            platform = 'medium'
+            authorization = request.headers.get('Authorization', '')
+            key = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else ''
+        elif path.startswith(DEVTO_PREFIX):
+            platform = 'devto'
+            key = request.headers.get('api-key', '')
+        else:
+            platform, key = None, ''
+        length = int(request.headers.get('Content-Length') or 0)
+        body = request.rfile.read(length) if length else b''
+
+        fault, headers, delay = self._decide(key)
+        if delay:
+            self.stopping.wait(delay)
+
+        if fault == 'hang':
+            # Hold the request like an unresponsive upstream, then drop the connection
+            self._record(request.command, path, platform, key, None)
+            self.stopping.wait(self.config.hang_seconds)
+            request.close_connection = True
+            return
+
+        if platform is None:
+            status, payload = 404, {'error': 'not found'}
+        elif not key or (self.config.api_keys is not None and key not in self.config.api_keys):
+            status, payload = 401, {'error': 'unauthorized', 'status': 401}
+        elif fault == 'quota':
+            status, payload = 429, {'error': 'API quota exceeded', 'status': 429}
+        elif fault == 'rate_limit':
+            status, payload = 429, {'error': 'Rate limit reached', 'status': 429}
+            headers['Retry-After'] = str(int(math.ceil(self.config.retry_after)))
+        elif fault == 'error':
+            status, payload = self.config.error_status, {'error': 'Upstream failure', 'status': self.config.error_status}
+        elif platform == 'medium':
+            status, payload = self._medium(request.command, path[len(MEDIUM_PREFIX):], key, body)
+        else:
+            status, payload = self._devto(request.command, path[len(DEVTO_PREFIX):], key, body,
+                                          parse_qs(urlsplit(request.path).query))
+
+        self._record(request.command, path, platform, key, status)
+        data = json.dumps(payload).encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(data)
+
+    def _decide(self, key: str) -> Tuple[Optional[str], Dict[str, str], float]:
+        """Pick the fault, quota headers and latency of a request"""
+        config = self.config
+        headers: Dict[str, str] = {}
+        with self.lock:
+            delay = config.latency.sample(self.rng)
+            if config.quota is not None and key:
+                now = time.monotonic()
+                window_start, used = self._quotas.get(key, (now, 0))
+                if now - window_start >= config.quota_window:
+                    window_start, used = now, 0
+                reset = max(1, int(math.ceil(window_start + config.quota_window - now)))
+                headers['X-RateLimit-Limit'] = str(config.quota)
+                headers['X-RateLimit-Reset'] = str(reset)
+                if used >= config.quota:
+                    headers['X-RateLimit-Remaining'] = '0'
+                    headers['Retry-After'] = str(reset)
+                    return 'quota', headers, delay
+                self._quotas[key] = (window_start, used + 1)
+                headers['X-RateLimit-Remaining'] = str(config.quota - used - 1)
+
+            if self._burst_remaining == 0 and self.rng.random() < config.error_probability:
+                self._burst_remaining = config.error_burst
+            if self._burst_remaining:
+                self._burst_remaining -= 1
+                return 'error', headers, delay
+            if self.rng.random() < config.rate_limit_probability:
+                return 'rate_limit', headers, delay
+            if self.rng.random() < config.timeout_probability:
+                return 'hang', headers, delay
+        return None, headers, delay
+
+    def _record(self, method: str, path: str, platform: Optional[str], key: str, status: Optional[int]):
+        with self.lock:
+            self.log.append({'method': method, 'path': path, 'platform': platform, 'key': key, 'status': status})
+
+    def _new_id(self) -> int:
+        with self.lock:
+            self._next_id += 1
+            return self._next_id - 1
+
+    def _medium(self, method: str, path: str, key: str, body: bytes) -> Tuple[int, Any]:
+        """Medium endpoints: /me, /users/{id}/posts and /images"""
+        user_id = user_id_for(key)
+        if method == 'GET' and path == '/me':
+            return 200, {'data': {'id': user_id, 'username': user_id, 'name': 'Fake Author'}}
+        if method == 'POST' and path == '/images':
+            digest = hashlib.md5(body).hexdigest()
+            return 201, {'data': {'url': f"{self.url}/images/{digest}.png", 'md5': digest}}
+        match = re.fullmatch(r'/users/([^/]+)/posts', path)
+        if method == 'POST' and match:
+            if match.group(1) != user_id:
+                return 403, {'errors': [{'message': 'Token does not belong to this user', 'code': 2006}]}
+            try:
+                post = json.loads(body or b'{}')
+            except ValueError:
+                return 400, {'errors': [{'message': 'Invalid JSON', 'code': 2001}]}
+            missing = [field for field in ('title', 'contentFormat', 'content') if not post.get(field)]
+            if missing:
+                return 400, {'errors': [{'message': f"Missing {', '.join(missing)}", 'code': 2004}]}
+            post_id = f"{self._new_id():012x}"
+            data = {
+                'id': post_id,
+                'title': post['title'],
+                'authorId': user_id,
+                'tags': post.get('tags', []),
+                'url': f"{self.url}/medium/p/{post_id}",
+                'canonicalUrl': post.get('canonicalUrl', ''),
+                'publishStatus': post.get('publishStatus', 'public'),
+                'publishedAt': int(time.time() * 1000)
+            }
+            with self.lock:
+                self.posts['medium'].append(data)
+            return 201, {'data': data}
+        return 404, {'errors': [{'message': 'Not found', 'code': 404}]}
+
+    def _devto(self, method: str, path: str, key: str, body: bytes,
+               query: Dict[str, List[str]]) -> Tuple[int, Any]:
+        """Dev.to endpoints: POST /articles and GET /articles/me/all"""
+        if method == 'GET' and path == '/articles/me/all':
+            page = int(query.get('page', ['1'])[0])
+            per_page = int(query.get('per_page', ['30'])[0])
+            with self.lock:
+                articles = [article for article in self.posts['devto'] if article['key'] == key]
+            page_items = articles[(page - 1) * per_page:page * per_page]
+            return 200, [{k: v for k, v in article.items() if k != 'key'} for article in page_items]
+        if method == 'POST' and path == '/articles':
+            try:
+                article = json.loads(body or b'{}').get('article') or {}
+            except (ValueError, AttributeError):
+                return 400, {'error': 'Invalid JSON', 'status': 400}
+            if not article.get('title'):
+                return 422, {'error': "Title can't be blank", 'status': 422}
+            article_id = self._new_id()
+            data = {
+                'id': article_id,
+                'title': article['title'],
+                'description': article.get('description', ''),
+                'tags': article.get('tags', []),
+                'published': article.get('published', False),
+                'url': f"{self.url}/devto/fake/{article_id}",
+                'canonical_url': article.get('canonical_url'),
+                'key': key
+            }
+            with self.lock:
+                self.posts['devto'].append(data)
+            return 201, {k: v for k, v in data.items() if k != 'key'}
+        return 404, {'error': 'not found', 'status': 404}
@@ -0,0 +1,56 @@
+from typing import Any, Dict
+import itertools
+import json
+import threading
+import time
+import requests
+from ..publish_medium import MediumPublisher
+from ..publish_devto import DevToPublisher
+
+# Seconds every stubbed API call takes, raise it to model network round trips
+STUB_LATENCY = 0.0
+
+_ids = itertools.count(1)
+_ids_lock = threading.Lock()
+
+def _next_id() -> int:
+    with _ids_lock:
+        return next(_ids)
+
+def stub_response(status_code: int, data: Any) -> requests.Response:
+    """Build a canned JSON response"""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers['Content-Type'] = 'application/json'
+    response._content = json.dumps(data).encode('utf-8')
+    return response
+
+class StubMediumPublisher(MediumPublisher):
+    """Medium publisher whose API calls are answered locally, payload building stays real"""
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if STUB_LATENCY:
+            time.sleep(STUB_LATENCY)
+        if url.endswith('/me'):
+            return stub_response(200, {'data': {'id': 'benchmark-user'}})
+        if url.endswith('/images'):
+            return stub_response(201, {'data': {'url': f"https://cdn.example.com/{_next_id()}.png"}})
+        post_id = _next_id()
+        return stub_response(201, {'data': {'id': str(post_id), 'url': f"https://medium.com/p/{post_id}"}})
+
+class StubDevToPublisher(DevToPublisher):
+    """Dev.to publisher whose API calls are answered locally, payload building stays real"""
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if STUB_LATENCY:
+            time.sleep(STUB_LATENCY)
+        if method == 'GET':
+            return stub_response(200, [])
+        article_id = _next_id()
+        return stub_response(201, {'id': article_id, 'url': f"https://dev.to/benchmark/{article_id}"})
+
+# Publisher spec per platform, for register_publisher()
+STUB_PUBLISHERS: Dict[str, str] = {
+    'medium': 'scripts.benchmarks.stubs:StubMediumPublisher',
+    'devto': 'scripts.benchmarks.stubs:StubDevToPublisher'
+}
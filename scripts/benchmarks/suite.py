@@ -0,0 +1,335 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import time
+from .corpus import corpus_size, generate_corpus
+from . import stubs
+from .fake_api import FakeApiConfig, FakeApiServer, LatencyModel
+from .stubs import STUB_PUBLISHERS
+from ..convert_markdown import MarkdownConverter
+from ..post_tracker import PostTracker
+from ..queue_manager import PostQueue
+from ..publisher_registry import PUBLISHER_CLASSES, register_publisher, unregister_publisher
+from ..utils.metrics import metrics
+from ..utils.tracing import tracer
+from ..config.settings import Settings
+
+# Scale tiers: name -> number of posts
+TIERS: Dict[str, int] = {'10': 10, '1k': 1000, '10k': 10000}
+
+PLATFORMS = ['medium', 'devto']
+
+# A benchmark prepares its state in a fresh workspace and returns the operation to time
+Benchmark = Callable[[List[Path], Path], Callable[[], Any]]
+
+@contextmanager
+def override_settings(**values) -> Iterator[None]:
+    """Temporarily replace Settings attributes"""
+    previous = {name: getattr(Settings, name) for name in values}
+    for name, value in values.items():
+        setattr(Settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(Settings, name, value)
+
+@contextmanager
+def stub_publishers() -> Iterator[None]:
+    """Route the built-in platforms to publishers that answer API calls locally"""
+    previous = {name: PUBLISHER_CLASSES.get(name) for name in STUB_PUBLISHERS}
+    for name, spec in STUB_PUBLISHERS.items():
+        register_publisher(name, spec)
+    try:
+        yield
+    finally:
+        for name, spec in previous.items():
+            if spec:
+                register_publisher(name, spec)
+            else:
+                unregister_publisher(name)
+
+def _file_names(files: List[Path]) -> List[str]:
+    return [path.name for path in files]
+
+def bench_convert(files: List[Path], workspace: Path) -> Callable[[], Any]:
+    """Cold conversion of every post, HTML and Markdown, images included"""
+    converter = MarkdownConverter(str(files[0].parent), str(workspace / 'dist'), use_cache=False)
+    return converter.convert
+
+def bench_convert_cached(files: List[Path], workspace: Path) -> Callable[[], Any]:
+    """Conversion of an unchanged corpus, served from the conversion cache"""
+    converter = MarkdownConverter(str(files[0].parent), str(workspace / 'dist'))
+    converter.convert()
+    return converter.convert
+
+def bench_unpublished(files: List[Path], workspace: Path) -> Callable[[], Any]:
+    """Planning against a tracker where half the posts are published everywhere and a quarter on one platform"""
+    tracker = PostTracker(base_dir=str(workspace))
+    names = _file_names(files)
+    with tracker.batch():
+        for index, file_path in enumerate(names):
+            if index % 4 in (0, 1):
+                platforms = PLATFORMS
+            elif index % 4 == 2:
+                platforms = PLATFORMS[:1]
+            else:
+                continue
+            for platform_name in platforms:
+                tracker.mark_platform_published(file_path, platform_name, f"https://example.com/{index}", str(index))
+    all_files = set(names)
+    return lambda: tracker.get_unpublished_files(all_files, PLATFORMS)
+
+def bench_queue_add(files: List[Path], workspace: Path) -> Callable[[], Any]:
+    """Queueing every post one add_to_queue call at a time, including the final flush"""
+    queue = PostQueue(base_dir=str(workspace))
+    names = _file_names(files)
+
+    def run():
+        for file_path in names:
+            queue.add_to_queue(file_path, list(PLATFORMS))
+        queue.close()
+    return run
+
+def _filled_queue(files: List[Path], workspace: Path) -> PostQueue:
+    """Queue with half the posts due in the past and half scheduled ahead"""
+    queue = PostQueue(base_dir=str(workspace))
+    now = datetime.now(timezone.utc)
+    with queue.batch():
+        for index, file_path in enumerate(_file_names(files)):
+            offset = timedelta(minutes=index) * (-1 if index % 2 == 0 else 1)
+            queue.add_to_queue(file_path, list(PLATFORMS), (now + offset + timedelta(seconds=1)).isoformat())
+    return queue
+
+def bench_queue_ready(files: List[Path], workspace: Path) -> Callable[[], Any]:
+    """Listing due posts from a queue where half the posts are due"""
+    return _filled_queue(files, workspace).get_ready_posts
+
+def bench_queue_clean(files: List[Path], workspace: Path) -> Callable[[], Any]:
+    """Dropping the completed half of a queue, including the final flush"""
+    queue = _filled_queue(files, workspace)
+    with queue.batch():
+        for index, file_path in enumerate(_file_names(files)):
+            if index % 2 == 0:
+                for platform_name in PLATFORMS:
+                    queue.mark_completed(file_path, platform_name)
+
+    def run():
+        # days_old=-1 expires posts completed moments ago
+        queue.clean_completed(days_old=-1)
+        queue.close()
+    return run
+
+@contextmanager
+def publish_environment(files: List[Path], workspace: Path, **overrides) -> Iterator[None]:
+    """Run publish_posts inside the workspace over the corpus, with placeholder credentials"""
+    previous_dir = Path.cwd()
+    os.chdir(workspace)
+    try:
+        with override_settings(
+            PLATFORMS=list(PLATFORMS),
+            MARKDOWN_DIR=files[0].parent,
+            OUTPUT_DIR=workspace / 'dist',
+            METRICS_DIR=workspace / 'logs' / 'metrics',
+            TRACE_DIR=workspace / 'logs' / 'traces',
+            MEDIUM_TOKEN='benchmark',
+            DEVTO_API_KEY='benchmark',
+            IMAGE_BASE_URL=Settings.IMAGE_BASE_URL or 'https://blog.example.com/posts',
+            **overrides
+        ):
+            yield
+    finally:
+        os.chdir(previous_dir)
+
+def bench_publish(files: List[Path], workspace: Path) -> Callable[[], Any]:
+    """Full publish_posts.main run over the corpus against stub publishers"""
+    from ..publish_posts import main
+
+    def run():
+        with stub_publishers(), publish_environment(files, workspace):
+            main([])
+    return run
+
+def bench_publish_http(files: List[Path], workspace: Path) -> Callable[[], Any]:
+    """Full publish_posts.main run with the real publishers talking HTTP to the fake API"""
+    from ..publish_posts import main
+
+    def run():
+        # Client-side rate limits would turn the run into a sleep, the fake API applies none
+        config = FakeApiConfig(latency=LatencyModel('constant', stubs.STUB_LATENCY))
+        with FakeApiServer(config) as server, publish_environment(
+            files, workspace, MEDIUM_RATE_LIMIT=1e6, DEVTO_RATE_LIMIT=1e6, **server.settings()
+        ):
+            main([])
+    return run
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    'convert': bench_convert,
+    'convert_cached': bench_convert_cached,
+    'get_unpublished_files': bench_unpublished,
+    'queue_add': bench_queue_add,
+    'queue_ready': bench_queue_ready,
+    'queue_clean': bench_queue_clean,
+    'publish': bench_publish,
+    'publish_http': bench_publish_http
+}
+
+def run_benchmark(benchmark: Benchmark, files: List[Path], workspace: Path, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time a benchmark, each repetition starting from a fresh workspace
+
+    Args:
+        benchmark: Benchmark to run
+        files: Corpus posts
+        workspace: Scratch directory, emptied before every repetition
+        repeat: Timed repetitions
+
+    Returns:
+        Per-run seconds with their min, median and mean, and posts per second at the median
+    """
+    runs = []
+    for _ in range(repeat):
+        if workspace.exists():
+            shutil.rmtree(workspace)
+        workspace.mkdir(parents=True)
+        metrics.reset()
+        tracer.reset()
+        operation = benchmark(files, workspace)
+        gc.collect()
+        start = time.perf_counter()
+        operation()
+        runs.append(time.perf_counter() - start)
+        del operation
+    median = statistics.median(runs)
+    return {
+        'runs': runs,
+        'min': min(runs),
+        'median': median,
+        'mean': statistics.mean(runs),
+        'posts_per_second': len(files) / median if median else None
+    }
+
+def _git_commit() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(tiers: List[str], work_dir: Path, benchmarks: Optional[List[str]] = None,
+              repeat: int = 3, seed: int = 0,
+              progress: Optional[Callable[[str, str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Run the benchmarks over synthetic corpora of each tier
+
+    Args:
+        tiers: Tier names from TIERS
+        work_dir: Directory holding the generated corpora and scratch workspaces
+        benchmarks: Benchmark names from BENCHMARKS (defaults to all)
+        repeat: Timed repetitions per benchmark
+        seed: Corpus random seed
+        progress: Called with (tier, benchmark, result) after each benchmark
+
+    Returns:
+        Report with the environment and the results per tier and benchmark
+
+    Raises:
+        ValueError: If a tier or benchmark is unknown
+    """
+    work_dir = Path(work_dir).resolve()
+    names = list(BENCHMARKS) if benchmarks is None else benchmarks
+    unknown = [tier for tier in tiers if tier not in TIERS] + [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown tier or benchmark: {', '.join(unknown)}")
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'seed': seed,
+        'tiers': {}
+    }
+    for tier in tiers:
+        files = generate_corpus(work_dir / f"corpus-{tier}" / 'posts', TIERS[tier], seed=seed)
+        tier_report = {'posts': len(files), 'bytes': corpus_size(files), 'benchmarks': {}}
+        report['tiers'][tier] = tier_report
+        for name in names:
+            result = run_benchmark(BENCHMARKS[name], files, work_dir / 'workspace', repeat=repeat)
+            tier_report['benchmarks'][name] = result
+            if progress:
+                progress(tier, name, result)
+    shutil.rmtree(work_dir / 'workspace', ignore_errors=True)
+    return report
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2,
+                    min_delta: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    Compare the median timings of two reports
+
+    Args:
+        baseline: Reference report
+        current: New report
+        threshold: Relative slowdown reported as a regression (0.2 = 20% slower)
+        min_delta: Absolute difference in seconds below which changes are noise
+
+    Returns:
+        One row per tier and benchmark with both medians, the ratio and a
+        status of 'regression', 'improvement', 'unchanged', 'new' or 'missing'
+    """
+    rows = []
+    tiers = list(current['tiers']) + [tier for tier in baseline['tiers'] if tier not in current['tiers']]
+    for tier in tiers:
+        old = baseline['tiers'].get(tier, {}).get('benchmarks', {})
+        new = current['tiers'].get(tier, {}).get('benchmarks', {})
+        for name in list(new) + [name for name in old if name not in new]:
+            row = {
+                'tier': tier,
+                'benchmark': name,
+                'baseline': old[name]['median'] if name in old else None,
+                'current': new[name]['median'] if name in new else None,
+                'ratio': None
+            }
+            if row['baseline'] is None:
+                row['status'] = 'new'
+            elif row['current'] is None:
+                row['status'] = 'missing'
+            else:
+                row['ratio'] = row['current'] / row['baseline'] if row['baseline'] else None
+                delta = row['current'] - row['baseline']
+                if abs(delta) < min_delta or row['ratio'] is None:
+                    row['status'] = 'unchanged'
+                elif row['ratio'] > 1 + threshold:
+                    row['status'] = 'regression'
+                elif row['ratio'] < 1 / (1 + threshold):
+                    row['status'] = 'improvement'
+                else:
+                    row['status'] = 'unchanged'
+            rows.append(row)
+    return rows
+
+def load_report(file_path: Path) -> Dict[str, Any]:
+    """Read a report or baseline written by save_report"""
+    with Path(file_path).open('r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_report(report: Dict[str, Any], file_path: Path) -> Path:
+    """Write a report, e.g. as the new baseline"""
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with file_path.open('w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return file_path
@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import argparse
+import difflib
+import json
+import time
+import frontmatter
+from scripts.convert_markdown import RENDERERS, available_renderers, get_renderer, normalize_html
+from scripts.config.settings import Settings
+from scripts.utils.logger import get_logger
+
+def load_corpus(markdown_dir: Path) -> Dict[str, str]:
+    """
+    Read the Markdown body of every post
+
+    Args:
+        markdown_dir: Directory holding the posts
+
+    Returns:
+        Mapping of file name to Markdown body
+    """
+    return {
+        path.name: frontmatter.load(path).content
+        for path in sorted(markdown_dir.glob('*.md'))
+    }
+
+def compare_renderers(corpus: Dict[str, str], renderers: List[str], baseline: str,
+                      repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Render the corpus with each backend, timing it and diffing against the baseline
+
+    Args:
+        corpus: Mapping of file name to Markdown body
+        renderers: Backend names to compare
+        baseline: Backend whose normalized output is the reference
+        repeat: Number of timed passes over the corpus
+
+    Returns:
+        Per-backend throughput, mismatching files and unified diffs
+    """
+    total_bytes = sum(len(text.encode('utf-8')) for text in corpus.values())
+    outputs: Dict[str, Dict[str, str]] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for name in renderers:
+        renderer = get_renderer(name)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            rendered = {file_name: normalize_html(renderer.render(text)) for file_name, text in corpus.items()}
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        outputs[name] = rendered
+        results[name] = {
+            'version': renderer.version,
+            'seconds': elapsed / repeat,
+            'posts_per_second': len(corpus) * repeat / elapsed,
+            'kb_per_second': total_bytes * repeat / elapsed / 1024
+        }
+
+    for name in renderers:
+        diffs = {}
+        for file_name, html in outputs[name].items():
+            reference = outputs[baseline][file_name]
+            if html != reference:
+                diffs[file_name] = ''.join(difflib.unified_diff(
+                    reference.splitlines(keepends=True), html.splitlines(keepends=True),
+                    fromfile=f"{baseline}/{file_name}", tofile=f"{name}/{file_name}"
+                ))
+        results[name]['mismatches'] = sorted(diffs)
+        results[name]['diffs'] = diffs
+
+    return results
+
+def pick_fastest_compatible(results: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Fastest backend whose output matches the baseline on every post"""
+    compatible = [name for name, result in results.items() if not result['mismatches']]
+    return max(compatible, key=lambda name: results[name]['posts_per_second'], default=None)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Compare Markdown rendering backends on the posts corpus")
+    parser.add_argument('--posts', default=str(Settings.MARKDOWN_DIR), help="Directory of posts to render")
+    parser.add_argument('--renderers', default=None,
+                        help=f"Comma separated backends (default: installed ones of {', '.join(RENDERERS)})")
+    parser.add_argument('--baseline', default='markdown2', help="Backend used as the reference output")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed passes over the corpus")
+    parser.add_argument('--diff', action='store_true', help="Print output differences")
+    parser.add_argument('--json', dest='json_file', default=None, help="Also write the report to this file")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    logger = get_logger(__name__)
+    args = parse_args(argv)
+
+    renderers = args.renderers.split(',') if args.renderers else available_renderers()
+    if args.baseline not in renderers:
+        renderers.insert(0, args.baseline)
+
+    corpus = load_corpus(Path(args.posts))
+    logger.info(f"Rendering {len(corpus)} posts with: {', '.join(renderers)}")
+    results = compare_renderers(corpus, renderers, args.baseline, repeat=max(1, args.repeat))
+
+    for name, result in sorted(results.items(), key=lambda item: -item[1]['posts_per_second']):
+        logger.info(
+            f"{name} {result['version']}: {result['posts_per_second']:.1f} posts/s, "
+            f"{result['kb_per_second']:.1f} KB/s, {len(result['mismatches'])} mismatching post(s)"
+        )
+        if args.diff:
+            for diff in result['diffs'].values():
+                print(diff)
+
+    fastest = pick_fastest_compatible(results)
+    logger.info(f"Fastest backend matching {args.baseline}: {fastest} (set MARKDOWN_RENDERER to use it)")
+
+    if args.json_file:
+        with open(args.json_file, 'w', encoding='utf-8') as f:
+            json.dump({'baseline': args.baseline, 'fastest_compatible': fastest, 'results': results},
+                      f, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
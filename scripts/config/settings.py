@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 import os
+import re
 import json
 
 # Load environment variables from .env file
@@ -13,6 +14,12 @@ class Settings:
     # API Credentials
     MEDIUM_TOKEN: str = os.getenv("MEDIUM_TOKEN")
     DEVTO_API_KEY: str = os.getenv("DEVTO_API_KEY")
+    # API roots, point them at a stand-in such as `python -m scripts.benchmarks serve` for offline runs
+    MEDIUM_API_BASE: str = os.getenv("MEDIUM_API_BASE", "https://api.medium.com/v1")
+    DEVTO_API_BASE: str = os.getenv("DEVTO_API_BASE", "https://dev.to/api")
+    
+    # Platforms published to, each needs a publisher (see get_platform_config)
+    PLATFORMS: list = [p.strip() for p in os.getenv("PLATFORMS", "medium,devto").split(',') if p.strip()]
     
     # Directory Configuration
     MARKDOWN_DIR: Path = Path(os.getenv("MARKDOWN_DIR", "./posts"))
@@ -28,6 +35,7 @@ class Settings:
         {'hour': 13, 'days': [1, 3]},  # Tuesday, Thursday
         {'hour': 15, 'days': [5]}      # Saturday
     ]
+    SLOT_CAPACITY: int = int(os.getenv("SLOT_CAPACITY", "2"))  # posts per slot unless an entry sets 'capacity'
     
     # Content Configuration
     DEFAULT_TAGS: list = ['programming', 'technology']
@@ -36,10 +44,54 @@ class Settings:
     
     # Rate Limiting
     RATE_LIMIT_DELAY: int = int(os.getenv("RATE_LIMIT_DELAY", "60"))  # seconds
+    MEDIUM_RATE_LIMIT: float = float(os.getenv("MEDIUM_RATE_LIMIT", "15"))  # requests per minute
+    DEVTO_RATE_LIMIT: float = float(os.getenv("DEVTO_RATE_LIMIT", "20"))  # requests per minute
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "3"))
+    RUN_TIME_BUDGET: int = int(os.getenv("RUN_TIME_BUDGET", "1800"))  # seconds per publish run
+    
+    # Concurrency (maximum in-flight publish requests per platform)
+    MEDIUM_CONCURRENCY: int = int(os.getenv("MEDIUM_CONCURRENCY", "2"))
+    DEVTO_CONCURRENCY: int = int(os.getenv("DEVTO_CONCURRENCY", "2"))
+    
+    # State Persistence (batched writes of tracking and queue data)
+    STATE_BACKEND: str = os.getenv("STATE_BACKEND", "json")  # json, sqlite
+    STATE_FLUSH_INTERVAL: float = float(os.getenv("STATE_FLUSH_INTERVAL", "5"))  # seconds
+    STATE_FLUSH_MAX_DIRTY: int = int(os.getenv("STATE_FLUSH_MAX_DIRTY", "25"))
+    
+    # Conversion (0 workers means one per CPU core)
+    MARKDOWN_RENDERER: str = os.getenv("MARKDOWN_RENDERER", "markdown2")  # markdown2, mistune, markdown-it, python-markdown
+    CONVERT_WORKERS: int = int(os.getenv("CONVERT_WORKERS", "0"))
+    CONVERT_CHUNK_SIZE: int = int(os.getenv("CONVERT_CHUNK_SIZE", "8"))
+    
+    # Images (Medium's upload endpoint does not accept WebP)
+    IMAGE_OPTIMIZATION: bool = os.getenv("IMAGE_OPTIMIZATION", "true").lower() == "true"
+    IMAGE_MAX_WIDTH: int = int(os.getenv("IMAGE_MAX_WIDTH", "1400"))  # pixels
+    IMAGE_QUALITY: int = int(os.getenv("IMAGE_QUALITY", "82"))
+    IMAGE_FORMAT: str = os.getenv("IMAGE_FORMAT", "original")  # original, jpeg (progressive), webp
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", "4"))
+    IMAGE_BASE_URL: str = os.getenv("IMAGE_BASE_URL", "")  # public URL of the posts directory, for platforms without uploads
+    
+    # Per-account platform metadata (e.g. the Medium user ID) cached in .tracking, not committed
+    ACCOUNT_CACHE_TTL: float = float(os.getenv("ACCOUNT_CACHE_TTL", "604800"))  # seconds
+    
+    # Daemon Mode
+    DAEMON_POLL_INTERVAL: float = float(os.getenv("DAEMON_POLL_INTERVAL", "30"))  # seconds between posts/ scans
+    DAEMON_RETRY_INTERVAL: float = float(os.getenv("DAEMON_RETRY_INTERVAL", "300"))  # seconds before a failed post is retried
+    DAEMON_HOUSEKEEPING_INTERVAL: float = float(os.getenv("DAEMON_HOUSEKEEPING_INTERVAL", "300"))  # seconds between reconcile and report passes
     
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_DIR: Path = Path(os.getenv("LOG_DIR", "./logs"))
+    METRICS_DIR: Path = Path(os.getenv("METRICS_DIR", "./logs/metrics"))  # JSON run reports and Prometheus textfiles
+    
+    # Tracing (per-post spans exported as Chrome trace-event JSON)
+    TRACE_ENABLED: bool = os.getenv("TRACE_ENABLED", "false").lower() == "true"
+    TRACE_DIR: Path = Path(os.getenv("TRACE_DIR", "./logs/traces"))
+    TRACE_MAX_EVENTS: int = int(os.getenv("TRACE_MAX_EVENTS", "100000"))
+    
+    # Profiling (--profile on the entry points, results written to LOG_DIR)
+    PROFILE_TOP_N: int = int(os.getenv("PROFILE_TOP_N", "25"))  # functions and allocation sites listed per section
+    BENCHMARK_DIR: Path = Path(os.getenv("BENCHMARK_DIR", "./logs/benchmarks"))  # benchmark reports and generated corpora
     
     @classmethod
     def validate(cls) -> Optional[Dict[str, str]]:
@@ -52,10 +104,10 @@ class Settings:
         missing = {}
         
         # Check required credentials
-        if not cls.MEDIUM_TOKEN:
-            missing['MEDIUM_TOKEN'] = "Missing Medium API token"
-        if not cls.DEVTO_API_KEY:
-            missing['DEVTO_API_KEY'] = "Missing Dev.to API key"
+        for platform in cls.PLATFORMS:
+            config = cls.get_platform_config(platform)
+            if not config.get('credential'):
+                missing[config['credential_name']] = f"Missing {platform} API credential"
         
         # Check directories
         if not cls.MARKDOWN_DIR.exists():
@@ -85,8 +137,12 @@ class Settings:
         """
         Get platform-specific configuration
         
+        Built-in platforms ('medium', 'devto') have fixed defaults. Any other
+        platform is configured from ``<PLATFORM>_*`` environment variables, with
+        ``<PLATFORM>_PUBLISHER`` naming its publisher class as "module:Class".
+        
         Args:
-            platform: Platform name ('medium' or 'devto')
+            platform: Platform name
             
         Returns:
             Dictionary of platform-specific settings
@@ -94,19 +150,44 @@ class Settings:
         platform_config = {
             'medium': {
                 'api_token': cls.MEDIUM_TOKEN,
-                'api_base': "https://api.medium.com/v1",
+                'credential': cls.MEDIUM_TOKEN,
+                'credential_name': 'MEDIUM_TOKEN',
+                'publisher': 'scripts.publish_medium:MediumPublisher',
+                'api_base': cls.MEDIUM_API_BASE,
                 'max_tags': 5,
                 'publish_status': cls.PUBLISH_STATUS,
+                'concurrency': cls.MEDIUM_CONCURRENCY,
+                'rate_limit': cls.MEDIUM_RATE_LIMIT,
+                'rate_burst': cls.RATE_LIMIT_BURST,
             },
             'devto': {
                 'api_key': cls.DEVTO_API_KEY,
-                'api_base': "https://dev.to/api",
+                'credential': cls.DEVTO_API_KEY,
+                'credential_name': 'DEVTO_API_KEY',
+                'publisher': 'scripts.publish_devto:DevToPublisher',
+                'api_base': cls.DEVTO_API_BASE,
                 'max_tags': 4,
                 'publish_status': 'published',  # Dev.to only supports published state
+                'concurrency': cls.DEVTO_CONCURRENCY,
+                'rate_limit': cls.DEVTO_RATE_LIMIT,
+                'rate_burst': cls.RATE_LIMIT_BURST,
             }
         }
+        if platform in platform_config:
+            return platform_config[platform]
         
-        return platform_config.get(platform, {})
+        prefix = re.sub(r'[^A-Z0-9]', '_', platform.upper())
+        return {
+            'credential': os.getenv(f"{prefix}_API_KEY"),
+            'credential_name': f"{prefix}_API_KEY",
+            'publisher': os.getenv(f"{prefix}_PUBLISHER"),
+            'api_base': os.getenv(f"{prefix}_API_BASE", ""),
+            'max_tags': int(os.getenv(f"{prefix}_MAX_TAGS", "4")),
+            'publish_status': cls.PUBLISH_STATUS,
+            'concurrency': int(os.getenv(f"{prefix}_CONCURRENCY", "2")),
+            'rate_limit': float(os.getenv(f"{prefix}_RATE_LIMIT", "20")),
+            'rate_burst': cls.RATE_LIMIT_BURST,
+        }
     
     @classmethod
     def initialize(cls):
@@ -0,0 +1,92 @@
+from pathlib import Path
+from typing import Dict, Any, Optional
+import json
+import os
+from .utils.logger import get_logger
+
+class ConversionCache:
+    """Persistent cache of converted posts keyed by source content hash"""
+
+    CACHE_FILENAME = '.conversion_cache.json'
+
+    def __init__(self, output_dir: Path):
+        """
+        Initialize the cache next to the converted JSON outputs
+
+        Args:
+            output_dir: Directory holding the converted ``*.json`` files
+        """
+        self.output_dir = Path(output_dir)
+        self.cache_file = self.output_dir / self.CACHE_FILENAME
+        self.logger = get_logger(__name__)
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self._load()
+
+    def _load(self):
+        """Load the cache index, starting empty if it is missing or unreadable"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with self.cache_file.open('r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = data
+                self.logger.debug(f"Loaded conversion cache with {len(data)} entries")
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable conversion cache: {e}")
+            self.entries = {}
+
+    def _save(self):
+        """Persist the cache index atomically"""
+        temp_file = self.cache_file.with_suffix('.tmp')
+        try:
+            with temp_file.open('w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            # A lost cache only costs a re-conversion, never fail the run for it
+            self.logger.warning(f"Failed to save conversion cache: {e}")
+
+    def get(self, file_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored conversion for a file if its cache key still matches
+
+        Args:
+            file_name: Name of the source markdown file
+            key: Cache key computed from the current source and settings
+
+        Returns:
+            Converted post dictionary, or None on a cache miss
+        """
+        entry = self.entries.get(file_name)
+        if not entry or entry.get('key') != key:
+            return None
+
+        output_file = self.output_dir / entry['output']
+        try:
+            with output_file.open('r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            # Output was removed or corrupted, treat as a miss
+            return None
+
+    def put(self, file_name: str, key: str, output_file: Path, save: bool = True):
+        """
+        Record a fresh conversion in the cache
+
+        Args:
+            file_name: Name of the source markdown file
+            key: Cache key computed from the source and settings
+            output_file: Path of the converted JSON output
+            save: Write the index now, batch callers pass False and call save()
+        """
+        self.entries[file_name] = {
+            'key': key,
+            'output': Path(output_file).name
+        }
+        if save:
+            self._save()
+
+    def save(self):
+        """Persist the cache index after a batch of deferred puts"""
+        self._save()
@@ -1,21 +1,299 @@
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import frontmatter
 import markdown2
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Type
 from datetime import datetime, timezone
+import importlib
 import os
+import re
+from .config.settings import Settings
+from .conversion_cache import ConversionCache
+from .images import ImageOptimizer, find_image_references, resolve_reference
 from .utils.logger import get_logger
 from .utils.exceptions import ConversionError
+from .utils.hashing import file_digest, text_digest
+from .utils.metrics import metrics
+from .utils.tracing import tracer
+
+class MarkdownRenderer:
+    """Base class for Markdown to HTML rendering backends"""
+
+    # Registry name and the module that must be importable to use the backend
+    name = ''
+    module = ''
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Check whether the backend's package is installed"""
+        try:
+            importlib.import_module(cls.module)
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def version(self) -> str:
+        """Version of the underlying package, part of the conversion cache key"""
+        return getattr(importlib.import_module(self.module), '__version__', 'unknown')
+
+    @property
+    def options(self) -> List[str]:
+        """Enabled features, part of the conversion cache key"""
+        return []
+
+    def render(self, text: str) -> str:
+        """Render Markdown to raw (unnormalized) HTML"""
+        raise NotImplementedError
+
+class Markdown2Renderer(MarkdownRenderer):
+    """markdown2 backend (default)"""
+
+    name = 'markdown2'
+    module = 'markdown2'
+
+    # Plain <pre><code class="language-x"> blocks instead of Pygments markup,
+    # which Medium and Dev.to would show without its stylesheet
+    EXTRAS = [
+        'fenced-code-blocks',
+        'highlightjs-lang',
+        'tables',
+        'metadata',
+        'strike',
+        'task_list',
+        'code-friendly'
+    ]
+
+    @property
+    def options(self) -> List[str]:
+        return self.EXTRAS
+
+    def render(self, text: str) -> str:
+        return markdown2.markdown(text, extras=self.EXTRAS)
+
+class MistuneRenderer(MarkdownRenderer):
+    """mistune backend"""
+
+    name = 'mistune'
+    module = 'mistune'
+    PLUGINS = ['strikethrough', 'table', 'task_lists']
+
+    def __init__(self):
+        import mistune
+        self._markdown = mistune.create_markdown(escape=False, plugins=self.PLUGINS)
+
+    @property
+    def options(self) -> List[str]:
+        return self.PLUGINS
+
+    def render(self, text: str) -> str:
+        return self._markdown(text)
+
+class MarkdownItRenderer(MarkdownRenderer):
+    """markdown-it-py backend, with task lists when mdit-py-plugins is installed"""
+
+    name = 'markdown-it'
+    module = 'markdown_it'
+
+    def __init__(self):
+        from markdown_it import MarkdownIt
+        self._markdown = MarkdownIt('commonmark', {'html': True}).enable(['table', 'strikethrough'])
+        self._options = ['table', 'strikethrough']
+        try:
+            from mdit_py_plugins.tasklists import tasklists_plugin
+            self._markdown.use(tasklists_plugin)
+            self._options.append('tasklists')
+        except ImportError:
+            pass
+
+    @property
+    def options(self) -> List[str]:
+        return self._options
+
+    def render(self, text: str) -> str:
+        return self._markdown.render(text)
+
+class PythonMarkdownRenderer(MarkdownRenderer):
+    """Python-Markdown backend, with strike and task lists when pymdown-extensions is installed"""
+
+    name = 'python-markdown'
+    module = 'markdown'
+
+    def __init__(self):
+        self._extensions = ['fenced_code', 'tables']
+        for extension in ('pymdownx.tilde', 'pymdownx.tasklist'):
+            try:
+                importlib.import_module(extension)
+                self._extensions.append(extension)
+            except ImportError:
+                pass
+
+    @property
+    def options(self) -> List[str]:
+        return self._extensions
+
+    def render(self, text: str) -> str:
+        import markdown
+        return markdown.markdown(text, extensions=self._extensions)
+
+RENDERERS: Dict[str, Type[MarkdownRenderer]] = {
+    renderer.name: renderer
+    for renderer in (Markdown2Renderer, MistuneRenderer, MarkdownItRenderer, PythonMarkdownRenderer)
+}
+
+def available_renderers() -> List[str]:
+    """Names of the rendering backends whose packages are installed"""
+    return [name for name, renderer in RENDERERS.items() if renderer.is_available()]
+
+def get_renderer(name: Optional[str] = None) -> MarkdownRenderer:
+    """
+    Create a rendering backend by name
+
+    Args:
+        name: Backend name (defaults to Settings.MARKDOWN_RENDERER)
+
+    Returns:
+        Renderer instance
+
+    Raises:
+        ValueError: If the backend is unknown or its package is not installed
+    """
+    name = name or Settings.MARKDOWN_RENDERER
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown markdown renderer '{name}', expected one of: {', '.join(RENDERERS)}")
+    renderer_class = RENDERERS[name]
+    if not renderer_class.is_available():
+        raise ValueError(f"Markdown renderer '{name}' needs the '{renderer_class.module}' package installed")
+    return renderer_class()
+
+_PRE_BLOCK = re.compile(r'(<pre\b.*?</pre>)', re.DOTALL)
+_CODE_CLASS = re.compile(r'<pre><code class="([^"]*)">')
+_STRIKE_TAG = re.compile(r'<(/?)(?:s|strike)>')
+_CHECKBOX = re.compile(r'<input\b[^>]*type="checkbox"[^>]*>')
+_TASK_CLASS = re.compile(r'<(ul|ol|li) class="(?:contains-task-list|task-list|task-list-item)[^"]*">')
+_TASK_LABEL = re.compile(r'</?label\b[^>]*>')
+_VOID_TAG = re.compile(r'<(br|hr|img|input)\b([^>]*?)\s*/>')
+_ALIGN = re.compile(r'\s(?:style="text-align:\s*(left|right|center);?"|align="(left|right|center)")')
+_BETWEEN_TAGS = re.compile(r'(<pre\b.*?</pre>)|>[ \t]*\n\s*(?=<)', re.DOTALL)
+
+def _normalize_code_class(match: re.Match) -> str:
+    """Reduce a code block's classes to a single language-x class"""
+    classes = match.group(1).split()
+    language = next((c[len('language-'):] for c in classes if c.startswith('language-')), None)
+    language = language or (classes[0] if classes else None)
+    return f'<pre><code class="language-{language}">' if language else '<pre><code>'
+
+def _normalize_checkbox(match: re.Match) -> str:
+    """Rewrite a task list checkbox to one canonical form"""
+    checked = ' checked' if re.search(r'\bchecked\b', match.group(0)) else ''
+    return f'<input type="checkbox" disabled{checked}>'
+
+def normalize_html(html: str) -> str:
+    """
+    Bring backend output to one canonical markup
+
+    Code block language classes, strikethrough tags, task list checkboxes,
+    void tags, table alignment and inter-tag whitespace are normalized so
+    every backend produces the same HTML for the features posts rely on.
+    Spaces between inline tags are kept, only line breaks between tags collapse.
+    Text inside <pre> blocks is left untouched apart from the code class.
+
+    Args:
+        html: Raw HTML produced by a renderer
+
+    Returns:
+        Normalized HTML
+    """
+    parts = _PRE_BLOCK.split(html)
+    normalized = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            normalized.append(_CODE_CLASS.sub(_normalize_code_class, part))
+            continue
+        part = _STRIKE_TAG.sub(r'<\1del>', part)
+        part = _CHECKBOX.sub(_normalize_checkbox, part)
+        part = _TASK_CLASS.sub(r'<\1>', part)
+        part = _TASK_LABEL.sub('', part)
+        part = _VOID_TAG.sub(r'<\1\2>', part)
+        part = _ALIGN.sub(lambda m: f' style="text-align: {m.group(1) or m.group(2)}"', part)
+        normalized.append(part)
+    # Line breaks between tags collapse everywhere except inside <pre> blocks
+    html = _BETWEEN_TAGS.sub(lambda m: m.group(1) or '>\n', ''.join(normalized))
+    return html.strip()
+
+# Representations a post can be converted to, and the converted-dict field holding each
+CONTENT_FORMATS = {
+    'html': 'content',
+    'markdown': 'markdown'
+}
+
+def _has_formats(converted: Dict[str, Any], formats: Iterable[str]) -> bool:
+    """Check whether a converted post carries every requested representation"""
+    return all(CONTENT_FORMATS[f] in converted for f in formats)
+
+def _convert_chunk(converter_class: Type['MarkdownConverter'], input_dir: str, output_dir: str,
+                   renderer: str, formats: List[str], file_paths: List[str],
+                   trace: bool = False) -> Tuple[List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]],
+                                                 Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Convert a chunk of files in a worker process
+
+    Exceptions are returned as messages so they never have to cross the
+    process boundary as pickled objects.
+
+    Returns:
+        (file path, converted post or None, error message or None) per file,
+        and the metrics and trace events recorded while converting the chunk
+    """
+    # Only this chunk's measurements go back, the parent merges them
+    metrics.reset()
+    tracer.enabled = trace
+    tracer.reset()
+    # Images are handled once by the parent process
+    converter = converter_class(input_dir, output_dir, use_cache=False, renderer=renderer,
+                                process_images=False)
+    results = []
+    for file_path in file_paths:
+        try:
+            results.append((file_path, converter.convert_single_file(Path(file_path), formats), None))
+        except Exception as e:
+            results.append((file_path, None, str(e)))
+    return results, metrics.snapshot(), tracer.drain()
 
 class MarkdownConverter:
     """Converts markdown posts to HTML/JSON with metadata"""
-    def __init__(self, input_dir: str, output_dir: str):
+
+    def __init__(self, input_dir: str, output_dir: str, use_cache: bool = True,
+                 renderer: Optional[str] = None, process_images: Optional[bool] = None):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.logger = get_logger(__name__)
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = ConversionCache(self.output_dir) if use_cache else None
+        # Per-file failures of the last convert_many() call
+        self.errors: Dict[str, str] = {}
+        self.renderer = get_renderer(renderer)
+        process_images = Settings.IMAGE_OPTIMIZATION if process_images is None else process_images
+        self.image_optimizer = ImageOptimizer(self.output_dir / 'images') if process_images else None
+        self.settings_fingerprint = text_digest(json.dumps({
+            'renderer': self.renderer.name,
+            'version': self.renderer.version,
+            'options': self.renderer.options
+        }, sort_keys=True))
+
+    def get_cache_key(self, file_path: Path) -> str:
+        """
+        Compute the cache key for a markdown file
+
+        Args:
+            file_path: Path to the markdown file
+
+        Returns:
+            Digest of the source content combined with the converter settings
+        """
+        return file_digest(file_path, salt=self.settings_fingerprint)
         
     def validate_post(self, post: frontmatter.Post, file_path: str) -> None:
         """
@@ -70,12 +348,44 @@ class MarkdownConverter:
             # Return empty list if no tags
             return []
     
-    def convert_single_file(self, file_path: Path) -> Dict[str, Any]:
+    def attach_images(self, converted: Dict[str, Any], file_path: Path) -> Dict[str, Any]:
+        """
+        Optimize the local images a post references and record them on the post
+        
+        Optimized files are content-addressed, so unchanged images are never
+        re-encoded. Publishers later upload or link them and rewrite the URLs.
+        
+        Args:
+            converted: Converted post dictionary
+            file_path: Markdown file the post came from
+            
+        Returns:
+            The post with an 'images' mapping of reference to {'key', 'file'}
+        """
+        if self.image_optimizer is None:
+            return converted
+        
+        text = converted.get('markdown', converted.get('content', ''))
+        sources = {}
+        for reference in find_image_references(text):
+            source = resolve_reference(Path(file_path), reference)
+            if source.is_file():
+                sources[reference] = source
+            else:
+                self.logger.warning(f"Image {reference} referenced by {file_path} not found")
+        
+        if sources:
+            converted['images'] = self.image_optimizer.optimize_many(sources)
+        return converted
+    
+    def convert_single_file(self, file_path: Path, formats: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Convert a single markdown file to HTML/JSON
         
         Args:
             file_path: Path to the markdown file
+            formats: Representations to produce ('html', 'markdown'), defaults to both.
+                HTML is only rendered when requested.
             
         Returns:
             Dict containing converted content and metadata
@@ -83,6 +393,11 @@ class MarkdownConverter:
         Raises:
             ConversionError: If conversion fails
         """
+        with tracer.span('convert', file_path=file_path.name, renderer=self.renderer.name):
+            return self._convert_file(file_path, formats)
+    
+    def _convert_file(self, file_path: Path, formats: Optional[Iterable[str]]) -> Dict[str, Any]:
+        """Convert one file, see convert_single_file"""
         try:
             self.logger.info(f"Converting single file: {file_path}")
             
@@ -90,9 +405,22 @@ class MarkdownConverter:
             if not file_path.exists():
                 raise ConversionError(f"Input file does not exist: {file_path}", str(file_path))
             
+            formats = set(CONTENT_FORMATS if formats is None else formats)
+            
+            # Return the stored conversion if the source is unchanged
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.get_cache_key(file_path)
+                cached = self.cache.get(file_path.name, cache_key)
+                if cached is not None and _has_formats(cached, formats):
+                    self.logger.info(f"Using cached conversion for {file_path}")
+                    metrics.inc('posts', outcome='conversion_cached')
+                    return self.attach_images(cached, file_path)
+            
             # Load frontmatter
             try:
-                post = frontmatter.load(file_path)
+                with metrics.timer('parse'):
+                    post = frontmatter.load(file_path)
             except Exception as e:
                 raise ConversionError(f"Failed to parse frontmatter: {str(e)}", str(file_path))
             
@@ -102,23 +430,7 @@ class MarkdownConverter:
             # Process tags
             post.metadata['tags'] = self.process_tags(post.metadata.get('tags', []))
             
-            # Convert content to HTML with extended features
-            try:
-                html_content = markdown2.markdown(
-                    post.content,
-                    extras=[
-                        'fenced-code-blocks',
-                        'tables',
-                        'metadata',
-                        'strike',
-                        'tasklist',
-                        'code-friendly'
-                    ]
-                )
-            except Exception as e:
-                raise ConversionError(f"Failed to convert markdown to HTML: {str(e)}", str(file_path))
-            
-            # Create output structure
+            # Create output structure, the raw body costs nothing to keep
             converted = {
                 'metadata': {
                     'title': post.metadata['title'],
@@ -128,11 +440,19 @@ class MarkdownConverter:
                     **{k: v for k, v in post.metadata.items() 
                        if k not in ['title', 'description', 'tags']}
                 },
-                'content': html_content,
+                'markdown': post.content,
                 'original_file': file_path.name,
                 'converted_at': datetime.now(timezone.utc).isoformat()
             }
             
+            # Convert content to HTML with the configured backend, only for platforms that need it
+            if 'html' in formats:
+                try:
+                    with metrics.timer('render', renderer=self.renderer.name):
+                        converted['content'] = normalize_html(self.renderer.render(post.content))
+                except Exception as e:
+                    raise ConversionError(f"Failed to convert markdown to HTML: {str(e)}", str(file_path))
+            
             # Save to output directory
             output_file = self.output_dir / f"{file_path.stem}.json"
             try:
@@ -141,41 +461,117 @@ class MarkdownConverter:
             except Exception as e:
                 raise ConversionError(f"Failed to save converted file: {str(e)}", str(file_path))
             
+            if self.cache is not None:
+                self.cache.put(file_path.name, cache_key, output_file)
+            
             self.logger.info(f"Successfully converted {file_path}")
-            return converted
+            metrics.inc('posts', outcome='converted')
+            return self.attach_images(converted, file_path)
             
         except ConversionError:
             raise
         except Exception as e:
             raise ConversionError(f"Unexpected error converting {file_path}: {str(e)}", str(file_path))
     
-    def convert(self) -> List[Dict[str, Any]]:
+    def convert_many(self, files: Optional[List[Path]] = None, workers: Optional[int] = None,
+                     chunk_size: Optional[int] = None,
+                     formats: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Convert files over a process pool, yielding posts as they complete
+        
+        Cached conversions are checked in this process and yielded first.
+        Failures are logged and collected in ``self.errors`` per file.
+        
+        Args:
+            files: Markdown files to convert (defaults to every file in input_dir)
+            workers: Worker processes (defaults to Settings.CONVERT_WORKERS)
+            chunk_size: Files handed to a worker at a time (defaults to Settings.CONVERT_CHUNK_SIZE)
+            formats: Representations to produce ('html', 'markdown'), defaults to both
+            
+        Yields:
+            Converted post dictionaries in completion order
+        """
+        files = list(self.input_dir.glob('*.md')) if files is None else [Path(f) for f in files]
+        workers = workers or Settings.CONVERT_WORKERS or os.cpu_count() or 1
+        chunk_size = max(1, chunk_size or Settings.CONVERT_CHUNK_SIZE)
+        formats = sorted(CONTENT_FORMATS if formats is None else formats)
+        self.errors = {}
+        
+        # Cache hits never leave this process
+        misses = []
+        cache_keys = {}
+        for file_path in files:
+            if self.cache is not None and file_path.exists():
+                cache_key = cache_keys[str(file_path)] = self.get_cache_key(file_path)
+                cached = self.cache.get(file_path.name, cache_key)
+                if cached is not None and _has_formats(cached, formats):
+                    metrics.inc('posts', outcome='conversion_cached')
+                    yield self.attach_images(cached, file_path)
+                    continue
+            misses.append(file_path)
+        
+        if not misses:
+            return
+        
+        if workers <= 1 or len(misses) == 1:
+            for file_path in misses:
+                try:
+                    yield self.convert_single_file(file_path, formats)
+                except ConversionError as e:
+                    self.logger.error(f"Failed to convert {e.file_path}: {str(e)}")
+                    metrics.inc('posts', outcome='conversion_failed')
+                    self.errors[str(file_path)] = str(e)
+            return
+        
+        self.logger.info(f"Converting {len(misses)} files with {workers} worker processes")
+        chunks = [
+            [str(file_path) for file_path in misses[i:i + chunk_size]]
+            for i in range(0, len(misses), chunk_size)
+        ]
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                futures = [
+                    executor.submit(_convert_chunk, type(self), str(self.input_dir), str(self.output_dir),
+                                    self.renderer.name, formats, chunk, tracer.enabled)
+                    for chunk in chunks
+                ]
+                for future in as_completed(futures):
+                    results, worker_metrics, worker_events = future.result()
+                    metrics.merge(worker_metrics)
+                    tracer.extend(worker_events)
+                    for file_path, converted, error in results:
+                        if error is not None:
+                            self.logger.error(f"Failed to convert {file_path}: {error}")
+                            metrics.inc('posts', outcome='conversion_failed')
+                            self.errors[file_path] = error
+                            continue
+                        if self.cache is not None:
+                            # Workers only write outputs, the index has a single writer
+                            path = Path(file_path)
+                            self.cache.put(path.name, cache_keys[file_path],
+                                           self.output_dir / f"{path.stem}.json", save=False)
+                        yield self.attach_images(converted, Path(file_path))
+        finally:
+            if self.cache is not None:
+                self.cache.save()
+    
+    def convert(self, workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Convert all markdown files in the input directory
         
+        Args:
+            workers: Worker processes (defaults to Settings.CONVERT_WORKERS)
+        
         Returns:
             List of converted post dictionaries
         """
         self.logger.info(f"Starting conversion from {self.input_dir}")
-        converted_posts = []
         
         # Get all markdown files
         markdown_files = list(self.input_dir.glob('*.md'))
         self.logger.info(f"Found {len(markdown_files)} markdown files")
         
-        for md_file in markdown_files:
-            try:
-                converted = self.convert_single_file(md_file)
-                converted_posts.append(converted)
-                self.logger.info(f"Successfully converted {md_file}")
-                
-            except ConversionError as e:
-                self.logger.error(f"Failed to convert {e.file_path}: {str(e)}")
-                continue
-                
-            except Exception as e:
-                self.logger.error(f"Unexpected error with {md_file}: {str(e)}")
-                continue
+        converted_posts = list(self.convert_many(markdown_files, workers=workers))
         
         self.logger.info(f"Completed conversion of {len(converted_posts)} posts")
-        return converted_posts
\ No newline at end of file
+        return converted_posts
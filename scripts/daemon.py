@@ -0,0 +1,274 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+from datetime import datetime, timezone
+import signal
+import threading
+import time
+from scripts.convert_markdown import MarkdownConverter
+from scripts.post_tracker import PostTracker
+from scripts.queue_manager import PostQueue
+from scripts.publish_engine import PublishEngine, content_formats, reconcile_pending
+from scripts.images import ImageUploadCache
+from scripts.publish_posts import create_publishers, validate_credentials
+from scripts.queue_posts import enqueue_changes
+from scripts.config.settings import Settings
+from scripts.utils.logger import get_logger
+from scripts.utils.metrics import metrics, write_run_report
+from scripts.utils.tracing import export_run_trace, tracer
+
+class PublisherDaemon:
+    """Keeps publishers and state loaded and publishes queued posts as their slots arrive"""
+
+    def __init__(self, tracker: PostTracker, queue: PostQueue, publishers: Dict[str, Any],
+                 markdown_dir: Optional[str] = None, output_dir: Optional[str] = None,
+                 poll_interval: Optional[float] = None, retry_interval: Optional[float] = None,
+                 housekeeping_interval: Optional[float] = None):
+        """
+        Initialize the daemon
+
+        Args:
+            tracker: Post tracker holding publication status
+            queue: Post queue the daemon dispatches from
+            publishers: Mapping of platform name to publisher instance
+            markdown_dir: Directory watched for new or changed posts
+            output_dir: Directory for converted posts
+            poll_interval: Maximum seconds between scans of the posts directory
+            retry_interval: Seconds before a post that failed to publish is dispatched again
+            housekeeping_interval: Seconds between passes that reconcile pending publications,
+                clean the queue and write the run report
+        """
+        self.tracker = tracker
+        self.queue = queue
+        self.publishers = publishers
+        self.markdown_dir = Path(markdown_dir or Settings.MARKDOWN_DIR)
+        self.converter = MarkdownConverter(self.markdown_dir, output_dir or Settings.OUTPUT_DIR)
+        self.image_cache = ImageUploadCache(tracker.base_dir)
+        self.poll_interval = Settings.DAEMON_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.retry_interval = Settings.DAEMON_RETRY_INTERVAL if retry_interval is None else retry_interval
+        self.housekeeping_interval = (
+            Settings.DAEMON_HOUSEKEEPING_INTERVAL if housekeeping_interval is None else housekeeping_interval
+        )
+        self.logger = get_logger(__name__)
+        self.stop_event = threading.Event()
+        # Modification times seen on the last scan of the posts directory
+        self._mtimes: Dict[str, float] = {}
+        self._last_scan: Optional[float] = None
+        # Claimed posts that failed, mapped to the monotonic time they may be retried
+        self._retry_at: Dict[str, float] = {}
+        # Claimed posts waiting for their pending publications to be reconciled
+        self._held: Set[str] = set()
+        self._last_housekeeping = time.monotonic()
+
+    def scan_posts(self) -> Set[str]:
+        """
+        Find posts added or modified since the previous scan
+
+        Returns:
+            Paths relative to the markdown directory
+        """
+        mtimes = {}
+        for path in self.markdown_dir.glob('*.md'):
+            try:
+                mtimes[str(path.relative_to(self.markdown_dir))] = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+        changed = {
+            file_path for file_path, mtime in mtimes.items()
+            if self._mtimes.get(file_path) != mtime
+        }
+        self._mtimes = mtimes
+        self._last_scan = time.monotonic()
+        return changed
+
+    def _release_retries(self):
+        """Put failed posts whose retry interval elapsed back into the queue index"""
+        now = time.monotonic()
+        for file_path, retry_at in list(self._retry_at.items()):
+            if retry_at <= now:
+                del self._retry_at[file_path]
+                self.queue.release(file_path)
+
+    def dispatch_ready(self) -> Dict[str, int]:
+        """
+        Convert and publish every queued post whose slot has arrived
+
+        Returns:
+            Counts of dispatched posts and published/failed publications
+        """
+        ready = self.queue.pop_ready()
+        stats = {'dispatched': len(ready), 'published': 0, 'failed': 0}
+        if not ready:
+            return stats
+
+        needs_publishing = self.tracker.get_unpublished_files(
+            {post['file_path'] for post in ready}, list(self.publishers)
+        )
+
+        # Settle the queue before any publish starts, the engine's workers update it under their state lock
+        dispatch = []
+        for post in ready:
+            file_path = post['file_path']
+            platforms = [
+                platform for platform in post['platforms']
+                if file_path in needs_publishing.get(platform, set())
+            ]
+            # Platforms published elsewhere (e.g. by a cron run) are simply settled
+            published = self.tracker.published_posts.get(file_path, {}).get('platforms', {})
+            for platform in post['platforms']:
+                if platform not in platforms and published.get(platform, {}).get('url'):
+                    self.queue.mark_completed(file_path, platform)
+            if platforms:
+                dispatch.append((file_path, platforms))
+            elif self.queue.queued_posts.get(file_path, {}).get('status') == 'queued':
+                # Only publications awaiting reconciliation are left: keep the post claimed
+                # instead of retrying it until the next housekeeping pass reconciles them
+                remaining = ', '.join(self.queue.queued_posts[file_path]['platforms'])
+                self.logger.warning(
+                    f"Holding {file_path} until its pending publications on {remaining} are reconciled"
+                )
+                self._held.add(file_path)
+        if not dispatch:
+            return stats
+
+        engine = PublishEngine(
+            self.publishers, self.tracker, self.queue,
+            concurrency={
+                platform: Settings.get_platform_config(platform).get('concurrency', 1)
+                for platform in self.publishers
+            },
+            image_cache=self.image_cache
+        )
+        try:
+            for file_path, platforms in dispatch:
+                try:
+                    converted_post = self.converter.convert_single_file(
+                        self.markdown_dir / file_path, content_formats(self.publishers, platforms)
+                    )
+                except Exception as e:
+                    self.logger.error(f"Error processing {file_path}: {str(e)}")
+                    continue
+                engine.submit(file_path, converted_post, platforms)
+        finally:
+            results = engine.wait()
+        stats.update(results)
+
+        # Anything still queued failed on some platform and waits before another try
+        retry_at = time.monotonic() + self.retry_interval
+        for file_path, _ in dispatch:
+            entry = self.queue.queued_posts.get(file_path)
+            if entry and entry.get('status') == 'queued':
+                self._retry_at[file_path] = retry_at
+        return stats
+
+    def housekeeping(self):
+        """
+        Periodic upkeep mirroring the end of a publish_posts run
+
+        Reconciles pending publications and hands held posts back to the
+        queue, drops old completed entries, then writes the run report and
+        trace. Metrics and spans are reset afterwards, so every report
+        covers one housekeeping interval.
+        """
+        self._last_housekeeping = time.monotonic()
+        if self.tracker.get_pending():
+            reconcile_pending(self.tracker, self.publishers)
+        for file_path in sorted(self._held):
+            self.queue.release(file_path)
+        self._held.clear()
+
+        self.queue.clean_completed(days_old=7)
+        for state, entries in self.queue.get_queue_status().items():
+            metrics.set_gauge('queue_size', len(entries), status=state)
+        write_run_report('daemon', Settings.METRICS_DIR)
+        export_run_trace('daemon', Settings.TRACE_DIR)
+        metrics.reset()
+        tracer.reset()
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        Pick up changed posts and dispatch everything that is due
+
+        Returns:
+            Counts of queued, dispatched, published and failed posts
+        """
+        flush_options = {
+            'flush_interval': Settings.STATE_FLUSH_INTERVAL,
+            'max_dirty': Settings.STATE_FLUSH_MAX_DIRTY
+        }
+        with self.tracker.batch(**flush_options), self.queue.batch(**flush_options):
+            stats = {'queued': 0}
+            if self._last_scan is None or time.monotonic() - self._last_scan >= self.poll_interval:
+                changed = self.scan_posts()
+                if changed:
+                    stats['queued'] = enqueue_changes(self.queue, self.tracker, self.markdown_dir, changed)['queued']
+            self._release_retries()
+            if time.monotonic() - self._last_housekeeping >= self.housekeeping_interval:
+                self.housekeeping()
+            stats.update(self.dispatch_ready())
+        return stats
+
+    def seconds_until_next_wake(self) -> float:
+        """Time to sleep before the next due post, scan, retry or housekeeping pass"""
+        now = time.monotonic()
+        wake_times = [self.poll_interval if self._last_scan is None else self._last_scan + self.poll_interval - now]
+        wake_times.append(self._last_housekeeping + self.housekeeping_interval - now)
+        wake_times.extend(retry_at - now for retry_at in self._retry_at.values())
+        next_due = self.queue.next_due_time()
+        if next_due is not None:
+            wake_times.append((next_due - datetime.now(timezone.utc)).total_seconds())
+        return max(0.0, min(wake_times))
+
+    def run(self):
+        """Run until stop() is called"""
+        self.logger.info(f"Publisher daemon started, watching {self.markdown_dir}")
+        reconcile_pending(self.tracker, self.publishers)
+        while not self.stop_event.is_set():
+            try:
+                stats = self.run_once()
+                if stats['queued'] or stats['dispatched']:
+                    self.logger.info(f"Daemon tick: {stats}")
+            except Exception as e:
+                # Keep serving, the next tick starts from the persisted state
+                self.logger.error(f"Daemon tick failed: {str(e)}")
+            self.stop_event.wait(self.seconds_until_next_wake())
+        self.logger.info("Publisher daemon stopped")
+
+    def stop(self):
+        """Ask the daemon loop to exit after the current tick"""
+        self.stop_event.set()
+
+def main():
+    logger = get_logger(__name__)
+    try:
+        missing_creds = validate_credentials()
+        if missing_creds:
+            logger.error(f"Missing required credentials: {', '.join(missing_creds)}")
+            return
+
+        project_root = Path.cwd()
+        logger.info(f"Project root directory: {project_root}")
+
+        tracker = PostTracker(base_dir=project_root)
+        queue = PostQueue(base_dir=project_root)
+        publishers = create_publishers(project_root)
+        daemon = PublisherDaemon(tracker, queue, publishers)
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: daemon.stop())
+
+        try:
+            daemon.run()
+        finally:
+            publishers.close()
+            # Fold journaled state changes into the committed JSON files
+            tracker.close()
+            queue.close()
+            write_run_report('daemon', Settings.METRICS_DIR)
+            export_run_trace('daemon', Settings.TRACE_DIR)
+
+    except Exception as e:
+        logger.error(f"An error occurred: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
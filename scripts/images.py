@@ -0,0 +1,302 @@
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import json
+import re
+import shutil
+import threading
+from PIL import Image, ImageOps
+from .utils.hashing import file_digest, text_digest
+from .utils.journal import write_json_atomic
+from .utils.logger import get_logger
+from .config.settings import Settings
+
+# ![alt](path "title") and <img src="path"> references
+_MARKDOWN_IMAGE = re.compile(r'!\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+["\'][^)]*["\'])?\s*\)')
+_HTML_IMAGE = re.compile(r'<img\b[^>]*?\bsrc=["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Pillow format names and file extensions of the output encodings
+_FORMATS = {
+    'jpeg': ('JPEG', '.jpg'),
+    'png': ('PNG', '.png'),
+    'webp': ('WEBP', '.webp'),
+    'gif': ('GIF', '.gif')
+}
+
+def is_local_reference(reference: str) -> bool:
+    """Check whether an image reference points at a file in the repository"""
+    return not re.match(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', reference, re.IGNORECASE)
+
+def _strip_relative_prefix(reference: str) -> str:
+    """Drop leading './' and '/' from a repository-relative reference"""
+    return re.sub(r'^(?:\./|/)+', '', reference)
+
+def resolve_reference(post_file: Path, reference: str) -> Path:
+    """
+    Locate the file an image reference in a post points at
+
+    Args:
+        post_file: Markdown file containing the reference
+        reference: Local image reference
+
+    Returns:
+        Path of the referenced image (it may not exist)
+    """
+    return post_file.parent / _strip_relative_prefix(reference.split('#')[0].split('?')[0])
+
+def find_image_references(text: str) -> List[str]:
+    """
+    Find local image references in Markdown or HTML, in order of appearance
+
+    Args:
+        text: Markdown or rendered HTML
+
+    Returns:
+        Unique local references (remote URLs are skipped)
+    """
+    references = []
+    for pattern in (_MARKDOWN_IMAGE, _HTML_IMAGE):
+        for match in pattern.finditer(text):
+            reference = match.group(1)
+            if is_local_reference(reference) and reference not in references:
+                references.append(reference)
+    return references
+
+def rewrite_image_urls(text: str, urls: Dict[str, str]) -> str:
+    """
+    Replace image references with their published URLs
+
+    Args:
+        text: Markdown or rendered HTML
+        urls: Mapping of original reference to URL
+
+    Returns:
+        Text with every mapped reference replaced
+    """
+    if not urls:
+        return text
+
+    def replace_markdown(match: re.Match) -> str:
+        reference = match.group(1)
+        return match.group(0).replace(reference, urls[reference], 1) if reference in urls else match.group(0)
+
+    def replace_html(match: re.Match) -> str:
+        reference = match.group(1)
+        if reference not in urls:
+            return match.group(0)
+        start, end = match.span(1)
+        offset = match.start()
+        return match.group(0)[:start - offset] + urls[reference] + match.group(0)[end - offset:]
+
+    text = _MARKDOWN_IMAGE.sub(replace_markdown, text)
+    return _HTML_IMAGE.sub(replace_html, text)
+
+class ImageOptimizer:
+    """Resizes and recompresses post images into content-addressed files"""
+
+    def __init__(self, output_dir: Path, max_width: Optional[int] = None, quality: Optional[int] = None,
+                 output_format: Optional[str] = None, workers: Optional[int] = None):
+        """
+        Initialize the optimizer
+
+        Args:
+            output_dir: Directory receiving optimized images
+            max_width: Images wider than this are scaled down (defaults to Settings.IMAGE_MAX_WIDTH)
+            quality: JPEG/WebP quality (defaults to Settings.IMAGE_QUALITY)
+            output_format: 'original', 'jpeg' or 'webp' (defaults to Settings.IMAGE_FORMAT)
+            workers: Images encoded in parallel (defaults to Settings.IMAGE_WORKERS)
+        """
+        self.output_dir = Path(output_dir)
+        self.max_width = Settings.IMAGE_MAX_WIDTH if max_width is None else max_width
+        self.quality = Settings.IMAGE_QUALITY if quality is None else quality
+        self.output_format = (output_format or Settings.IMAGE_FORMAT).lower()
+        self.workers = max(1, workers or Settings.IMAGE_WORKERS)
+        self.logger = get_logger(__name__)
+        self.fingerprint = text_digest(json.dumps({
+            'max_width': self.max_width,
+            'quality': self.quality,
+            'format': self.output_format
+        }, sort_keys=True))
+
+    def image_key(self, source: Path) -> str:
+        """Digest of the source image combined with the optimization settings"""
+        return file_digest(source, salt=self.fingerprint)
+
+    def _target_format(self, image: Image.Image) -> str:
+        """Output format name for an opened, non-animated image"""
+        original = (image.format or 'PNG').lower()
+        original = original if original in _FORMATS else 'png'
+        if self.output_format == 'webp':
+            return 'webp'
+        if self.output_format == 'jpeg' and image.mode not in ('RGBA', 'LA', 'P'):
+            return 'jpeg'
+        # 'original', or JPEG requested for an image with transparency
+        return original
+
+    def optimize(self, source: Path, key: Optional[str] = None) -> Path:
+        """
+        Produce the optimized version of one image, reusing it if it already exists
+
+        Args:
+            source: Image file
+            key: Precomputed image key
+
+        Returns:
+            Path of the optimized image
+        """
+        source = Path(source)
+        key = key or self.image_key(source)
+        existing = list(self.output_dir.glob(f"{key[:20]}.*"))
+        if existing:
+            return existing[0]
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as image:
+            animated = getattr(image, 'is_animated', False)
+            if animated:
+                # Re-encoding animations loses frames, ship them untouched
+                extension = source.suffix.lower() or '.gif'
+            else:
+                target = self._target_format(image)
+                pillow_format, extension = _FORMATS[target]
+            output = self.output_dir / f"{key[:20]}{extension}"
+            temp_output = output.with_name(f".{output.name}.tmp")
+
+            if animated:
+                shutil.copyfile(source, temp_output)
+            else:
+                image = ImageOps.exif_transpose(image)
+                if self.max_width and image.width > self.max_width:
+                    height = round(image.height * self.max_width / image.width)
+                    image = image.resize((self.max_width, height), Image.LANCZOS)
+                options: Dict[str, Any] = {'optimize': True}
+                if target == 'jpeg':
+                    image = image.convert('RGB')
+                    options.update(quality=self.quality, progressive=True)
+                elif target == 'webp':
+                    options = {'quality': self.quality, 'method': 6}
+                image.save(temp_output, pillow_format, **options)
+
+        # Never ship a larger file than the source in the same format
+        same_format = source.suffix.lower().replace('.jpeg', '.jpg') == extension
+        if same_format and temp_output.stat().st_size > source.stat().st_size:
+            shutil.copyfile(source, temp_output)
+        temp_output.replace(output)
+        self.logger.info(f"Optimized {source.name} -> {output.name}")
+        return output
+
+    def optimize_many(self, sources: Dict[str, Path]) -> Dict[str, Dict[str, str]]:
+        """
+        Optimize several images in parallel, skipping missing or unreadable files
+
+        Args:
+            sources: Mapping of reference to source image path
+
+        Returns:
+            Mapping of reference to {'key', 'file'} for each optimized image
+        """
+        def process(item):
+            reference, source = item
+            try:
+                key = self.image_key(source)
+                return reference, {'key': key, 'file': str(self.optimize(source, key))}
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Skipping image {reference}: {str(e)}")
+                return reference, None
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(sources)))) as executor:
+            results = executor.map(process, sources.items())
+            return {reference: result for reference, result in results if result is not None}
+
+class ImageUploadCache:
+    """Remembers where each optimized image was uploaded, per platform"""
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Initialize the cache in the tracking directory
+
+        Args:
+            base_dir: Project root (defaults to the current directory)
+        """
+        base_dir = Path(base_dir) if base_dir else Path.cwd()
+        self.cache_file = base_dir / '.tracking' / 'image_uploads.json'
+        self.logger = get_logger(__name__)
+        self.lock = threading.Lock()
+        # One lock per image key so concurrent posts never upload the same image twice
+        self.key_locks: Dict[str, threading.Lock] = {}
+        self.entries: Dict[str, Dict[str, str]] = {}
+        if self.cache_file.exists():
+            try:
+                with self.cache_file.open('r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable image upload cache: {e}")
+
+    def get_or_upload(self, platform: str, key: str, upload: Callable[[], str]) -> str:
+        """
+        Return the uploaded URL of an image, uploading it on first use
+
+        Args:
+            platform: Platform the image is hosted on
+            key: Image key of the optimized file
+            upload: Uploads the image and returns its URL
+
+        Returns:
+            Image URL on the platform
+        """
+        with self.lock:
+            key_lock = self.key_locks.setdefault(f"{platform}:{key}", threading.Lock())
+        with key_lock:
+            url = self.entries.get(platform, {}).get(key)
+            if url:
+                return url
+            url = upload()
+            with self.lock:
+                self.entries.setdefault(platform, {})[key] = url
+                try:
+                    self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    write_json_atomic(self.cache_file, self.entries)
+                except OSError as e:
+                    # The image is uploaded, a lost cache entry only costs a re-upload next run
+                    self.logger.warning(f"Could not save image upload cache: {e}")
+            return url
+
+def resolve_images(content: Dict[str, Any], platform: str, publisher: Any,
+                   upload_cache: Optional[ImageUploadCache]) -> Dict[str, Any]:
+    """
+    Point a converted post's images at URLs the platform can load
+
+    Publishers with ``upload_image`` get each image uploaded once (through
+    the upload cache); others get Settings.IMAGE_BASE_URL plus the original
+    reference when it is configured.
+
+    Args:
+        content: Converted post with an 'images' mapping
+        platform: Target platform
+        publisher: Publisher instance
+        upload_cache: Cache of uploaded images
+
+    Returns:
+        A copy of the post with rewritten HTML and Markdown
+    """
+    images = content.get('images') or {}
+    if not images:
+        return content
+
+    urls = {}
+    if hasattr(publisher, 'upload_image') and upload_cache is not None:
+        for reference, image in images.items():
+            urls[reference] = upload_cache.get_or_upload(
+                platform, image['key'], lambda image=image: publisher.upload_image(Path(image['file']))
+            )
+    elif Settings.IMAGE_BASE_URL:
+        base_url = Settings.IMAGE_BASE_URL.rstrip('/')
+        urls = {reference: f"{base_url}/{_strip_relative_prefix(reference)}" for reference in images}
+
+    if not urls:
+        return content
+    resolved = dict(content)
+    for field in ('content', 'markdown'):
+        if field in resolved:
+            resolved[field] = rewrite_image_urls(resolved[field], urls)
+    return resolved
@@ -1,14 +1,20 @@
 from pathlib import Path
-from typing import Dict, Set, Optional, Tuple
+from contextlib import contextmanager
+from typing import Dict, Set, Optional, Tuple, List
 from datetime import datetime
-import json
 from .utils.logger import get_logger
-from .utils.exceptions import TrackingError
+from .utils.metrics import metrics
+from .utils.tracing import tracer
+from .utils.exceptions import StateConflictError, TrackingError
+from .utils.journal import JournalStore
+from .utils.sqlite_store import SqliteStore, IndexRow
+from .config.settings import Settings
 
 class PostTracker:
     """Tracks the publication status of blog posts across different platforms"""
     
-    def __init__(self, base_dir: Optional[str] = None):
+    def __init__(self, base_dir: Optional[str] = None, compact_every: int = 50,
+                 backend: Optional[str] = None):
         """Initialize the post tracker"""
         self.base_dir = Path(base_dir) if base_dir else Path.cwd()
         # Store tracking data in repository instead of runner storage
@@ -20,96 +26,254 @@ class PostTracker:
         # Create tracking directory if it doesn't exist
         self.tracking_dir.mkdir(exist_ok=True)
         
+        # JSON journal (default) or SQLite; both keep tracking_file as readable snapshot
+        backend = backend or Settings.STATE_BACKEND
+        if backend == 'sqlite':
+            self.store = SqliteStore(self.tracking_file, indexer=self._index_entry)
+        else:
+            self.store = JournalStore(self.tracking_file, compact_every=compact_every)
+        
         # Initialize tracking file if it doesn't exist
-        if not self.tracking_file.exists():
+        if not self.store.exists():
             self._save_tracking_data()
             
         self._load_tracking_data()
     
     def _load_tracking_data(self):
-        """Load existing tracking data"""
+        """Load existing tracking data (snapshot plus journaled mutations)"""
         try:
-            if self.tracking_file.exists():
-                with self.tracking_file.open('r') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict):
-                        self.published_posts = data
-                        self.logger.info(f"Loaded tracking data for {len(data)} posts")
-                    else:
-                        self.logger.warning("Invalid tracking data format, initializing empty tracking")
-                        self.published_posts = {}
+            if self.store.exists():
+                data = self.store.load_snapshot()
+                if isinstance(data, dict):
+                    self.published_posts = data
+                    if self.store.has_journal():
+                        replayed = self.store.replay(self.published_posts)
+                        self.logger.info(f"Replayed {replayed} journaled tracking changes")
+                        self._save_tracking_data()
+                    self.logger.info(f"Loaded tracking data for {len(self.published_posts)} posts")
+                else:
+                    self.logger.warning("Invalid tracking data format, initializing empty tracking")
+                    self.published_posts = {}
             else:
                 self.logger.info("No existing tracking data found, initializing empty tracking")
                 self._save_tracking_data()
                 
+        except StateConflictError:
+            # Resetting here would overwrite one of the diverged copies
+            raise
         except Exception as e:
             self.logger.error(f"Error loading tracking data: {e}")
+            self._backup_corrupt_file()
             self.published_posts = {}
             self._save_tracking_data()
     
+    def _backup_corrupt_file(self):
+        """Keep a copy of an unreadable tracking file before it is replaced"""
+        try:
+            if self.tracking_file.exists():
+                backup = self.tracking_file.with_name(f"{self.tracking_file.name}.corrupt")
+                backup.write_bytes(self.tracking_file.read_bytes())
+                self.logger.warning(f"Saved unreadable tracking data to {backup}")
+        except Exception as e:
+            self.logger.error(f"Error backing up tracking data: {e}")
+    
     def _save_tracking_data(self):
-        """Save tracking data to repository"""
+        """Save the full tracking snapshot to repository and clear the journal"""
         try:
             # Ensure tracking directory exists
             self.tracking_dir.mkdir(exist_ok=True)
             
-            # Save with pretty printing for better readability in git
-            with self.tracking_file.open('w') as f:
-                json.dump(self.published_posts, f, indent=2, sort_keys=True)
+            # Atomic, pretty-printed snapshot for better readability in git
+            with metrics.timer('state_save', store='tracker', op='snapshot'):
+                with tracer.span('tracker.save', category='state', op='snapshot'):
+                    self.store.compact(self.published_posts)
                 
             self.logger.info(f"Saved tracking data to {self.tracking_file}")
         except Exception as e:
             self.logger.error(f"Error saving tracking data: {e}")
             raise TrackingError(f"Failed to save tracking data: {str(e)}")
     
-    def check_platform_status(self, file_path: str) -> Tuple[bool, bool]:
-        """Check if a post is published on Medium and Dev.to"""
-        post_data = self.published_posts.get(file_path, {})
-        platform_data = post_data.get('platforms', {})
+    def _persist(self, file_path: str, force: bool = False):
+        """
+        Journal the current tracking state of one post
         
-        medium_published = bool(platform_data.get('medium', {}).get('url'))
-        devto_published = bool(platform_data.get('devto', {}).get('url'))
+        Inside a batch the write is deferred until the batch ends or its
+        interval/dirty-count threshold is hit, unless ``force`` is set.
+        """
+        self.store.mark_dirty(file_path)
+        if force or self.store.should_flush():
+            self._flush()
+    
+    def _flush(self):
+        """Write all dirty entries to the journal, compacting when due"""
+        try:
+            with metrics.timer('state_save', store='tracker', op='journal'):
+                with tracer.span('tracker.save', category='state', op='journal'):
+                    self.store.flush(self.published_posts)
+        except Exception as e:
+            self.logger.error(f"Error journaling tracking data: {e}")
+            raise TrackingError(f"Failed to save tracking data: {str(e)}")
         
-        return medium_published, devto_published
+        if self.store.needs_compaction:
+            self._save_tracking_data()
     
-    def get_unpublished_files(self, all_files: Set[str]) -> Dict[str, Set[str]]:
-        """Get files that need publishing for each platform"""
-        needs_publishing = {
-            'medium': set(),
-            'devto': set()
-        }
+    @contextmanager
+    def batch(self, flush_interval: Optional[float] = None, max_dirty: Optional[int] = None):
+        """
+        Defer persistence of changes made inside the block and flush them once
+        
+        Changes are flushed when the block exits even if it raises, because
+        they record work that already happened on the platforms.
+        
+        Args:
+            flush_interval: Flush early once this many seconds passed since the last flush
+            max_dirty: Flush early once this many entries changed
+        """
+        self.store.begin(flush_interval=flush_interval, max_dirty=max_dirty)
+        try:
+            yield self
+        finally:
+            if self.store.end():
+                self._flush()
+    
+    def close(self):
+        """Fold any journaled changes into the snapshot file and close the store"""
+        try:
+            if self.store.has_unsaved_changes():
+                self._save_tracking_data()
+        finally:
+            self.store.close()
+    
+    @staticmethod
+    def _index_entry(file_path: str, data: Dict) -> IndexRow:
+        """Extract the indexed platform states of a tracked post"""
+        platforms = {platform: 'pending' for platform in data.get('pending', {})}
+        platforms.update({
+            platform: 'published'
+            for platform, details in data.get('platforms', {}).items()
+            if details.get('url')
+        })
+        return IndexRow(platforms=platforms)
+    
+    def check_platform_status(self, file_path: str, platforms: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Check on which platforms a post is published
         
-        for file_path in all_files:
-            medium_done, devto_done = self.check_platform_status(file_path)
+        Args:
+            file_path: Post path
+            platforms: Platforms to check (defaults to Settings.PLATFORMS)
             
-            if not medium_done:
-                needs_publishing['medium'].add(file_path)
-                self.logger.info(f"File needs Medium publishing: {file_path}")
+        Returns:
+            Mapping of platform to whether the post has a published URL there
+        """
+        post_data = self.published_posts.get(file_path, {})
+        platform_data = post_data.get('platforms', {})
+        return {
+            platform: bool(platform_data.get(platform, {}).get('url'))
+            for platform in (Settings.PLATFORMS if platforms is None else platforms)
+        }
+    
+    def get_unpublished_files(self, all_files: Set[str],
+                              platforms: Optional[List[str]] = None) -> Dict[str, Set[str]]:
+        """
+        Get files that need publishing for each platform
+        
+        Args:
+            all_files: Post paths to check
+            platforms: Platforms to check (defaults to Settings.PLATFORMS)
             
-            if not devto_done:
-                needs_publishing['devto'].add(file_path)
-                self.logger.info(f"File needs Dev.to publishing: {file_path}")
-                
+        Returns:
+            Mapping of platform to the posts neither published nor pending there
+        """
+        needs_publishing = {
+            platform: set() for platform in (Settings.PLATFORMS if platforms is None else platforms)
+        }
+        
+        if self.store.supports_queries:
+            # Published or pending posts come straight from the platform index
+            for platform in needs_publishing:
+                settled = self.store.keys_with_platform_state(
+                    self.published_posts, platform, ('published', 'pending'),
+                    lambda data, platform=platform: platform in self._index_entry('', data).platforms
+                )
+                needs_publishing[platform] = set(all_files) - settled
+        else:
+            for file_path in all_files:
+                published = self.check_platform_status(file_path, list(needs_publishing))
+                pending = self.published_posts.get(file_path, {}).get('pending', {})
+                for platform, done in published.items():
+                    if not done and platform not in pending:
+                        needs_publishing[platform].add(file_path)
+        
+        for platform, file_paths in needs_publishing.items():
+            for file_path in file_paths:
+                self.logger.info(f"File needs {platform} publishing: {file_path}")
         return needs_publishing
     
     def mark_platform_published(self, file_path: str, platform: str, 
                               url: str, platform_id: Optional[str] = None):
         """Mark a post as published on a specific platform"""
-        if file_path not in self.published_posts:
-            self.published_posts[file_path] = {
-                'first_published_at': datetime.now().isoformat(),
-                'platforms': {}
-            }
+        post_data = self.published_posts.setdefault(file_path, {'platforms': {}})
+        post_data.setdefault('first_published_at', datetime.now().isoformat())
         
-        self.published_posts[file_path]['platforms'][platform] = {
+        post_data['platforms'][platform] = {
             'url': url,
             'platform_id': platform_id,
             'published_at': datetime.now().isoformat()
         }
         
-        self._save_tracking_data()
+        # A confirmed publication resolves any outstanding intent
+        self._discard_pending(file_path, platform)
+        
+        self._persist(file_path)
         self.logger.info(f"Marked {file_path} as published on {platform}: {url}")
     
+    def mark_pending(self, file_path: str, platform: str, title: str):
+        """
+        Record the intent to publish a post before the API call is made
+        
+        If the run dies between the platform accepting the post and
+        ``mark_platform_published``, the pending record lets the next run
+        reconcile instead of publishing a duplicate.
+        """
+        post_data = self.published_posts.setdefault(file_path, {'platforms': {}})
+        post_data.setdefault('pending', {})[platform] = {
+            'title': title,
+            'started_at': datetime.now().isoformat()
+        }
+        
+        # The intent must be durable before the request is sent, even inside a batch
+        self._persist(file_path, force=True)
+        self.logger.info(f"Marked {file_path} as pending on {platform}")
+    
+    def clear_pending(self, file_path: str, platform: str):
+        """Remove the publish intent for a post that definitely was not published"""
+        if self._discard_pending(file_path, platform):
+            self._persist(file_path)
+            self.logger.info(f"Cleared pending {platform} publication for {file_path}")
+    
+    def _discard_pending(self, file_path: str, platform: str) -> bool:
+        """Drop a pending record in memory, returning whether one existed"""
+        post_data = self.published_posts.get(file_path)
+        if not post_data or platform not in post_data.get('pending', {}):
+            return False
+        
+        del post_data['pending'][platform]
+        if not post_data['pending']:
+            del post_data['pending']
+        if not post_data['platforms'] and 'pending' not in post_data:
+            # Nothing was ever published, forget the post entirely
+            del self.published_posts[file_path]
+        return True
+    
+    def get_pending(self) -> List[Tuple[str, str, Dict]]:
+        """Get all (file_path, platform, intent) records awaiting reconciliation"""
+        return [
+            (file_path, platform, intent)
+            for file_path, post_data in self.published_posts.items()
+            for platform, intent in post_data.get('pending', {}).items()
+        ]
+    
     def get_status_report(self) -> Dict[str, Dict]:
         """Get a complete status report of all tracked posts"""
         return self.published_posts
\ No newline at end of file
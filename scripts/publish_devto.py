@@ -1,19 +1,29 @@
-import requests
 import re
-from typing import Dict, Any, List
-from .utils.logger import get_logger
+from typing import Dict, Any, List, Optional, Tuple
+from .base_publisher import BasePublisher
 from .utils.exceptions import PublishError
+from .utils.tracing import tracer
 
-class DevToPublisher:
+class DevToPublisher(BasePublisher):
     """Handles publishing to Dev.to"""
-    def __init__(self, api_key: str):
+    platform = 'devto'
+    # Articles can be listed through /articles/me, so pending publications can be verified
+    supports_lookup = True
+    # Dev.to renders Markdown itself, so posts are sent without an HTML pass
+    content_format = 'markdown'
+    required_fields = ['title', 'body_markdown']
+    
+    def __init__(self, api_key: str, pool_size: int = 4,
+                 rate_limit: Optional[float] = None, rate_burst: Optional[int] = None,
+                 api_base: Optional[str] = None):
         self.api_key = api_key
-        self.api_base = "https://dev.to/api"
-        self.logger = get_logger(__name__)
-        self.headers = {
-            'api-key': self.api_key,
-            'content-type': 'application/json'
-        }
+        super().__init__(
+            {
+                'api-key': self.api_key,
+                'content-type': 'application/json'
+            },
+            pool_size=pool_size, rate_limit=rate_limit, rate_burst=rate_burst, api_base=api_base
+        )
     
     def _clean_tag(self, tag: str) -> str:
         """
@@ -51,8 +61,8 @@ class DevToPublisher:
         Returns:
             Formatted content ready for Dev.to API
         """
-        # Get content and metadata
-        html_content = content.get('content', '')
+        # Get content and metadata, falling back to HTML for conversions made before the raw body was kept
+        body = content['markdown'] if 'markdown' in content else content.get('content', '')
         title = content['metadata'].get('title', '')
         description = content['metadata'].get('description', '')
         
@@ -77,25 +87,55 @@ class DevToPublisher:
         
         self.logger.info(f"Processed tags: {processed_tags}")
         
-        # Format content with front matter
-        markdown_content = f"""---
-title: {title}
-published: true
-description: {description}
-tags: {','.join(processed_tags)}
----
-
-{html_content}
-"""
-        
-        return {
-            'article': {
-                'title': title,
-                'body_markdown': markdown_content,
-                'published': True,
-                'tags': processed_tags
-            }
+        # Metadata goes in article fields rather than a front matter block, which
+        # broke on titles and descriptions containing YAML syntax such as colons
+        article = {
+            'title': title,
+            'body_markdown': body,
+            'description': description,
+            'published': True,
+            'tags': processed_tags
         }
+        self.validate_payload(article)
+        return {'article': article}
+    
+    def extract_reference(self, result: Dict[str, Any]) -> Tuple[Optional[str], Optional[int]]:
+        """Extract the article URL and ID from a Dev.to API response"""
+        return result.get('url'), result.get('id')
+    
+    def find_existing(self, title: str, per_page: int = 100) -> Optional[Dict[str, Any]]:
+        """
+        Find an article with the given title among the user's Dev.to articles
+        
+        Args:
+            title: Article title to look for
+            per_page: Page size used while listing articles
+            
+        Returns:
+            The matching article, or None if the user has no such article
+            
+        Raises:
+            PublishError: If the articles cannot be listed
+        """
+        page = 1
+        while True:
+            response = self._request(
+                'GET',
+                f"{self.api_base}/articles/me/all",
+                params={'page': page, 'per_page': per_page},
+                timeout=30
+            )
+            if response.status_code != 200:
+                raise PublishError(f"Failed to list Dev.to articles: {response.text}", "dev.to")
+            
+            articles = response.json()
+            for article in articles:
+                if article.get('title') == title:
+                    return article
+            
+            if len(articles) < per_page:
+                return None
+            page += 1
     
     def publish(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -110,15 +150,20 @@ tags: {','.join(processed_tags)}
         Raises:
             PublishError: If publication fails
         """
+        with tracer.span('devto.publish', category='publish', platform='devto'):
+            return self._publish(content)
+    
+    def _publish(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Publish content to Dev.to, see publish"""
         try:
             self.logger.info("Preparing content for Dev.to publication...")
-            post_data = self._prepare_content(content)
+            post_data = self.build_payload(content)
             
             self.logger.info(f"Publishing with tags: {post_data['article']['tags']}")
             
-            response = requests.post(
+            response = self._request(
+                'POST',
                 f"{self.api_base}/articles",
-                headers=self.headers,
                 json=post_data,
                 timeout=30
             )
@@ -135,5 +180,7 @@ tags: {','.join(processed_tags)}
             else:
                 raise PublishError(f"Failed to publish to Dev.to: {response.text}", "dev.to")
                 
+        except PublishError:
+            raise
         except Exception as e:
             raise PublishError(f"Error during Dev.to publication: {str(e)}", "dev.to")
\ No newline at end of file
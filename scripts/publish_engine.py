@@ -0,0 +1,266 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+import threading
+import time
+from .post_tracker import PostTracker
+from .queue_manager import PostQueue
+from .images import ImageUploadCache, resolve_images
+from .utils.logger import get_logger
+from .utils.exceptions import PublishError, PublishStateUnknownError, NetworkError
+from .utils.retry import RetryPolicy
+from .utils.metrics import metrics
+from .utils.tracing import tracer
+from .config.settings import Settings
+
+def content_formats(publishers: Dict[str, Any], platforms: Iterable[str]) -> Set[str]:
+    """
+    Representations a post must be converted to for the given platforms
+
+    Args:
+        publishers: Mapping of platform name to publisher instance
+        platforms: Platforms the post will be published to
+
+    Returns:
+        Content formats ('html', 'markdown') declared by those publishers
+    """
+    return {
+        getattr(publishers[platform], 'content_format', 'html')
+        for platform in platforms if platform in publishers
+    }
+
+def reconcile_pending(tracker: PostTracker, publishers: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Resolve publish intents left behind by an interrupted run
+
+    Each pending record is looked up on its platform: a found post is marked
+    published, a missing one is cleared so it can be published again. Records
+    that cannot be verified stay pending so they are never published twice.
+
+    Args:
+        tracker: Post tracker holding the pending records
+        publishers: Mapping of platform name to publisher instance
+
+    Returns:
+        Counts of recovered, cleared and unresolved records
+    """
+    logger = get_logger(__name__)
+    stats = {'recovered': 0, 'cleared': 0, 'unresolved': 0}
+
+    for file_path, platform, intent in tracker.get_pending():
+        publisher = publishers.get(platform)
+        if publisher is None or not getattr(publisher, 'supports_lookup', False):
+            logger.warning(
+                f"Cannot verify pending {platform} publication of {file_path}; "
+                f"remove its 'pending' entry from the tracking file once checked manually"
+            )
+            stats['unresolved'] += 1
+            continue
+
+        try:
+            existing = publisher.find_existing(intent.get('title', ''))
+        except PublishError as e:
+            logger.warning(f"Could not reconcile {file_path} on {platform}: {str(e)}")
+            stats['unresolved'] += 1
+            continue
+
+        if existing:
+            url, platform_id = publisher.extract_reference(existing)
+            logger.info(f"Recovered earlier {platform} publication of {file_path}: {url}")
+            tracker.mark_platform_published(file_path, platform, url, platform_id)
+            stats['recovered'] += 1
+        else:
+            tracker.clear_pending(file_path, platform)
+            stats['cleared'] += 1
+
+    if any(stats.values()):
+        logger.info(
+            f"Reconciled pending publications: {stats['recovered']} recovered, "
+            f"{stats['cleared']} cleared, {stats['unresolved']} unresolved"
+        )
+    return stats
+
+class PublishEngine:
+    """Publishes posts to several platforms concurrently with per-platform limits"""
+
+    def __init__(self, publishers: Dict[str, Any], tracker: PostTracker, queue: PostQueue,
+                 concurrency: Optional[Dict[str, int]] = None,
+                 time_budget: Optional[float] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 image_cache: Optional[ImageUploadCache] = None):
+        """
+        Initialize the publish engine
+
+        Args:
+            publishers: Mapping of platform name to publisher instance
+            tracker: Post tracker updated after each successful publication
+            queue: Post queue updated after each successful publication
+            concurrency: Maximum in-flight requests per platform (defaults to 1)
+            time_budget: Seconds this run may spend retrying and waiting out rate limits
+            retry_policy: Policy for transient failures (defaults to Settings-driven policy)
+            image_cache: Upload cache used to host post images on platforms that accept uploads
+        """
+        self.publishers = publishers
+        self.tracker = tracker
+        self.queue = queue
+        self.logger = get_logger(__name__)
+        concurrency = concurrency or {}
+        time_budget = Settings.RUN_TIME_BUDGET if time_budget is None else time_budget
+        self.deadline = time.monotonic() + time_budget
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.image_cache = image_cache
+
+        # One bounded pool per platform so a slow platform never starves the others
+        self.executors = {
+            platform: ThreadPoolExecutor(
+                max_workers=max(1, int(concurrency.get(platform, 1))),
+                thread_name_prefix=f"publish-{platform}"
+            )
+            for platform in publishers
+        }
+        self.futures: List[Tuple[str, str, Future]] = []
+        # Serializes tracker and queue updates so the JSON state is never interleaved
+        self.state_lock = threading.Lock()
+
+    def submit(self, file_path: str, content: Dict[str, Any], platforms: List[str]):
+        """
+        Schedule a converted post for publication on the given platforms
+
+        Args:
+            file_path: Post path relative to the markdown directory
+            content: Converted post dictionary
+            platforms: Platforms the post still needs publishing to
+        """
+        for platform in platforms:
+            if platform not in self.executors:
+                self.logger.warning(f"No publisher configured for {platform}, skipping {file_path}")
+                continue
+            future = self.executors[platform].submit(self._publish_one, file_path, platform, content)
+            self.futures.append((file_path, platform, future))
+
+    def _publish_one(self, file_path: str, platform: str, content: Dict[str, Any]) -> bool:
+        """Publish one post to one platform and record the result"""
+        # Every span below (payload, HTTP, state saves) carries the post and platform
+        with tracer.context(file_path=file_path, platform=platform):
+            with tracer.span('publish.post', category='publish') as span:
+                published = self._publish_post(file_path, platform, content)
+                span.set(published=published)
+                return published
+
+    def _publish_post(self, file_path: str, platform: str, content: Dict[str, Any]) -> bool:
+        """Publish one post to one platform, see _publish_one"""
+        publisher = self.publishers[platform]
+        can_lookup = getattr(publisher, 'supports_lookup', False)
+        title = content.get('metadata', {}).get('title', file_path)
+        attempts = 0
+        outcome_unknown = False
+        # Whether the current attempt got as far as sending the publish request
+        request_sent = False
+
+        def attempt() -> Dict[str, Any]:
+            nonlocal attempts, outcome_unknown, request_sent
+            attempts += 1
+            request_sent = False
+            if outcome_unknown and can_lookup:
+                # A previous attempt may have gone through, check before posting again
+                existing = publisher.find_existing(title)
+                if existing:
+                    self.logger.info(f"Found existing {platform} publication for {file_path}")
+                    return existing
+                outcome_unknown = False
+            self.logger.info(f"Attempting to publish {file_path} to {platform} (attempt {attempts})...")
+            # Uploads are cached, so a retry only sends the images that failed
+            payload = resolve_images(content, platform, publisher, self.image_cache)
+            request_sent = True
+            try:
+                with tracer.context(attempt=attempts), metrics.timer('publish', platform=platform):
+                    return publisher.publish(payload)
+            except PublishStateUnknownError as e:
+                outcome_unknown = True
+                if can_lookup:
+                    # Safe to retry because the next attempt looks the post up first
+                    raise NetworkError(platform, details=str(e))
+                raise
+
+        def on_retry(attempt_number: int, error: PublishError, delay: float):
+            metrics.inc('publications', platform=platform, outcome='retried')
+            self.logger.warning(
+                f"Attempt {attempt_number} for {file_path} on {platform} failed ({error}), "
+                f"retrying in {delay:.1f}s"
+            )
+
+        # Record the intent first so a crash after the POST cannot cause a duplicate
+        with self.state_lock:
+            self.tracker.mark_pending(file_path, platform, title)
+
+        try:
+            result = self.retry_policy.call(attempt, deadline=self.deadline, on_retry=on_retry)
+            url, platform_id = publisher.extract_reference(result)
+        except PublishError as e:
+            self.logger.error(f"Failed to publish {file_path} to {platform} after {attempts} attempt(s): {str(e)}")
+            metrics.inc('publications', platform=platform, outcome='failed')
+            with self.state_lock:
+                if outcome_unknown:
+                    self.logger.warning(
+                        f"Leaving {file_path} pending on {platform} until it can be reconciled"
+                    )
+                else:
+                    self.tracker.clear_pending(file_path, platform)
+                self.queue.record_attempt(file_path, platform, attempts, str(e))
+            return False
+        except Exception as e:
+            self.logger.error(f"Unexpected error publishing {file_path} to {platform}: {str(e)}")
+            metrics.inc('publications', platform=platform, outcome='failed')
+            with self.state_lock:
+                if outcome_unknown or request_sent:
+                    self.logger.warning(
+                        f"Leaving {file_path} pending on {platform} until it can be reconciled"
+                    )
+                else:
+                    # Nothing reached the platform (e.g. an image failed), so it is safe to publish again
+                    self.tracker.clear_pending(file_path, platform)
+                self.queue.record_attempt(file_path, platform, attempts, str(e))
+            return False
+
+        if not url:
+            self.logger.error(f"{platform} returned no URL for {file_path}")
+            metrics.inc('publications', platform=platform, outcome='failed')
+            with self.state_lock:
+                self.tracker.clear_pending(file_path, platform)
+            return False
+
+        self.logger.info(f"Successfully published {file_path} to {platform}: {url}")
+        metrics.inc('publications', platform=platform, outcome='published')
+        with self.state_lock:
+            self.tracker.mark_platform_published(file_path, platform, url, platform_id)
+            # Keep an existing queue entry so its attempt history and other platforms survive
+            if file_path not in self.queue.queued_posts:
+                self.queue.add_to_queue(file_path, [platform])
+            self.queue.record_attempt(file_path, platform, attempts)
+            self.queue.mark_completed(file_path, platform)
+        return True
+
+    def wait(self) -> Dict[str, int]:
+        """
+        Wait for all submitted publications and shut down the worker pools
+
+        Returns:
+            Counts of published and failed publications
+        """
+        results = {'published': 0, 'failed': 0}
+        try:
+            for file_path, platform, future in self.futures:
+                try:
+                    published = future.result()
+                except Exception as e:
+                    self.logger.error(f"Unexpected error publishing {file_path} to {platform}: {str(e)}")
+                    published = False
+                results['published' if published else 'failed'] += 1
+        finally:
+            self.shutdown()
+        self.futures = []
+        return results
+
+    def shutdown(self):
+        """Shut down all platform worker pools"""
+        for executor in self.executors.values():
+            executor.shutdown(wait=True)
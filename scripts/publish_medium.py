@@ -1,39 +1,116 @@
-import requests
-import time
-from typing import Dict, Any
-from .utils.logger import get_logger
-from .utils.exceptions import PublishError
+import mimetypes
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from .base_publisher import BasePublisher
+from .config.settings import Settings
+from .account_cache import AccountCache
+from .utils.tracing import tracer
+from .utils.exceptions import PublishError, PublishStateUnknownError, NetworkError, AuthenticationError
 
-class MediumPublisher:
-    def __init__(self, token: str):
+class MediumPublisher(BasePublisher):
+    platform = 'medium'
+    # Medium's API cannot list a user's posts, so pending publications cannot be verified
+    supports_lookup = False
+    # Converted post representation sent as the body
+    content_format = 'html'
+    required_fields = ['title', 'content']
+    
+    def __init__(self, token: str, pool_size: int = 4,
+                 rate_limit: Optional[float] = None, rate_burst: Optional[int] = None,
+                 account_cache: Optional[AccountCache] = None, api_base: Optional[str] = None):
         self.token = token
-        self.api_base = "https://api.medium.com/v1"
-        self.logger = get_logger(__name__)
-        self.headers = {
-            'Authorization': f'Bearer {self.token}',
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        }
+        # Persists the user ID between runs so cold starts skip the /me request
+        self.account_cache = account_cache
         self._user_id = None
+        super().__init__(
+            {
+                'Authorization': f'Bearer {self.token}',
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            },
+            pool_size=pool_size, rate_limit=rate_limit, rate_burst=rate_burst, api_base=api_base
+        )
+    
+    @classmethod
+    def from_settings(cls, account_cache: Optional[AccountCache] = None) -> 'MediumPublisher':
+        """Create a publisher from Settings, with a connection pool sized to its concurrency"""
+        config = Settings.get_platform_config(cls.platform)
+        return cls(
+            config.get('credential'),
+            pool_size=config.get('concurrency', 1),
+            account_cache=account_cache
+        )
     
     def _get_user_id(self) -> str:
         """Get or fetch Medium user ID"""
+        with tracer.span('medium.get_user_id', platform='medium') as span:
+            user_id = self._fetch_user_id()
+            span.set(user_id=user_id)
+            return user_id
+    
+    def _fetch_user_id(self) -> str:
+        """Return the user ID from memory or the account cache, asking /me otherwise"""
+        if not self._user_id and self.account_cache is not None:
+            self._user_id = self.account_cache.get('medium', self.token, 'user_id')
         if not self._user_id:
             try:
-                response = requests.get(
+                response = self._request(
+                    'GET',
                     f"{self.api_base}/me",
-                    headers=self.headers,
                     timeout=10
                 )
                 if response.status_code == 200:
                     self._user_id = response.json()['data']['id']
                     self.logger.info(f"Successfully got Medium user ID: {self._user_id}")
+                    if self.account_cache is not None:
+                        self.account_cache.set('medium', self.token, 'user_id', self._user_id)
                 else:
                     raise PublishError(f"Failed to get user ID: {response.text}", "medium")
+            except PublishError:
+                raise
             except Exception as e:
                 raise PublishError(f"Error getting user ID: {str(e)}", "medium")
         return self._user_id
     
+    def upload_image(self, image_path: Path) -> str:
+        """
+        Upload an image to Medium so posts can reference it
+        
+        Args:
+            image_path: Image file (JPEG, PNG, GIF or TIFF)
+            
+        Returns:
+            URL of the hosted image
+            
+        Raises:
+            PublishError: If the upload fails
+        """
+        content_type = mimetypes.guess_type(image_path.name)[0] or 'application/octet-stream'
+        try:
+            with image_path.open('rb') as f:
+                response = self._request(
+                    'POST',
+                    f"{self.api_base}/images",
+                    files={'image': (image_path.name, f, content_type)},
+                    # Let requests set the multipart boundary instead of the session's JSON type
+                    headers={'Content-Type': None},
+                    timeout=60
+                )
+        except PublishStateUnknownError as e:
+            # A duplicate image upload is harmless, so an unknown outcome is simply retried
+            raise NetworkError('medium', details=str(e))
+        except OSError as e:
+            raise PublishError(f"Cannot read image {image_path}: {str(e)}", "medium")
+        
+        if response.status_code not in (200, 201):
+            raise PublishError(f"Failed to upload image {image_path.name}: {response.text}", "medium")
+        try:
+            url = response.json()['data']['url']
+        except (ValueError, KeyError, TypeError):
+            raise PublishError(f"Unexpected image upload response for {image_path.name}: {response.text}", "medium")
+        self.logger.info(f"Uploaded {image_path.name} to Medium: {url}")
+        return url
+    
     def _prepare_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare content for Medium API"""
         # Process tags
@@ -63,24 +140,35 @@ class MediumPublisher:
         if 'license' in content['metadata']:
             post_data['license'] = content['metadata']['license']
         
+        self.validate_payload(post_data)
         self.logger.info(f"Preparing Medium post: {post_data['title']} (public)")
         return post_data
     
+    def extract_reference(self, result: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Extract the post URL and ID from a Medium API response"""
+        data = result.get('data', {})
+        return data.get('url'), data.get('id')
+    
     def publish(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Publish content to Medium"""
+        with tracer.span('medium.publish', category='publish', platform='medium'):
+            return self._publish(content)
+    
+    def _publish(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Publish content to Medium, see publish"""
         try:
             # Get user ID
             user_id = self._get_user_id()
             
             # Prepare post content
-            post_data = self._prepare_content(content)
+            post_data = self.build_payload(content)
             
             self.logger.info(f"Publishing to Medium as public post: {post_data['title']}")
             
             # Make the API request
-            response = requests.post(
+            response = self._request(
+                'POST',
                 f"{self.api_base}/users/{user_id}/posts",
-                headers=self.headers,
                 json=post_data,
                 timeout=30
             )
@@ -92,8 +180,6 @@ class MediumPublisher:
                 post_url = result['data']['url']
                 self.logger.info(f"Successfully published to Medium: {post_url}")
                 return result
-            elif response.status_code == 429:
-                raise PublishError("Rate limit reached. Please try again tomorrow.", "medium")
             else:
                 error_msg = "Failed to publish to Medium"
                 try:
@@ -103,5 +189,13 @@ class MediumPublisher:
                     error_msg += f". Status: {response.status_code}"
                 raise PublishError(error_msg, "medium")
                 
+        except AuthenticationError:
+            # A stale cached user ID is rejected too, fetch it again on the next attempt
+            self._user_id = None
+            if self.account_cache is not None:
+                self.account_cache.invalidate('medium', self.token)
+            raise
+        except PublishError:
+            raise
         except Exception as e:
             raise PublishError(f"Error during Medium publication: {str(e)}", "medium")
\ No newline at end of file
@@ -1,25 +1,133 @@
 from pathlib import Path
+from typing import Dict, Any, List, Optional
+import argparse
+import sys
 import time
 from datetime import datetime
 from scripts.convert_markdown import MarkdownConverter
-from scripts.publish_medium import MediumPublisher
-from scripts.publish_devto import DevToPublisher
 from scripts.post_tracker import PostTracker
 from scripts.queue_manager import PostQueue
+from scripts.publish_engine import PublishEngine, content_formats, reconcile_pending
+from scripts.images import ImageUploadCache
+from scripts.publisher_registry import PublisherRegistry
 from scripts.config.settings import Settings
 from scripts.utils.logger import get_logger
-from scripts.utils.exceptions import PublishError
+from scripts.utils.metrics import metrics, write_run_report
+from scripts.utils.tracing import export_run_trace
+from scripts.utils.profiling import RunProfiler, profile_stage, profiling_active
 
 def validate_credentials():
-    """Validate that required API credentials are set"""
+    """Validate that the API credential of every configured platform is set"""
     missing = []
-    if not Settings.MEDIUM_TOKEN:
-        missing.append("MEDIUM_TOKEN")
-    if not Settings.DEVTO_API_KEY:
-        missing.append("DEVTO_API_KEY")
+    for platform in Settings.PLATFORMS:
+        config = Settings.get_platform_config(platform)
+        if not config.get('credential'):
+            missing.append(config['credential_name'])
     return missing
 
-def main():
+def create_publishers(base_dir: Optional[Path] = None) -> PublisherRegistry:
+    """Create the publisher registry, each publisher is only initialized once a post needs it"""
+    return PublisherRegistry(base_dir=base_dir)
+
+def run_publishing(tracker: PostTracker, queue: PostQueue, publishers: Dict[str, Any],
+                   workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Plan, convert and publish every post with pending platforms
+
+    Args:
+        tracker: Post tracker holding publication status
+        queue: Post queue updated after each publication
+        publishers: Mapping of platform name to publisher instance
+        workers: Conversion worker processes (defaults to Settings.CONVERT_WORKERS)
+
+    Returns:
+        Plan statistics (seen, skipped, converted, published)
+    """
+    logger = get_logger(__name__)
+
+    # Resolve publications interrupted by a previous run before planning
+    with profile_stage('reconcile'):
+        reconcile_pending(tracker, publishers)
+
+    # Get all markdown files
+    markdown_dir = Path(Settings.MARKDOWN_DIR)
+    with metrics.timer('scan'), profile_stage('scan'):
+        all_files = {str(f.relative_to(markdown_dir)) for f in markdown_dir.glob('*.md')}
+    logger.info(f"Found markdown files: {all_files}")
+    
+    # Get unpublished files
+    with metrics.timer('plan'), profile_stage('plan'):
+        needs_publishing = tracker.get_unpublished_files(all_files, list(publishers))
+    for platform, file_paths in needs_publishing.items():
+        logger.info(f"Found {len(file_paths)} posts for {platform}")
+        metrics.set_gauge('pending_posts', len(file_paths), platform=platform)
+
+    # Plan: only posts with at least one pending platform get converted
+    pending_files = set().union(*needs_publishing.values())
+    plan_stats = {
+        'seen': len(all_files),
+        'skipped': len(all_files - pending_files),
+        'converted': 0,
+        'published': 0
+    }
+    logger.info(
+        f"Publish plan: {plan_stats['seen']} posts seen, "
+        f"{plan_stats['skipped']} already published, {len(pending_files)} pending"
+    )
+
+    # Initialize converter
+    converter = MarkdownConverter(Settings.MARKDOWN_DIR, Settings.OUTPUT_DIR)
+
+    # Publish concurrently while the remaining posts are still converting
+    engine = PublishEngine(
+        publishers, tracker, queue,
+        concurrency={
+            platform: Settings.get_platform_config(platform).get('concurrency', 1)
+            for platform in publishers
+        },
+        image_cache=ImageUploadCache(tracker.base_dir)
+    )
+
+    # Only render HTML when a platform with pending posts needs it
+    formats = content_formats(publishers, [p for p in publishers if needs_publishing.get(p)])
+
+    # Process each file that needs publishing, in the order conversions complete
+    with profile_stage('convert_publish'):
+        try:
+            for converted_post in converter.convert_many([markdown_dir / f for f in sorted(pending_files)],
+                                                         workers=workers, formats=formats):
+                file_path = converted_post['original_file']
+                plan_stats['converted'] += 1
+                logger.info(f"Successfully converted {file_path}")
+
+                platforms = [
+                    platform for platform in publishers
+                    if file_path in needs_publishing[platform]
+                ]
+                engine.submit(file_path, converted_post, platforms)
+        finally:
+            publish_results = engine.wait()
+    plan_stats['published'] = publish_results['published']
+    for name, value in plan_stats.items():
+        metrics.set_gauge('run_posts', value, stage=name)
+
+    logger.info(
+        f"Plan summary: {plan_stats['seen']} seen, {plan_stats['skipped']} skipped, "
+        f"{plan_stats['converted']} converted, {plan_stats['published']} published"
+    )
+    return plan_stats
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Convert and publish pending posts")
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="Run under cProfile and tracemalloc, writing pstats and allocation reports to LOG_DIR"
+    )
+    return parser.parse_args(argv)
+
+def publish():
+    """Run a complete publication pass over the markdown directory"""
     logger = get_logger(__name__)
     try:
         # Validate credentials first
@@ -35,77 +143,41 @@ def main():
         tracker = PostTracker(base_dir=project_root)
         queue = PostQueue(base_dir=project_root)
         
-        # Initialize publishers
-        logger.info("Initializing publishers...")
-        medium_publisher = MediumPublisher(Settings.MEDIUM_TOKEN)
-        devto_publisher = DevToPublisher(Settings.DEVTO_API_KEY)
-
-        # Get all markdown files
-        markdown_dir = Path(Settings.MARKDOWN_DIR)
-        all_files = {str(f.relative_to(markdown_dir)) for f in markdown_dir.glob('*.md')}
-        logger.info(f"Found markdown files: {all_files}")
-        
-        # Get unpublished files
-        needs_publishing = tracker.get_unpublished_files(all_files)
-        logger.info(f"Found {len(needs_publishing['medium'])} posts for Medium")
-        logger.info(f"Found {len(needs_publishing['devto'])} posts for Dev.to")
-
-        # Initialize converter
-        converter = MarkdownConverter(Settings.MARKDOWN_DIR, Settings.OUTPUT_DIR)
-
-        # Process each file that needs publishing
-        for file_path in all_files:
-            logger.info(f"Processing file: {file_path}")
-            full_path = markdown_dir / file_path
-            
+        try:
+            # Initialize publishers
+            logger.info("Initializing publisher registry...")
+            publishers = create_publishers(project_root)
             try:
-                converted_post = converter.convert_single_file(full_path)
-                logger.info(f"Successfully converted {file_path}")
+                # Batch state writes for the whole run, flushing periodically
+                flush_options = {
+                    'flush_interval': Settings.STATE_FLUSH_INTERVAL,
+                    'max_dirty': Settings.STATE_FLUSH_MAX_DIRTY
+                }
+                with tracker.batch(**flush_options), queue.batch(**flush_options):
+                    # Profiled runs convert in-process so cProfile sees markdown2 and frontmatter
+                    run_publishing(tracker, queue, publishers, workers=1 if profiling_active() else None)
+            finally:
+                # Release pooled connections even if the run fails
+                logger.info(f"Publishers used: {', '.join(publishers.loaded()) or 'none'}")
+                publishers.close()
 
-                # Publish to Medium if needed
-                if file_path in needs_publishing['medium']:
-                    try:
-                        logger.info(f"Attempting to publish {file_path} to Medium...")
-                        medium_result = medium_publisher.publish(converted_post)
-                        medium_url = medium_result.get('data', {}).get('url')
-                        medium_id = medium_result.get('data', {}).get('id')
-                        
-                        if medium_url:
-                            logger.info(f"Successfully published to Medium: {medium_url}")
-                            tracker.mark_platform_published(file_path, 'medium', medium_url, medium_id)
-                            queue.add_to_queue(file_path, ['medium'])
-                            queue.mark_completed(file_path, 'medium')
-                    except PublishError as e:
-                        logger.error(f"Failed to publish to Medium: {str(e)}")
-                
-                # Publish to Dev.to if needed
-                if file_path in needs_publishing['devto']:
-                    try:
-                        logger.info(f"Attempting to publish {file_path} to Dev.to...")
-                        devto_result = devto_publisher.publish(converted_post)
-                        devto_url = devto_result.get('url')
-                        devto_id = devto_result.get('id')
-                        
-                        if devto_url:
-                            logger.info(f"Successfully published to Dev.to: {devto_url}")
-                            tracker.mark_platform_published(file_path, 'devto', devto_url, devto_id)
-                            queue.add_to_queue(file_path, ['devto'])
-                            queue.mark_completed(file_path, 'devto')
-                    except PublishError as e:
-                        logger.error(f"Failed to publish to Dev.to: {str(e)}")
-                
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {str(e)}")
-                continue
-
-        # Clean old completed posts
-        queue.clean_completed(days_old=7)
-        
-        # Get final status
-        queue_status = queue.get_queue_status()
-        tracking_status = tracker.get_status_report()
-        logger.info("Final queue status: %s", queue_status)
-        logger.info("Final tracking status: %s", tracking_status)
+            # Clean old completed posts
+            queue.clean_completed(days_old=7)
+            
+            # Get final status
+            queue_status = queue.get_queue_status()
+            for state, entries in queue_status.items():
+                metrics.set_gauge('queue_size', len(entries), status=state)
+            tracking_status = tracker.get_status_report()
+            logger.info("Final queue status: %s", queue_status)
+            logger.info("Final tracking status: %s", tracking_status)
+        finally:
+            # Fold journaled state changes into the committed JSON files
+            with profile_stage('state_close'):
+                tracker.close()
+                queue.close()
+            write_run_report('publish_posts', Settings.METRICS_DIR)
+            export_run_trace('publish_posts', Settings.TRACE_DIR)
         
         logger.info("Publication process completed")
 
@@ -113,5 +185,14 @@ def main():
         logger.error(f"An error occurred: {str(e)}")
         raise
 
+def main(argv: Optional[List[str]] = None):
+    # Programmatic calls get no flags; only the script entry point passes the command line
+    args = parse_args([] if argv is None else argv)
+    if args.profile:
+        with RunProfiler('publish_posts', Settings.LOG_DIR):
+            publish()
+    else:
+        publish()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,123 @@
+from collections.abc import Mapping
+from importlib import import_module
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import threading
+from .account_cache import AccountCache
+from .utils.logger import get_logger
+from .config.settings import Settings
+
+# Publisher classes registered at runtime as "module:Class", overriding the platform config
+PUBLISHER_CLASSES: Dict[str, str] = {}
+
+_loaded_classes: Dict[str, type] = {}
+_classes_lock = threading.Lock()
+
+def register_publisher(platform: str, spec: str):
+    """
+    Register (or replace) the publisher class of a platform
+
+    Args:
+        platform: Platform name
+        spec: "module:Class" path
+    """
+    with _classes_lock:
+        PUBLISHER_CLASSES[platform] = spec
+        _loaded_classes.pop(platform, None)
+
+def unregister_publisher(platform: str):
+    """
+    Drop a runtime registration, falling back to the platform config
+
+    Args:
+        platform: Platform name
+    """
+    with _classes_lock:
+        PUBLISHER_CLASSES.pop(platform, None)
+        _loaded_classes.pop(platform, None)
+
+def load_publisher_class(platform: str) -> type:
+    """
+    Import the publisher class of a platform
+
+    The class comes from register_publisher() or, failing that, the
+    'publisher' entry of the platform config.
+
+    Args:
+        platform: Platform name
+
+    Returns:
+        Publisher class
+
+    Raises:
+        ValueError: If no publisher is registered for the platform
+    """
+    with _classes_lock:
+        if platform not in _loaded_classes:
+            spec = PUBLISHER_CLASSES.get(platform) or Settings.get_platform_config(platform).get('publisher')
+            if not spec:
+                raise ValueError(f"No publisher registered for platform '{platform}'")
+            module_name, class_name = spec.split(':')
+            _loaded_classes[platform] = getattr(import_module(module_name), class_name)
+        return _loaded_classes[platform]
+
+class PublisherRegistry(Mapping):
+    """
+    Mapping of platform name to publisher that creates each publisher on first use
+
+    Runs with nothing pending for a platform never import, configure or
+    open a connection pool for its publisher.
+    """
+
+    def __init__(self, platforms: Optional[Iterable[str]] = None, base_dir: Optional[str] = None,
+                 account_cache: Optional[AccountCache] = None):
+        """
+        Initialize the registry
+
+        Args:
+            platforms: Platforms to serve (defaults to Settings.PLATFORMS)
+            base_dir: Project root holding the tracking directory
+            account_cache: Cache of per-account metadata handed to publishers
+        """
+        self.platforms: List[str] = list(Settings.PLATFORMS if platforms is None else platforms)
+        self.account_cache = account_cache or AccountCache(base_dir)
+        self.logger = get_logger(__name__)
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, platform: str) -> Any:
+        if platform not in self.platforms:
+            raise KeyError(platform)
+        with self._lock:
+            if platform not in self._instances:
+                publisher_class = load_publisher_class(platform)
+                self._instances[platform] = publisher_class.from_settings(account_cache=self.account_cache)
+                self.logger.info(f"Initialized {platform} publisher")
+            return self._instances[platform]
+
+    def __contains__(self, platform: object) -> bool:
+        # Membership must not instantiate the publisher
+        return platform in self.platforms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.platforms)
+
+    def __len__(self) -> int:
+        return len(self.platforms)
+
+    def loaded(self) -> List[str]:
+        """Platforms whose publisher has been created"""
+        with self._lock:
+            return list(self._instances)
+
+    def close(self):
+        """Close the publishers that were created"""
+        with self._lock:
+            instances, self._instances = list(self._instances.values()), {}
+        for publisher in instances:
+            publisher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
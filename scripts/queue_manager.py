@@ -1,142 +1,332 @@
 from pathlib import Path
-from typing import Dict, List, Optional
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timezone, timedelta
-import json
+import bisect
 from .utils.logger import get_logger
-from .utils.exceptions import QueueError
+from .utils.metrics import metrics
+from .utils.tracing import tracer
+from .utils.exceptions import QueueError, StateConflictError
+from .utils.journal import JournalStore
+from .utils.sqlite_store import SqliteStore, IndexRow
+from .scheduler import ScheduleCalculator
+from .config.settings import Settings
+
+def _to_timestamp(value: Optional[str]) -> Optional[float]:
+    """Convert an ISO timestamp to epoch seconds for indexing"""
+    return datetime.fromisoformat(value).timestamp() if value else None
 
 class PostQueue:
     """Manages the queuing system for blog post publications"""
     
-    def __init__(self, base_dir: Optional[str] = None):
+    def __init__(self, base_dir: Optional[str] = None, compact_every: int = 50,
+                 backend: Optional[str] = None):
         """Initialize the post queue"""
         self.base_dir = Path(base_dir) if base_dir else Path.cwd()
         self.queue_dir = self.base_dir / '.queue'
         self.queue_file = self.queue_dir / 'post_queue.json'
         self.logger = get_logger(__name__)
         self.queued_posts: Dict[str, Dict] = {}
+        # Queued entries sorted by parsed scheduled time, plus each entry's key in it
+        self._schedule_index: List[Tuple[float, str]] = []
+        self._schedule_keys: Dict[str, Tuple[float, str]] = {}
+        # Number of indexed posts per scheduled timestamp, used to fill slots up to capacity
+        self._slot_load: Counter = Counter()
+        self.scheduler = ScheduleCalculator()
+        # Entries handed out by pop_ready and not yet completed or released
+        self._claimed: Set[str] = set()
         
         # Create queue directory if it doesn't exist
         self.queue_dir.mkdir(exist_ok=True)
         
+        # JSON journal (default) or SQLite; both keep queue_file as readable snapshot
+        backend = backend or Settings.STATE_BACKEND
+        if backend == 'sqlite':
+            self.store = SqliteStore(self.queue_file, indexer=self._index_entry)
+        else:
+            self.store = JournalStore(self.queue_file, compact_every=compact_every)
+        
         # Initialize queue file if it doesn't exist
-        if not self.queue_file.exists():
+        if not self.store.exists():
             self._save_queue_data()
             
         self._load_queue_data()
+        self._rebuild_schedule_index()
     
     def _load_queue_data(self):
-        """Load existing queue data"""
+        """Load existing queue data (snapshot plus journaled mutations)"""
         try:
-            if self.queue_file.exists():
-                with self.queue_file.open('r') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict):
-                        self.queued_posts = data
-                        self.logger.info(f"Loaded queue data for {len(data)} posts")
-                    else:
-                        self.logger.warning("Invalid queue data format, initializing empty queue")
-                        self.queued_posts = {}
+            if self.store.exists():
+                data = self.store.load_snapshot()
+                if isinstance(data, dict):
+                    self.queued_posts = data
+                    if self.store.has_journal():
+                        replayed = self.store.replay(self.queued_posts)
+                        self.logger.info(f"Replayed {replayed} journaled queue changes")
+                        self._save_queue_data()
+                    self.logger.info(f"Loaded queue data for {len(self.queued_posts)} posts")
+                else:
+                    self.logger.warning("Invalid queue data format, initializing empty queue")
+                    self.queued_posts = {}
             else:
                 self.logger.info("No existing queue data found, initializing empty queue")
                 self._save_queue_data()
                 
+        except StateConflictError:
+            # Resetting here would overwrite one of the diverged copies
+            raise
         except Exception as e:
             self.logger.error(f"Error loading queue data: {e}")
+            self._backup_corrupt_file()
             self.queued_posts = {}
             self._save_queue_data()
     
+    def _backup_corrupt_file(self):
+        """Keep a copy of an unreadable queue file before it is replaced"""
+        try:
+            if self.queue_file.exists():
+                backup = self.queue_file.with_name(f"{self.queue_file.name}.corrupt")
+                backup.write_bytes(self.queue_file.read_bytes())
+                self.logger.warning(f"Saved unreadable queue data to {backup}")
+        except Exception as e:
+            self.logger.error(f"Error backing up queue data: {e}")
+    
     def _save_queue_data(self):
-        """Save queue data to repository"""
+        """Save the full queue snapshot to repository and clear the journal"""
         try:
             # Ensure queue directory exists
             self.queue_dir.mkdir(exist_ok=True)
             
-            # Save with pretty printing for better readability
-            with self.queue_file.open('w') as f:
-                json.dump(self.queued_posts, f, indent=2, sort_keys=True)
+            # Atomic, pretty-printed snapshot for better readability
+            with metrics.timer('state_save', store='queue', op='snapshot'):
+                with tracer.span('queue.save', category='state', op='snapshot'):
+                    self.store.compact(self.queued_posts)
                 
             self.logger.info(f"Saved queue data to {self.queue_file}")
         except Exception as e:
             self.logger.error(f"Error saving queue data: {e}")
             raise QueueError(f"Failed to save queue data: {str(e)}")
-
-    def _get_next_schedule_time(self, schedule_times: List[Dict]) -> str:
+    
+    def _persist(self, file_path: str, force: bool = False):
         """
-        Calculate the next available schedule time
+        Journal the current queue entry
+        
+        Inside a batch the write is deferred until the batch ends or its
+        interval/dirty-count threshold is hit, unless ``force`` is set.
         """
-        now = datetime.now(timezone.utc)
-        next_time = None
-        
-        for schedule in schedule_times:
-            for day in schedule['days']:
-                # Get next occurrence of this day
-                next_date = now
-                while next_date.weekday() != day:
-                    next_date += timedelta(days=1)
-                
-                # Set the scheduled hour
-                next_date = next_date.replace(
-                    hour=schedule['hour'],
-                    minute=0,
-                    second=0,
-                    microsecond=0
-                )
-                
-                # If this time is in the past, move to next week
-                if next_date <= now:
-                    next_date += timedelta(days=7)
-                
-                # Update if this is sooner than current next_time
-                if next_time is None or next_date < next_time:
-                    next_time = next_date
+        self.store.mark_dirty(file_path)
+        if force or self.store.should_flush():
+            self._flush()
+    
+    def _flush(self):
+        """Write all dirty entries to the journal, compacting when due"""
+        try:
+            with metrics.timer('state_save', store='queue', op='journal'):
+                with tracer.span('queue.save', category='state', op='journal'):
+                    self.store.flush(self.queued_posts)
+        except Exception as e:
+            self.logger.error(f"Error journaling queue data: {e}")
+            raise QueueError(f"Failed to save queue data: {str(e)}")
         
-        return next_time.isoformat()
+        if self.store.needs_compaction:
+            self._save_queue_data()
+    
+    @contextmanager
+    def batch(self, flush_interval: Optional[float] = None, max_dirty: Optional[int] = None):
+        """
+        Defer persistence of changes made inside the block and flush them once
+        
+        Changes are flushed when the block exits even if it raises, because
+        they record work that already happened on the platforms.
+        
+        Args:
+            flush_interval: Flush early once this many seconds passed since the last flush
+            max_dirty: Flush early once this many entries changed
+        """
+        self.store.begin(flush_interval=flush_interval, max_dirty=max_dirty)
+        try:
+            yield self
+        finally:
+            if self.store.end():
+                self._flush()
+    
+    def close(self):
+        """Fold any journaled changes into the snapshot file and close the store"""
+        try:
+            if self.store.has_unsaved_changes():
+                self._save_queue_data()
+        finally:
+            self.store.close()
+
+    @staticmethod
+    def _index_entry(file_path: str, data: Dict) -> IndexRow:
+        """Extract the indexed columns of a queue entry"""
+        return IndexRow(
+            status=data.get('status'),
+            scheduled_at=_to_timestamp(data.get('scheduled_time')),
+            completed_at=_to_timestamp(data.get('completed_at')),
+            platforms={platform: 'queued' for platform in data.get('platforms', [])}
+        )
+    
+    def _rebuild_schedule_index(self):
+        """Build the scheduled-time index of queued entries in one pass"""
+        self._schedule_keys = {}
+        for file_path, data in self.queued_posts.items():
+            if data.get('status') == 'queued' and file_path not in self._claimed:
+                self._schedule_keys[file_path] = (_to_timestamp(data['scheduled_time']), file_path)
+        self._schedule_index = sorted(self._schedule_keys.values())
+        self._slot_load = Counter(timestamp for timestamp, _ in self._schedule_index)
+    
+    def _index_remove(self, file_path: str):
+        """Drop an entry from the scheduled-time index"""
+        key = self._schedule_keys.pop(file_path, None)
+        if key is not None:
+            self._slot_load[key[0]] -= 1
+            if self._slot_load[key[0]] <= 0:
+                del self._slot_load[key[0]]
+            position = bisect.bisect_left(self._schedule_index, key)
+            if position < len(self._schedule_index) and self._schedule_index[position] == key:
+                del self._schedule_index[position]
+    
+    def _index_add(self, file_path: str):
+        """(Re)insert an entry into the scheduled-time index if it is queued"""
+        self._index_remove(file_path)
+        data = self.queued_posts.get(file_path)
+        if data and data.get('status') == 'queued' and file_path not in self._claimed:
+            key = (_to_timestamp(data['scheduled_time']), file_path)
+            self._schedule_keys[file_path] = key
+            self._slot_load[key[0]] += 1
+            bisect.insort(self._schedule_index, key)
+    
+    def _ready_count(self, now: datetime) -> int:
+        """Number of leading index entries scheduled at or before now"""
+        # Every entry with an equal timestamp sorts before (ts, max string)
+        return bisect.bisect_right(self._schedule_index, (now.timestamp(), '\U0010ffff'))
     
     def add_to_queue(self, file_path: str, platforms: List[str], scheduled_time: Optional[str] = None):
         """
         Add a post to the queue with the next scheduled publish time
         """
-        now = datetime.now(timezone.utc)
-        
-        # If no specific time provided, set to next available schedule
         if not scheduled_time:
-            # Define schedule times (13:00 UTC Tue/Thu, 15:00 UTC Sat)
-            schedule_times = [
-                {'hour': 13, 'days': [1, 3]},  # Tuesday, Thursday
-                {'hour': 15, 'days': [5]}      # Saturday
-            ]
+            # Requeueing frees the post's current place before picking the next free slot
+            self._index_remove(file_path)
+            scheduled_time = self.scheduler.assign(1, self._slot_load)[0].isoformat()
+        
+        self._enqueue(file_path, platforms, scheduled_time)
+        self._persist(file_path)
+        self.logger.info(f"Added {file_path} to queue for platforms: {platforms}, scheduled for {scheduled_time}")
+    
+    def add_many(self, file_paths: List[str], platforms: List[str],
+                 content_hashes: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Queue several posts at once, spreading them across successive schedule slots
+        
+        Args:
+            file_paths: Posts to queue, in the order they should be published
+            platforms: Platforms each post is queued for
+            content_hashes: Optional content digest stored with each post
             
-            # Find next scheduled time
-            scheduled_time = self._get_next_schedule_time(schedule_times)
+        Returns:
+            Mapping of file path to its scheduled time
+        """
+        for file_path in file_paths:
+            self._index_remove(file_path)
+        slots = self.scheduler.assign(len(file_paths), self._slot_load)
         
+        content_hashes = content_hashes or {}
+        scheduled = {}
+        with self.batch():
+            for file_path, slot in zip(file_paths, slots):
+                scheduled[file_path] = slot.isoformat()
+                self._enqueue(file_path, list(platforms), scheduled[file_path],
+                              content_hashes.get(file_path))
+                self._persist(file_path)
+        
+        if scheduled:
+            self.logger.info(
+                f"Added {len(scheduled)} posts to queue for platforms: {platforms}, "
+                f"scheduled from {slots[0].isoformat()} to {slots[-1].isoformat()}"
+            )
+        return scheduled
+    
+    def _enqueue(self, file_path: str, platforms: List[str], scheduled_time: str,
+                 content_hash: Optional[str] = None):
+        """Store a queued entry and index it, without persisting"""
         self.queued_posts[file_path] = {
-            'added_at': now.isoformat(),
+            'added_at': datetime.now(timezone.utc).isoformat(),
             'scheduled_time': scheduled_time,
             'platforms': platforms,
             'status': 'queued'
         }
-        
-        self._save_queue_data()
-        self.logger.info(f"Added {file_path} to queue for platforms: {platforms}, scheduled for {scheduled_time}")
+        if content_hash:
+            self.queued_posts[file_path]['content_hash'] = content_hash
+        self._claimed.discard(file_path)
+        self._index_add(file_path)
+    
+    def set_content_hash(self, file_path: str, content_hash: str):
+        """Record new content for a queued post without moving its slot"""
+        if file_path in self.queued_posts:
+            self.queued_posts[file_path]['content_hash'] = content_hash
+            self._persist(file_path)
     
     def get_ready_posts(self) -> List[Dict]:
         """Get posts that are ready to be published"""
         now = datetime.now(timezone.utc)
-        ready_posts = []
+        ready_files = [file_path for _, file_path in self._schedule_index[:self._ready_count(now)]]
         
-        for file_path, data in self.queued_posts.items():
-            if data['status'] == 'queued':
-                scheduled_time = datetime.fromisoformat(data['scheduled_time'])
-                if scheduled_time <= now:
-                    ready_posts.append({
-                        'file_path': file_path,
-                        'platforms': data['platforms'],
-                        'queued_at': data['added_at']
-                    })
+        return [
+            {
+                'file_path': file_path,
+                'platforms': self.queued_posts[file_path]['platforms'],
+                'queued_at': self.queued_posts[file_path]['added_at']
+            }
+            for file_path in ready_files
+        ]
+    
+    def next_due_time(self) -> Optional[datetime]:
+        """Get the scheduled time of the earliest queued post, if any"""
+        if not self._schedule_index:
+            return None
+        return datetime.fromtimestamp(self._schedule_index[0][0], tz=timezone.utc)
+    
+    def pop_ready(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Claim up to ``limit`` ready posts, earliest first
+        
+        Claimed posts stay queued on disk but are not returned again until
+        they are completed or handed back with ``release``.
         
+        Args:
+            limit: Maximum number of posts to claim, None claims every ready post
+            
+        Returns:
+            Claimed posts in scheduled order
+        """
+        count = self._ready_count(datetime.now(timezone.utc))
+        if limit is not None:
+            count = min(count, limit)
+        
+        claimed = self._schedule_index[:count]
+        del self._schedule_index[:count]
+        
+        ready_posts = []
+        for _, file_path in claimed:
+            del self._schedule_keys[file_path]
+            self._claimed.add(file_path)
+            data = self.queued_posts[file_path]
+            ready_posts.append({
+                'file_path': file_path,
+                'platforms': list(data['platforms']),
+                'queued_at': data['added_at']
+            })
         return ready_posts
     
+    def release(self, file_path: str):
+        """Hand a claimed post back to the queue so it can be picked up again"""
+        self._claimed.discard(file_path)
+        self._index_add(file_path)
+    
     def mark_completed(self, file_path: str, platform: str):
         """Mark a post as completed for a specific platform"""
         if file_path in self.queued_posts:
@@ -148,10 +338,27 @@ class PostQueue:
             if not self.queued_posts[file_path]['platforms']:
                 self.queued_posts[file_path]['status'] = 'completed'
                 self.queued_posts[file_path]['completed_at'] = datetime.now(timezone.utc).isoformat()
+                self._claimed.discard(file_path)
+                self._index_remove(file_path)
             
-            self._save_queue_data()
+            self._persist(file_path)
             self.logger.info(f"Marked {file_path} as completed for {platform}")
     
+    def record_attempt(self, file_path: str, platform: str, attempts: int, error: Optional[str] = None):
+        """Record how many publish attempts a platform took and the last error, if any"""
+        if file_path not in self.queued_posts:
+            return
+        
+        entry = self.queued_posts[file_path]
+        entry.setdefault('attempts', {})[platform] = entry.get('attempts', {}).get(platform, 0) + attempts
+        if error:
+            entry.setdefault('last_error', {})[platform] = error
+        else:
+            entry.get('last_error', {}).pop(platform, None)
+        
+        self._persist(file_path)
+        self.logger.info(f"Recorded {attempts} attempt(s) for {file_path} on {platform}")
+    
     def get_queue_status(self) -> Dict[str, List[Dict]]:
         """Get current queue status"""
         status = {
@@ -178,13 +385,22 @@ class PostQueue:
     def clean_completed(self, days_old: int = 7):
         """Remove completed posts older than specified days"""
         now = datetime.now(timezone.utc)
-        to_remove = []
         
-        for file_path, data in self.queued_posts.items():
-            if data.get('status') == 'completed':
-                completed_at = datetime.fromisoformat(data['completed_at'])
-                if (now - completed_at).days > days_old:
-                    to_remove.append(file_path)
+        def is_expired(data: Dict) -> bool:
+            return (data.get('status') == 'completed'
+                    and (now - datetime.fromisoformat(data['completed_at'])).days > days_old)
+        
+        if self.store.supports_queries:
+            # (now - completed_at).days > days_old  <=>  completed_at <= now - (days_old + 1) days
+            cutoff = now - timedelta(days=days_old + 1)
+            to_remove = self.store.select(
+                self.queued_posts, is_expired,
+                status='completed', completed_before=cutoff.timestamp()
+            )
+        else:
+            to_remove = [
+                file_path for file_path, data in self.queued_posts.items() if is_expired(data)
+            ]
         
         for file_path in to_remove:
             del self.queued_posts[file_path]
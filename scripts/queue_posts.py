@@ -1,36 +1,204 @@
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+import argparse
+import os
+import subprocess
+import sys
 from scripts.queue_manager import PostQueue
+from scripts.post_tracker import PostTracker
+from scripts.utils.hashing import file_digest
 from scripts.utils.logger import get_logger
+from scripts.utils.metrics import metrics, write_run_report
+from scripts.utils.tracing import export_run_trace
+from scripts.utils.profiling import RunProfiler, profile_stage
 from scripts.config.settings import Settings
 
-def main():
+def get_changed_files(diff_range: str, markdown_dir: Path) -> Optional[Set[str]]:
+    """
+    List posts added or modified in a git revision range
+
+    Args:
+        diff_range: Revision range such as ``<before>..<after>``
+        markdown_dir: Directory holding the posts
+
+    Returns:
+        Post paths relative to markdown_dir, or None if git could not answer
+    """
+    logger = get_logger(__name__)
+    try:
+        result = subprocess.run(
+            ['git', 'diff', '--name-only', '--diff-filter=ACMR', diff_range, '--', str(markdown_dir)],
+            capture_output=True, text=True, check=True
+        )
+        top_level = subprocess.run(
+            ['git', 'rev-parse', '--show-toplevel'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"Could not diff {diff_range}, scanning all posts instead: {str(e)}")
+        return None
+
+    markdown_dir = markdown_dir.resolve()
+    changed = set()
+    for line in result.stdout.splitlines():
+        path = (Path(top_level) / line).resolve()
+        if path.suffix == '.md' and path.parent == markdown_dir and path.exists():
+            changed.add(path.name)
+    return changed
+
+def plan_enqueue(queue: PostQueue, tracker: PostTracker, markdown_dir: Path,
+                 candidates: Set[str]) -> Tuple[Dict[Tuple[str, ...], List[str]], Dict[str, str]]:
+    """
+    Work out which candidate posts are new or changed
+
+    Posts already published (or being published) everywhere are skipped, as
+    are queued posts whose content hash is unchanged. A queued post whose
+    content changed keeps its slot and only gets its hash refreshed. A
+    completed entry is queued again while some platform still lacks the
+    post, with or without a recorded hash.
+
+    Args:
+        queue: Post queue
+        tracker: Post tracker
+        markdown_dir: Directory holding the posts
+        candidates: Post paths relative to markdown_dir
+
+    Returns:
+        Posts to queue grouped by their missing platforms, and the content
+        hash of every post that needs writing
+    """
+    needs_publishing = tracker.get_unpublished_files(candidates)
+    to_queue: Dict[Tuple[str, ...], List[str]] = {}
+    hashes: Dict[str, str] = {}
+
+    for file_path in sorted(candidates):
+        platforms = tuple(p for p, pending in needs_publishing.items() if file_path in pending)
+        if not platforms:
+            continue
+
+        content_hash = file_digest(markdown_dir / file_path)
+        entry = queue.queued_posts.get(file_path)
+        if entry and entry.get('status') == 'queued':
+            # A queued post keeps its slot, an edit only refreshes its hash
+            if entry.get('content_hash') != content_hash:
+                hashes[file_path] = content_hash
+            continue
+
+        # New posts, and completed ones still unpublished somewhere, are queued (again)
+        hashes[file_path] = content_hash
+        to_queue.setdefault(platforms, []).append(file_path)
+
+    return to_queue, hashes
+
+def enqueue_changes(queue: PostQueue, tracker: PostTracker, markdown_dir: Path,
+                    candidates: Set[str]) -> Dict[str, int]:
+    """
+    Queue new or changed candidate posts in a single batched write
+
+    Args:
+        queue: Post queue
+        tracker: Post tracker
+        markdown_dir: Directory holding the posts
+        candidates: Post paths relative to markdown_dir
+
+    Returns:
+        Counts of queued, refreshed and unchanged posts
+    """
+    logger = get_logger(__name__)
+    with metrics.timer('plan'), profile_stage('plan'):
+        to_queue, hashes = plan_enqueue(queue, tracker, markdown_dir, candidates)
+    queued = {file_path for files in to_queue.values() for file_path in files}
+
+    with profile_stage('enqueue'), queue.batch():
+        for file_path, content_hash in hashes.items():
+            if file_path not in queued:
+                queue.set_content_hash(file_path, content_hash)
+        for platforms, file_paths in to_queue.items():
+            # Spread the files over successive schedule slots instead of one burst
+            scheduled = queue.add_many(file_paths, list(platforms), hashes)
+            for file_path, scheduled_time in scheduled.items():
+                logger.info(f"Queued file: {file_path} for {scheduled_time}")
+
+    stats = {
+        'queued': len(queued),
+        'refreshed': len(hashes) - len(queued),
+        'unchanged': len(candidates) - len(hashes)
+    }
+    for outcome, count in stats.items():
+        metrics.inc('posts', count, outcome=outcome)
+    return stats
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Queue new or changed posts for publishing")
+    parser.add_argument(
+        '--diff-range', default=os.getenv('QUEUE_DIFF_RANGE'),
+        help="Only consider posts changed in this git range (defaults to $QUEUE_DIFF_RANGE)"
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="Run under cProfile and tracemalloc, writing pstats and allocation reports to LOG_DIR"
+    )
+    return parser.parse_args(argv)
+
+def queue_posts(diff_range: Optional[str] = None):
+    """
+    Queue the new or changed posts of the markdown directory
+
+    Args:
+        diff_range: Only consider posts changed in this git revision range
+    """
     logger = get_logger(__name__)
     try:
         # Initialize components
         project_root = Path.cwd()
         logger.info(f"Project root directory: {project_root}")
-        
+
         queue = PostQueue(base_dir=project_root)
-        
-        # Get all markdown files from the posts directory
+        tracker = PostTracker(base_dir=project_root)
+
         markdown_dir = Path(Settings.MARKDOWN_DIR)
-        all_files = {str(f.relative_to(markdown_dir)) for f in markdown_dir.glob('*.md')}
-        
-        # Add new files to queue
-        platforms = ['medium', 'devto']  # Default platforms
-        for file_path in all_files:
-            logger.info(f"Queueing file: {file_path}")
-            queue.add_to_queue(file_path, platforms)
-            
-        # Get queue status
-        status = queue.get_queue_status()
-        logger.info("Queue status: %s", status)
-        
+        with metrics.timer('scan'), profile_stage('scan'):
+            candidates = get_changed_files(diff_range, markdown_dir) if diff_range else None
+            if candidates is None:
+                # No usable diff, hash every post and compare with the queue
+                candidates = {str(f.relative_to(markdown_dir)) for f in markdown_dir.glob('*.md')}
+        logger.info(f"Checking {len(candidates)} post(s) for changes")
+
+        try:
+            stats = enqueue_changes(queue, tracker, markdown_dir, candidates)
+            logger.info(
+                f"Queued {stats['queued']} new or changed post(s), "
+                f"refreshed {stats['refreshed']}, left {stats['unchanged']} unchanged"
+            )
+
+            # Get queue status
+            status = queue.get_queue_status()
+            logger.info("Queue status: %s", status)
+            for state, entries in status.items():
+                metrics.set_gauge('queue_size', len(entries), status=state)
+        finally:
+            # Fold journaled queue changes into the committed JSON file
+            with profile_stage('state_close'):
+                queue.close()
+                tracker.close()
+            write_run_report('queue_posts', Settings.METRICS_DIR)
+            export_run_trace('queue_posts', Settings.TRACE_DIR)
+
         logger.info("Queuing process completed")
 
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
         raise
 
+def main(argv: Optional[List[str]] = None):
+    # Programmatic calls get no flags; only the script entry point passes the command line
+    args = parse_args([] if argv is None else argv)
+    if args.profile:
+        with RunProfiler('queue_posts', Settings.LOG_DIR):
+            queue_posts(args.diff_range)
+    else:
+        queue_posts(args.diff_range)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
@@ -0,0 +1,112 @@
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Iterator, List, Mapping, Optional
+import bisect
+from .config.settings import Settings
+
+WEEK_SECONDS = 7 * 24 * 3600
+
+class ScheduleCalculator:
+    """Computes publication slots from weekly schedule times without scanning days"""
+
+    def __init__(self, schedule_times: Optional[List[Dict]] = None, slot_capacity: Optional[int] = None):
+        """
+        Initialize the calculator
+
+        Args:
+            schedule_times: Entries with 'days' (0=Monday), 'hour' and optional
+                'minute' and 'capacity' (defaults to Settings.SCHEDULE_TIMES)
+            slot_capacity: Posts allowed per slot when an entry sets no
+                capacity (defaults to Settings.SLOT_CAPACITY)
+        """
+        schedule_times = Settings.SCHEDULE_TIMES if schedule_times is None else schedule_times
+        default_capacity = Settings.SLOT_CAPACITY if slot_capacity is None else slot_capacity
+
+        # Weekly slots as (seconds since Monday 00:00 UTC, capacity), deduplicated and sorted
+        slots: Dict[int, int] = {}
+        for schedule in schedule_times:
+            offset_in_day = int(schedule['hour']) * 3600 + int(schedule.get('minute', 0)) * 60
+            capacity = max(1, int(schedule.get('capacity', default_capacity)))
+            for day in schedule['days']:
+                offset = (int(day) % 7) * 86400 + offset_in_day
+                slots[offset] = max(slots.get(offset, 0), capacity)
+
+        if not slots:
+            raise ValueError("At least one schedule time is required")
+
+        self.offsets = sorted(slots)
+        self.capacities = [slots[offset] for offset in self.offsets]
+
+    @property
+    def slots_per_week(self) -> int:
+        """Number of distinct slots in one week"""
+        return len(self.offsets)
+
+    @staticmethod
+    def _week_start(moment: datetime) -> datetime:
+        """Monday 00:00 UTC of the week containing the given moment"""
+        moment = moment.astimezone(timezone.utc)
+        return (moment - timedelta(days=moment.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def slot_time(self, index: int, origin: datetime) -> datetime:
+        """
+        Time of the index-th slot counted from the start of origin's week
+
+        Args:
+            index: Slot number, slot 0 is the week's first slot
+            origin: Any moment in the reference week
+
+        Returns:
+            Slot time in UTC
+        """
+        week, position = divmod(index, self.slots_per_week)
+        return self._week_start(origin) + timedelta(seconds=week * WEEK_SECONDS + self.offsets[position])
+
+    def first_slot_index(self, now: datetime) -> int:
+        """Index (relative to now's week) of the first slot strictly after now"""
+        elapsed = (now.astimezone(timezone.utc) - self._week_start(now)).total_seconds()
+        return bisect.bisect_right(self.offsets, elapsed)
+
+    def next_slot(self, now: Optional[datetime] = None) -> datetime:
+        """Time of the first slot strictly after now"""
+        now = now or datetime.now(timezone.utc)
+        return self.slot_time(self.first_slot_index(now), now)
+
+    def iter_free_slots(self, occupancy: Mapping[float, int],
+                        now: Optional[datetime] = None) -> Iterator[datetime]:
+        """
+        Yield future slot times once per free place, earliest first
+
+        Args:
+            occupancy: Number of posts already scheduled per slot timestamp
+            now: Reference time (defaults to the current time)
+
+        Yields:
+            Slot times, repeated once for every remaining place in the slot
+        """
+        now = now or datetime.now(timezone.utc)
+        index = self.first_slot_index(now)
+        while True:
+            slot = self.slot_time(index, now)
+            capacity = self.capacities[index % self.slots_per_week]
+            for _ in range(capacity - occupancy.get(slot.timestamp(), 0)):
+                yield slot
+            index += 1
+
+    def assign(self, count: int, occupancy: Optional[Mapping[float, int]] = None,
+               now: Optional[datetime] = None) -> List[datetime]:
+        """
+        Spread posts across successive slots, filling each up to its capacity
+
+        Args:
+            count: Number of posts to schedule
+            occupancy: Number of posts already scheduled per slot timestamp
+            now: Reference time (defaults to the current time)
+
+        Returns:
+            One slot time per post, in order
+        """
+        if count <= 0:
+            return []
+        free_slots = self.iter_free_slots(occupancy or Counter(), now)
+        return [next(free_slots) for _ in range(count)]
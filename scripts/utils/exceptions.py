@@ -4,6 +4,10 @@ class PublishError(Exception):
         self.platform = platform
         super().__init__(message)
 
+class PublishStateUnknownError(PublishError):
+    """Exception raised when a publish request may or may not have succeeded"""
+    pass
+
 class ConversionError(Exception):
     """Exception raised when markdown conversion fails"""
     def __init__(self, message: str, file_path: str):
@@ -22,6 +26,12 @@ class TrackingError(Exception):
         self.file_path = file_path
         super().__init__(message)
 
+class StateConflictError(Exception):
+    """Exception raised when a state database and its JSON snapshot changed independently"""
+    def __init__(self, message: str, snapshot_file: str = None):
+        self.snapshot_file = snapshot_file
+        super().__init__(message)
+
 class RateLimitError(PublishError):
     """Exception raised when hitting platform rate limits"""
     def __init__(self, platform: str, retry_after: int = None):
@@ -35,9 +45,12 @@ class AuthenticationError(PublishError):
 
 class NetworkError(PublishError):
     """Exception raised when network operations fail"""
-    def __init__(self, platform: str, status_code: int = None):
+    def __init__(self, platform: str, status_code: int = None, details: str = None):
         self.status_code = status_code
-        super().__init__(f"Network error for {platform}", platform)
+        message = f"Network error for {platform}"
+        if details:
+            message += f": {details}"
+        super().__init__(message, platform)
 
 class QueueError(Exception):
     """Raised when queue operations fail"""
@@ -0,0 +1,35 @@
+import hashlib
+from pathlib import Path
+from typing import Union
+
+def file_digest(file_path: Union[str, Path], salt: str = '', chunk_size: int = 65536) -> str:
+    """
+    Compute a SHA-256 digest of a file's contents
+
+    Args:
+        file_path: Path to the file to hash
+        salt: Optional string mixed into the digest (e.g. settings fingerprint)
+        chunk_size: Number of bytes read per iteration
+
+    Returns:
+        Hex encoded digest string
+    """
+    digest = hashlib.sha256()
+    if salt:
+        digest.update(salt.encode('utf-8'))
+    with Path(file_path).open('rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def text_digest(text: str) -> str:
+    """
+    Compute a SHA-256 digest of a string
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        Hex encoded digest string
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
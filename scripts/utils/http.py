@@ -0,0 +1,87 @@
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .exceptions import PublishError, PublishStateUnknownError, NetworkError, AuthenticationError
+
+# Only methods that are safe to replay are retried at the adapter level
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Gateway errors mean the origin never handled the request, so retrying cannot duplicate a post
+RETRYABLE_STATUS_CODES = frozenset([502, 503])
+
+def create_session(headers: Optional[Dict[str, str]] = None, pool_size: int = 4,
+                   retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
+    """
+    Create a pooled HTTP session with keep-alive and idempotent retries
+
+    Args:
+        headers: Default headers sent with every request
+        pool_size: Maximum number of kept-alive connections per host
+        retries: Adapter-level retries for idempotent requests
+        backoff_factor: Backoff factor between adapter retries
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def check_response_status(response: requests.Response, platform: str):
+    """
+    Raise a classified error for authentication failures and transient server errors
+
+    Args:
+        response: HTTP response to inspect
+        platform: Platform name used in raised errors
+
+    Raises:
+        AuthenticationError: On 401/403 responses
+        NetworkError: On gateway errors that are safe to retry
+    """
+    if response.status_code in (401, 403):
+        raise AuthenticationError(platform)
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise NetworkError(platform, status_code=response.status_code,
+                           details=f"HTTP {response.status_code}")
+
+def classify_request_error(error: requests.RequestException, method: str, platform: str) -> PublishError:
+    """
+    Map a requests exception onto the publish error hierarchy
+
+    Connection failures never reached the platform and are retryable. A read
+    timeout on a non-idempotent request may have published the post, so it
+    is reported as PublishStateUnknownError and is not retried blindly.
+
+    Args:
+        error: Exception raised by requests
+        method: HTTP method of the failed request
+        platform: Platform name used in the returned error
+
+    Returns:
+        Classified publish error
+    """
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return NetworkError(platform, details=str(error))
+    if isinstance(error, requests.exceptions.Timeout):
+        if method.upper() in IDEMPOTENT_METHODS:
+            return NetworkError(platform, details=f"Request timed out: {error}")
+        return PublishStateUnknownError(f"Request timed out, publication state unknown: {error}", platform)
+    return PublishError(f"Request failed: {error}", platform)
@@ -0,0 +1,249 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Union
+import json
+import os
+import time
+
+def write_json_atomic(file_path: Union[str, Path], data: Any):
+    """
+    Write JSON to a file so readers only ever see the old or the new content
+
+    The data is written to a temporary file, fsync'd and renamed over the
+    target. Output is pretty-printed with sorted keys for readable git diffs.
+
+    Args:
+        file_path: Destination file
+        data: JSON serializable data
+    """
+    file_path = Path(file_path)
+    temp_file = file_path.with_name(f".{file_path.name}.tmp")
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, file_path)
+
+    # Persist the rename itself where the platform allows it
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(file_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+class StateStore:
+    """Base for tracker/queue storage engines with deferred (batched) writes"""
+
+    def __init__(self, snapshot_file: Union[str, Path]):
+        """
+        Initialize the store
+
+        Args:
+            snapshot_file: Path of the JSON snapshot kept for git
+        """
+        self.snapshot_file = Path(snapshot_file)
+        # Keys changed in memory but not yet persisted
+        self.dirty: Set[str] = set()
+        self.batch_depth = 0
+        self.flush_interval: Optional[float] = None
+        self.max_dirty: Optional[int] = None
+        self.last_flush = time.monotonic()
+
+    # Engines without indexed queries leave filtering to the owner
+    supports_queries = False
+
+    def exists(self) -> bool:
+        """Check whether any persisted state exists"""
+        return self.snapshot_file.exists()
+
+    def load_snapshot(self) -> Any:
+        """Read the persisted state"""
+        raise NotImplementedError
+
+    def has_journal(self) -> bool:
+        """Check whether mutations are waiting to be replayed on load"""
+        return False
+
+    def replay(self, data: Dict[str, Any]) -> int:
+        """Apply mutations persisted after the snapshot, returning how many"""
+        return 0
+
+    def begin(self, flush_interval: Optional[float] = None, max_dirty: Optional[int] = None):
+        """
+        Start deferring writes until the batch ends
+
+        Nested batches join the outermost one and keep its flush settings.
+
+        Args:
+            flush_interval: Flush early once this many seconds passed since the last flush
+            max_dirty: Flush early once this many keys are dirty
+        """
+        if self.batch_depth == 0:
+            self.flush_interval = flush_interval
+            self.max_dirty = max_dirty
+        self.batch_depth += 1
+
+    def end(self) -> bool:
+        """
+        Leave a batch
+
+        Returns:
+            True when the outermost batch ended and dirty keys should be flushed
+        """
+        self.batch_depth = max(0, self.batch_depth - 1)
+        return self.batch_depth == 0
+
+    def mark_dirty(self, key: str):
+        """Remember that a top-level key changed in memory"""
+        self.dirty.add(key)
+
+    def should_flush(self) -> bool:
+        """Whether dirty keys must be written now rather than deferred"""
+        if not self.dirty:
+            return False
+        if self.batch_depth == 0:
+            return True
+        if self.max_dirty and len(self.dirty) >= self.max_dirty:
+            return True
+        if self.flush_interval is not None and time.monotonic() - self.last_flush >= self.flush_interval:
+            return True
+        return False
+
+    def flush(self, data: Dict[str, Any]):
+        """
+        Durably persist the current value of every dirty key
+
+        Args:
+            data: Complete current state the dirty keys are read from
+        """
+        if not self.dirty:
+            return
+        self._write_dirty(data)
+        self.dirty.clear()
+        self.last_flush = time.monotonic()
+
+    def _write_dirty(self, data: Dict[str, Any]):
+        """Persist the dirty keys, implemented by each engine"""
+        raise NotImplementedError
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether the owner should write a full snapshot now"""
+        return False
+
+    def has_unsaved_changes(self) -> bool:
+        """Whether the snapshot file lags behind the persisted state"""
+        return bool(self.dirty)
+
+    def compact(self, data: Dict[str, Any]):
+        """
+        Persist the complete state and refresh the JSON snapshot
+
+        Args:
+            data: Complete current state
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources held by the engine, file-based engines hold none"""
+
+class JournalStore(StateStore):
+    """JSON snapshot file plus an append-only JSONL log of mutations"""
+
+    def __init__(self, snapshot_file: Union[str, Path], compact_every: int = 50):
+        """
+        Initialize the store
+
+        Args:
+            snapshot_file: Path of the JSON snapshot
+            compact_every: Number of journaled mutations that triggers compaction
+        """
+        super().__init__(snapshot_file)
+        self.journal_file = self.snapshot_file.with_name(f"{self.snapshot_file.name}.journal")
+        self.compact_every = max(1, compact_every)
+        self.pending_ops = 0
+
+    def load_snapshot(self) -> Any:
+        """Read the JSON snapshot"""
+        with self.snapshot_file.open('r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def has_journal(self) -> bool:
+        """Check whether mutations are waiting in the journal"""
+        return self.journal_file.exists()
+
+    def replay(self, data: Dict[str, Any]) -> int:
+        """
+        Apply journaled mutations to the snapshot data in place
+
+        A torn final line left by a crash mid-append is ignored.
+
+        Args:
+            data: Snapshot data to update
+
+        Returns:
+            Number of mutations applied
+        """
+        if not self.journal_file.exists():
+            return 0
+
+        applied = 0
+        with self.journal_file.open('r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Only the last append can be partial, nothing valid follows it
+                    break
+                if entry.get('op') == 'set':
+                    data[entry['key']] = entry['value']
+                elif entry.get('op') == 'delete':
+                    data.pop(entry['key'], None)
+                applied += 1
+
+        self.pending_ops = applied
+        return applied
+
+    def _write_dirty(self, data: Dict[str, Any]):
+        """Append every dirty key to the journal in one fsync'd write"""
+        lines = []
+        for key in sorted(self.dirty):
+            if key in data:
+                entry = {'op': 'set', 'key': key, 'value': data[key]}
+            else:
+                entry = {'op': 'delete', 'key': key}
+            lines.append(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.pending_ops += len(lines)
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether enough mutations accumulated to fold them into the snapshot"""
+        return self.pending_ops >= self.compact_every
+
+    def has_unsaved_changes(self) -> bool:
+        """Whether journaled or dirty changes are missing from the snapshot"""
+        return self.has_journal() or bool(self.dirty)
+
+    def compact(self, data: Dict[str, Any]):
+        """
+        Write the full state as the new snapshot and drop the journal
+
+        Args:
+            data: Complete current state
+        """
+        write_json_atomic(self.snapshot_file, data)
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self.pending_ops = 0
+        # The snapshot already holds every in-memory change
+        self.dirty.clear()
+        self.last_flush = time.monotonic()
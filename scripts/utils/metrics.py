@@ -0,0 +1,353 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import bisect
+import math
+import threading
+import time
+from .journal import write_json_atomic
+from .logger import get_logger
+
+# Upper bounds (seconds) of the latency histogram buckets, +Inf is implicit
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Metric names are prefixed with this namespace in the Prometheus textfile
+NAMESPACE = 'blog_automation'
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Canonical, hashable form of a label set"""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    """Render a label set in Prometheus exposition syntax"""
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+def _format_value(value: float) -> str:
+    """Render a sample value in Prometheus exposition syntax"""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+class Histogram:
+    """Cumulative-bucket latency histogram with count, sum, min and max"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        """Record one sample"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside its bucket
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None without samples
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+
+    def merge(self, data: Dict[str, Any]):
+        """Add the samples of a serialized histogram with the same buckets"""
+        for index, bucket_count in enumerate(data['counts']):
+            self.counts[index] += bucket_count
+        self.count += data['count']
+        self.sum += data['sum']
+        for bound, pick in (('min', min), ('max', max)):
+            if data.get(bound) is not None:
+                current = getattr(self, bound)
+                setattr(self, bound, data[bound] if current is None else pick(current, data[bound]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the histogram"""
+        return {
+            'buckets': list(self.buckets),
+            'counts': list(self.counts),
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Human oriented statistics for the run report"""
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99)
+        }
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and latency histograms for one run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.descriptions: Dict[str, str] = {}
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+
+    def reset(self):
+        """Drop every recorded value and restart the run clock"""
+        with self.lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.started_at = datetime.now(timezone.utc)
+            self.started = time.perf_counter()
+
+    def describe(self, name: str, description: str):
+        """Attach help text shown in the Prometheus textfile"""
+        self.descriptions[name] = description
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increase a counter"""
+        key = _label_key(labels)
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to its current value"""
+        with self.lock:
+            self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a latency sample in seconds"""
+        key = _label_key(labels)
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, stage: str, **labels) -> Iterator[None]:
+        """
+        Time a pipeline stage into the ``stage_seconds`` histogram
+
+        Failed executions are recorded too, with ``outcome="error"``.
+
+        Args:
+            stage: Stage name (scan, plan, parse, render, payload, publish, state_save, ...)
+            **labels: Extra labels such as the platform
+        """
+        start = time.perf_counter()
+        outcome = 'ok'
+        try:
+            yield
+        except BaseException:
+            outcome = 'error'
+            raise
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start,
+                         stage=stage, outcome=outcome, **labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Serialize every series so another process can merge it
+
+        Returns:
+            JSON serializable dictionary
+        """
+        with self.lock:
+            return {
+                'counters': {name: [[list(k), v] for k, v in series.items()] for name, series in self.counters.items()},
+                'gauges': {name: [[list(k), v] for k, v in series.items()] for name, series in self.gauges.items()},
+                'histograms': {
+                    name: [[list(k), histogram.to_dict()] for k, histogram in series.items()]
+                    for name, series in self.histograms.items()
+                }
+            }
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """
+        Add the series of a snapshot (e.g. from a worker process)
+
+        Counters and histograms are summed, gauges take the snapshot's value.
+        """
+        with self.lock:
+            for name, series in snapshot.get('counters', {}).items():
+                target = self.counters.setdefault(name, {})
+                for key, value in series:
+                    key = tuple(tuple(pair) for pair in key)
+                    target[key] = target.get(key, 0) + value
+            for name, series in snapshot.get('gauges', {}).items():
+                target = self.gauges.setdefault(name, {})
+                for key, value in series:
+                    target[tuple(tuple(pair) for pair in key)] = value
+            for name, series in snapshot.get('histograms', {}).items():
+                target = self.histograms.setdefault(name, {})
+                for key, data in series:
+                    key = tuple(tuple(pair) for pair in key)
+                    if key not in target:
+                        target[key] = Histogram(tuple(data['buckets']))
+                    target[key].merge(data)
+
+    def report(self, run: str) -> Dict[str, Any]:
+        """
+        Build the machine-readable run report
+
+        Args:
+            run: Entry point name, e.g. 'publish_posts'
+
+        Returns:
+            Report with the run timing, counters, gauges and histogram summaries
+        """
+        def labelled(series: Dict[LabelKey, Any], convert) -> List[Dict[str, Any]]:
+            return [{'labels': dict(key), 'value': convert(value)} for key, value in sorted(series.items())]
+
+        with self.lock:
+            return {
+                'run': run,
+                'started_at': self.started_at.isoformat(),
+                'wall_seconds': round(time.perf_counter() - self.started, 6),
+                'counters': {name: labelled(series, lambda v: v) for name, series in sorted(self.counters.items())},
+                'gauges': {name: labelled(series, lambda v: v) for name, series in sorted(self.gauges.items())},
+                'histograms': {
+                    name: labelled(series, Histogram.summary)
+                    for name, series in sorted(self.histograms.items())
+                }
+            }
+
+    def prometheus_text(self, run: str) -> str:
+        """
+        Render every series in the Prometheus text exposition format
+
+        Args:
+            run: Entry point name, added as the ``run`` label
+
+        Returns:
+            Textfile contents for node_exporter's textfile collector
+        """
+        run_label = {'run': run}
+        lines = []
+
+        def header(metric: str, name: str, kind: str):
+            if name in self.descriptions:
+                lines.append(f"# HELP {metric} {self.descriptions[name]}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+        with self.lock:
+            for name, series in sorted(self.counters.items()):
+                metric = f"{NAMESPACE}_{name}_total"
+                header(metric, name, 'counter')
+                for key, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(key, run_label)} {_format_value(value)}")
+            for name, series in sorted(self.gauges.items()):
+                metric = f"{NAMESPACE}_{name}"
+                header(metric, name, 'gauge')
+                for key, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(key, run_label)} {_format_value(value)}")
+            for name, series in sorted(self.histograms.items()):
+                metric = f"{NAMESPACE}_{name}"
+                header(metric, name, 'histogram')
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(histogram.buckets) + [math.inf], histogram.counts):
+                        cumulative += bucket_count
+                        le = {'le': '+Inf' if math.isinf(bound) else repr(bound), **run_label}
+                        lines.append(f"{metric}_bucket{_format_labels(key, le)} {cumulative}")
+                    lines.append(f"{metric}_sum{_format_labels(key, run_label)} {_format_value(histogram.sum)}")
+                    lines.append(f"{metric}_count{_format_labels(key, run_label)} {histogram.count}")
+
+            metric = f"{NAMESPACE}_run_wall_seconds"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{_format_labels((), run_label)} {_format_value(time.perf_counter() - self.started)}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, run: str, output_dir: Union[str, Path]) -> Tuple[Path, Path]:
+        """
+        Write the JSON run report and the Prometheus textfile
+
+        The JSON report is kept per run (timestamped) and as ``<run>.json``
+        for the latest run; the textfile is replaced atomically so a
+        collector never reads a partial file.
+
+        Args:
+            run: Entry point name
+            output_dir: Directory receiving the files
+
+        Returns:
+            Paths of the latest JSON report and of the textfile
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = self.report(run)
+        stamp = self.started_at.strftime('%Y%m%dT%H%M%S')
+        write_json_atomic(output_dir / f"{run}-{stamp}.json", report)
+        report_file = output_dir / f"{run}.json"
+        write_json_atomic(report_file, report)
+
+        prom_file = output_dir / f"{run}.prom"
+        temp_file = prom_file.with_name(f".{prom_file.name}.tmp")
+        temp_file.write_text(self.prometheus_text(run), encoding='utf-8')
+        temp_file.replace(prom_file)
+        return report_file, prom_file
+
+# Process-wide registry the pipeline records into
+metrics = MetricsRegistry()
+
+def write_run_report(run: str, output_dir: Union[str, Path]):
+    """
+    Write the process-wide metrics at the end of an entry point run
+
+    Failures are logged only, a missing report must never fail a publish run.
+
+    Args:
+        run: Entry point name
+        output_dir: Directory receiving the report and the textfile
+    """
+    logger = get_logger(__name__)
+    try:
+        report_file, prom_file = metrics.write(run, output_dir)
+        logger.info(f"Wrote run metrics to {report_file} and {prom_file}")
+    except OSError as e:
+        logger.warning(f"Could not write run metrics: {str(e)}")
+
+metrics.describe('stage_seconds', "Duration of pipeline stages in seconds")
+metrics.describe('http_request_seconds', "Duration of platform API requests in seconds")
+metrics.describe('posts', "Posts handled by outcome")
+metrics.describe('publications', "Publication attempts by platform and outcome")
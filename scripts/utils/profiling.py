@@ -0,0 +1,244 @@
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+import cProfile
+import io
+import pstats
+import re
+import sys
+import sysconfig
+import threading
+import tracemalloc
+from .logger import get_logger
+from ..config.settings import Settings
+
+# Profiler of the running entry point, if --profile was given
+_active: Optional['RunProfiler'] = None
+
+# Allocation noise from the profilers themselves
+_IGNORED_ALLOCATION_FILES = {
+    tracemalloc.__file__,
+    cProfile.__file__,
+    pstats.__file__,
+    __file__,
+    '<frozen importlib._bootstrap>',
+    '<frozen importlib._bootstrap_external>',
+    '<unknown>'
+}
+
+# Module of a C function as cProfile names it, e.g. "<built-in method _json.encode_basestring>"
+_BUILTIN_MODULE = re.compile(r"(?:built-in method |of ')(\w+)\.")
+
+# Before 3.12 a cProfile profile only sees the thread that enabled it. From 3.12 on
+# it runs on sys.monitoring, which allows a single active profiler per process
+# and reports calls from every thread to it.
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+_STDLIB_DIR = Path(sysconfig.get_paths()['stdlib']).resolve()
+_PACKAGE_DIR = Path(__file__).resolve().parents[1]
+
+def library_of(filename: str, function: str = '') -> str:
+    """
+    Name the library a profiled function belongs to
+
+    Args:
+        filename: Code filename recorded by cProfile ('~' for C builtins)
+        function: Function name, used to place C builtins such as
+            "<built-in method time.sleep>" or "<method 'acquire' of '_thread.lock' objects>"
+
+    Returns:
+        Third-party distribution, stdlib module, 'scripts' or 'builtins'
+    """
+    if filename == '~' or filename.startswith('<'):
+        match = _BUILTIN_MODULE.search(function)
+        return match.group(1) if match else 'builtins'
+    path = Path(filename)
+    parts = path.parts
+    for marker in ('site-packages', 'dist-packages'):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return parts[index + 1].split('.')[0]
+    resolved = path.resolve()
+    if _PACKAGE_DIR in resolved.parents:
+        return 'scripts'
+    if _STDLIB_DIR in resolved.parents:
+        return resolved.relative_to(_STDLIB_DIR).parts[0].split('.')[0]
+    return path.stem
+
+class RunProfiler:
+    """
+    Runs an entry point under cProfile and tracemalloc
+
+    Calls made in threads started while profiling are included (the publish
+    engine works in thread pools): before Python 3.12 every new thread gets
+    its own cProfile profile and they are merged into one pstats file, from
+    3.12 on the single process-wide profile covers them. Allocation growth
+    is recorded per stage marked with ``profile_stage``.
+    """
+
+    def __init__(self, run: str, output_dir: Optional[Union[str, Path]] = None,
+                 top_n: Optional[int] = None, frames: int = 10):
+        """
+        Initialize the profiler
+
+        Args:
+            run: Entry point name, used in file names
+            output_dir: Directory receiving the results (defaults to Settings.LOG_DIR)
+            top_n: Functions and allocation sites listed per section (defaults to Settings.PROFILE_TOP_N)
+            frames: Traceback depth kept by tracemalloc
+        """
+        self.run = run
+        self.output_dir = Path(output_dir or Settings.LOG_DIR)
+        self.top_n = top_n or Settings.PROFILE_TOP_N
+        self.frames = frames
+        self.logger = get_logger(__name__)
+        self.lock = threading.Lock()
+        self.profiles: List[cProfile.Profile] = []
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Path] = {}
+
+    def _thread_hook(self, frame, event, arg):
+        """Give a new thread its own profile, which then replaces this hook"""
+        # An exception here would kill the thread before it runs its target
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+        except Exception as e:
+            # Uninstall the hook, it would otherwise run again on every call
+            sys.setprofile(None)
+            self.logger.warning(f"Not profiling thread {threading.current_thread().name}: {e}")
+            return
+        with self.lock:
+            self.profiles.append(profile)
+
+    def start(self):
+        """Start profiling the calling thread and every thread started afterwards"""
+        global _active
+        tracemalloc.start(self.frames)
+        main_profile = cProfile.Profile()
+        self.profiles = [main_profile]
+        if PER_THREAD_PROFILES:
+            threading.setprofile(self._thread_hook)
+        _active = self
+        main_profile.enable()
+
+    def stop(self) -> Dict[str, Path]:
+        """
+        Stop profiling and write the results
+
+        Returns:
+            Paths of the written 'pstats' and 'report' files
+        """
+        global _active
+        self.profiles[0].disable()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(None)
+        _active = None
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+        stats = pstats.Stats(*self.profiles)
+        self.files['pstats'] = self.output_dir / f"{self.run}-{stamp}.pstats"
+        stats.dump_stats(self.files['pstats'])
+        self.files['report'] = self.output_dir / f"{self.run}-{stamp}-profile.txt"
+        self.files['report'].write_text(self.render_report(stats, peak), encoding='utf-8')
+        self.logger.info(f"Wrote profile to {self.files['pstats']} and {self.files['report']}")
+        return self.files
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the allocation sites that grew during a stage"""
+        # Snapshots are taken with the calling thread's profile paused so they stay out of the timings
+        main_profile = self.profiles[0]
+        main_profile.disable()
+        before = tracemalloc.take_snapshot()
+        main_profile.enable()
+        try:
+            yield
+        finally:
+            main_profile.disable()
+            after = tracemalloc.take_snapshot()
+            growth = [
+                stat for stat in after.compare_to(before, 'lineno')
+                if stat.traceback[0].filename not in _IGNORED_ALLOCATION_FILES
+            ]
+            growth.sort(key=lambda stat: stat.size_diff, reverse=True)
+            self.stages[name] = {
+                'size_diff': sum(stat.size_diff for stat in growth),
+                'top': [
+                    {
+                        'site': str(stat.traceback[0]),
+                        'library': library_of(stat.traceback[0].filename),
+                        'size_diff': stat.size_diff,
+                        'count_diff': stat.count_diff
+                    }
+                    for stat in growth[:self.top_n] if stat.size_diff > 0
+                ]
+            }
+            main_profile.enable()
+
+    def library_breakdown(self, stats: pstats.Stats) -> Dict[str, float]:
+        """
+        Self time per library, e.g. markdown2, frontmatter, yaml, json, logging
+
+        Args:
+            stats: Merged profile statistics
+
+        Returns:
+            Seconds of self time per library, largest first
+        """
+        totals: Dict[str, float] = {}
+        for (filename, _, function), (_, _, self_time, _, _) in stats.stats.items():
+            library = library_of(filename, function)
+            totals[library] = totals.get(library, 0.0) + self_time
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    def render_report(self, stats: pstats.Stats, peak: int) -> str:
+        """Human readable summary: time per library, hottest functions and allocations per stage"""
+        out = io.StringIO()
+        out.write(f"Profile of {self.run} ({len(self.profiles)} thread profile(s), "
+                  f"peak traced memory {peak / 1024:.0f} KiB)\n\n")
+
+        out.write("Self time by library\n")
+        breakdown = self.library_breakdown(stats)
+        total = sum(breakdown.values()) or 1.0
+        for library, seconds in breakdown.items():
+            out.write(f"  {library:<24} {seconds:9.4f}s {100 * seconds / total:6.1f}%\n")
+
+        for sort_key in ('cumulative', 'tottime'):
+            out.write(f"\nTop {self.top_n} functions by {sort_key}\n")
+            stats.stream = out
+            stats.sort_stats(sort_key).print_stats(self.top_n)
+
+        out.write("\nAllocation growth per stage\n")
+        for name, stage in self.stages.items():
+            out.write(f"  {name}: {stage['size_diff'] / 1024:+.1f} KiB\n")
+            for site in stage['top']:
+                out.write(f"    {site['size_diff'] / 1024:+9.1f} KiB {site['count_diff']:+7d} blocks  "
+                          f"[{site['library']}] {site['site']}\n")
+        return out.getvalue()
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    """Record allocations of a stage when the entry point runs with --profile"""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+def profiling_active() -> bool:
+    """Whether the entry point runs with --profile"""
+    return _active is not None
@@ -0,0 +1,183 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping, Optional
+import math
+import threading
+import time
+import requests
+from .exceptions import RateLimitError
+
+class TokenBucket:
+    """Thread-safe token bucket limiting request throughput for one platform"""
+
+    def __init__(self, rate: float, capacity: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update"""
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def _wait_time(self, now: float) -> float:
+        """Seconds until a token is available"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.rate
+
+    def wait_time(self) -> float:
+        """Seconds until the next token becomes available"""
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            return self._wait_time(now)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, blocking until one is available
+
+        Args:
+            timeout: Maximum seconds to wait, None waits indefinitely
+
+        Returns:
+            True if a token was taken, False if the timeout expired first
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            with self.lock:
+                now = self.clock()
+                self._refill(now)
+                wait = self._wait_time(now)
+                if wait <= 0:
+                    self.tokens -= 1
+                    return True
+            if deadline is not None and now + wait > deadline:
+                return False
+            self.sleep(wait)
+
+    def block_for(self, seconds: float):
+        """
+        Stop handing out tokens for the given number of seconds
+
+        Args:
+            seconds: Delay requested by the platform (e.g. Retry-After)
+        """
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, now + seconds)
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Work out how long to wait from rate limit response headers
+
+    Understands ``Retry-After`` (seconds or HTTP date) and the
+    ``X-RateLimit-Reset`` / ``RateLimit-Reset`` family (epoch or delta seconds).
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Seconds to wait, or None if the headers carry no hint
+    """
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+
+    for header in ('X-RateLimit-Reset', 'RateLimit-Reset', 'X-Rate-Limit-Reset'):
+        reset = headers.get(header)
+        if not reset:
+            continue
+        try:
+            value = float(reset)
+        except ValueError:
+            continue
+        # Large values are epoch timestamps, small ones are deltas
+        if value > 1_000_000_000:
+            return max(0.0, value - time.time())
+        return max(0.0, value)
+
+    return None
+
+def is_quota_exhausted(headers: Mapping[str, str]) -> bool:
+    """Check whether the response reports no remaining requests in the window"""
+    for header in ('X-RateLimit-Remaining', 'RateLimit-Remaining', 'X-Rate-Limit-Remaining'):
+        remaining = headers.get(header)
+        if remaining is not None:
+            try:
+                return float(remaining) <= 0
+            except ValueError:
+                return False
+    return False
+
+def rate_limited_request(session: requests.Session, bucket: TokenBucket, platform: str,
+                         method: str, url: str, default_delay: float,
+                         wait_timeout: Optional[float] = None, **kwargs) -> requests.Response:
+    """
+    Send a request through the platform's token bucket
+
+    Args:
+        session: HTTP session used to send the request
+        bucket: Token bucket of the target platform
+        platform: Platform name used in raised errors
+        method: HTTP method
+        url: Request URL
+        default_delay: Delay applied on 429 when the response carries no hint
+        wait_timeout: Maximum seconds to wait for a token
+        **kwargs: Passed through to ``session.request``
+
+    Returns:
+        The HTTP response
+
+    Raises:
+        RateLimitError: If the platform answered 429 or no token became available
+    """
+    if not bucket.acquire(timeout=wait_timeout):
+        raise RateLimitError(platform, retry_after=math.ceil(bucket.wait_time()))
+
+    response = session.request(method, url, **kwargs)
+
+    if response.status_code == 429:
+        delay = parse_retry_after(response.headers)
+        if delay is None:
+            delay = default_delay
+        bucket.block_for(delay)
+        raise RateLimitError(platform, retry_after=math.ceil(delay))
+
+    if is_quota_exhausted(response.headers):
+        # Pause before the platform starts refusing requests
+        delay = parse_retry_after(response.headers)
+        if delay:
+            bucket.block_for(delay)
+
+    return response
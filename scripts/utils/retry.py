@@ -0,0 +1,98 @@
+from typing import Callable, Optional, TypeVar
+import random
+import time
+from .exceptions import PublishError, NetworkError, RateLimitError, AuthenticationError
+from ..config.settings import Settings
+
+T = TypeVar('T')
+
+class RetryPolicy:
+    """Retries transient publish failures with jittered exponential backoff"""
+
+    def __init__(self, max_retries: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: float = 300.0,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_retries: Retries allowed for transient errors (defaults to Settings.MAX_RETRIES)
+            base_delay: Delay before the first retry (defaults to Settings.RETRY_DELAY)
+            max_delay: Upper bound for a single backoff delay
+            sleep: Sleep function, injectable for tests
+            clock: Monotonic clock compared against the deadline
+        """
+        self.max_retries = Settings.MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = Settings.RETRY_DELAY if base_delay is None else base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.clock = clock
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Decide whether an error is worth retrying
+
+        Network failures and rate limits are transient; authentication and
+        validation failures will fail the same way again.
+        """
+        if isinstance(error, AuthenticationError):
+            return False
+        return isinstance(error, (NetworkError, RateLimitError))
+
+    def get_delay(self, failures: int, error: Exception) -> float:
+        """
+        Compute the delay before the next attempt
+
+        Args:
+            failures: Number of transient failures so far (1 for the first retry)
+            error: The error that triggered the retry
+
+        Returns:
+            Seconds to wait
+        """
+        if isinstance(error, RateLimitError):
+            return error.retry_after if error.retry_after is not None else Settings.RATE_LIMIT_DELAY
+
+        backoff = min(self.max_delay, self.base_delay * 2 ** max(0, failures - 1))
+        # Equal jitter keeps at least half the backoff while spreading retries out
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def call(self, func: Callable[[], T], deadline: Optional[float] = None,
+             on_retry: Optional[Callable[[int, PublishError, float], None]] = None) -> T:
+        """
+        Call ``func`` until it succeeds or fails permanently
+
+        Rate limit waits are bounded by the deadline only; other transient
+        errors also count against ``max_retries``.
+
+        Args:
+            func: Zero-argument callable performing one attempt
+            deadline: Monotonic time after which no retry is started
+            on_retry: Called with (attempt, error, delay) before each retry
+
+        Returns:
+            The value returned by ``func``
+
+        Raises:
+            PublishError: The last error once retries are exhausted or not allowed
+        """
+        attempt = 0
+        failures = 0
+        while True:
+            attempt += 1
+            try:
+                return func()
+            except PublishError as e:
+                if not self.is_retryable(e):
+                    raise
+                if not isinstance(e, RateLimitError):
+                    failures += 1
+                    if failures > self.max_retries:
+                        raise
+                delay = self.get_delay(failures, e)
+                if deadline is not None and self.clock() + delay > deadline:
+                    raise
+                if on_retry:
+                    on_retry(attempt, e, delay)
+                self.sleep(delay)
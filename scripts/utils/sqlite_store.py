@@ -0,0 +1,279 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Union
+import json
+import sqlite3
+import threading
+from .exceptions import StateConflictError
+from .hashing import file_digest
+from .journal import StateStore, write_json_atomic
+from .logger import get_logger
+
+class IndexRow(NamedTuple):
+    """Indexed columns extracted from one state entry"""
+    status: Optional[str] = None
+    scheduled_at: Optional[float] = None
+    completed_at: Optional[float] = None
+    platforms: Dict[str, str] = {}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    status TEXT,
+    scheduled_at REAL,
+    completed_at REAL
+);
+CREATE TABLE IF NOT EXISTS entry_platforms (
+    key TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (key, platform)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_status_scheduled ON entries (status, scheduled_at);
+CREATE INDEX IF NOT EXISTS idx_entries_status_completed ON entries (status, completed_at);
+CREATE INDEX IF NOT EXISTS idx_platforms_platform_state ON entry_platforms (platform, state);
+"""
+
+class SqliteStore(StateStore):
+    """
+    SQLite storage engine with indexed status, schedule and platform columns
+
+    The JSON snapshot stays the committed source of truth: the database
+    records the digest of the snapshot it last imported or exported and
+    re-imports the file when it changed (e.g. after a git pull). Entries are
+    still loaded into memory as a whole; the indexes serve the queries.
+    """
+
+    supports_queries = True
+
+    def __init__(self, snapshot_file: Union[str, Path], indexer: Callable[[str, Dict[str, Any]], IndexRow]):
+        """
+        Initialize the store next to the JSON snapshot
+
+        Args:
+            snapshot_file: JSON snapshot used for migration and export
+            indexer: Extracts the indexed columns from an entry
+        """
+        super().__init__(snapshot_file)
+        self.db_file = self.snapshot_file.with_suffix('.db')
+        self.indexer = indexer
+        self.changed_since_export = False
+        self.logger = get_logger(__name__)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def exists(self) -> bool:
+        """Check whether a database or a JSON snapshot to migrate exists"""
+        return self._row_count() > 0 or self.snapshot_file.exists()
+
+    def _row_count(self) -> int:
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: str):
+        """Record a meta value, caller holds the lock and transaction"""
+        self.connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def _snapshot_digest(self) -> Optional[str]:
+        return file_digest(self.snapshot_file) if self.snapshot_file.exists() else None
+
+    def _is_migrated(self) -> bool:
+        return self._get_meta('migrated_from_json') is not None
+
+    def load_snapshot(self) -> Any:
+        """
+        Read all entries, importing the JSON snapshot on first use or after it changed
+
+        Returns:
+            Dictionary of all entries
+
+        Raises:
+            StateConflictError: If the snapshot changed while the database holds unexported changes
+        """
+        if not self._is_migrated():
+            self.migrate_from_json()
+        else:
+            digest = self._snapshot_digest()
+            if digest is not None and digest != self._get_meta('snapshot_digest'):
+                if self._get_meta('unexported_changes') == '1':
+                    raise StateConflictError(
+                        f"{self.snapshot_file} changed while {self.db_file} holds changes that were never "
+                        f"exported; reconcile them by hand, then delete one of the two files",
+                        str(self.snapshot_file)
+                    )
+                imported = self.migrate_from_json()
+                self.logger.warning(f"Re-imported {imported} entries from updated snapshot {self.snapshot_file}")
+
+        with self.lock:
+            rows = self.connection.execute('SELECT key, value FROM entries').fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def migrate_from_json(self) -> int:
+        """
+        Replace the database contents with the JSON snapshot
+
+        Returns:
+            Number of imported entries
+        """
+        data = {}
+        if self.snapshot_file.exists():
+            with self.snapshot_file.open('r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError(f"Invalid snapshot format in {self.snapshot_file}")
+        digest = self._snapshot_digest()
+
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM entry_platforms')
+            self.connection.execute('DELETE FROM entries')
+            self._upsert(data, data.keys())
+            self._set_meta('migrated_from_json', str(self.snapshot_file))
+            self._set_meta('snapshot_digest', digest or '')
+            self._set_meta('unexported_changes', '0')
+        return len(data)
+
+    def _upsert(self, data: Dict[str, Any], keys: Iterable[str]):
+        """Write or delete the given keys, caller holds the lock and transaction"""
+        for key in keys:
+            self.connection.execute('DELETE FROM entry_platforms WHERE key = ?', (key,))
+            if key not in data:
+                self.connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+                continue
+
+            value = data[key]
+            index = self.indexer(key, value)
+            self.connection.execute(
+                'INSERT OR REPLACE INTO entries (key, value, status, scheduled_at, completed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, json.dumps(value, ensure_ascii=False), index.status,
+                 index.scheduled_at, index.completed_at)
+            )
+            self.connection.executemany(
+                'INSERT INTO entry_platforms (key, platform, state) VALUES (?, ?, ?)',
+                [(key, platform, state) for platform, state in index.platforms.items()]
+            )
+
+    def _write_dirty(self, data: Dict[str, Any]):
+        """Upsert every dirty key in a single transaction"""
+        with self.lock, self.connection:
+            self._upsert(data, sorted(self.dirty))
+            self._set_meta('unexported_changes', '1')
+        self.changed_since_export = True
+
+    def has_unsaved_changes(self) -> bool:
+        """Whether the JSON export lags behind the database"""
+        return self.changed_since_export or bool(self.dirty)
+
+    def compact(self, data: Dict[str, Any]):
+        """
+        Synchronize the database with the full state and export it as JSON
+
+        Args:
+            data: Complete current state
+        """
+        with self.lock, self.connection:
+            stale = {
+                key for (key,) in self.connection.execute('SELECT key FROM entries')
+                if key not in data
+            }
+            self._upsert(data, list(data.keys()) + sorted(stale))
+        self.export_json(data)
+        self.dirty.clear()
+
+    def export_json(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Write the human-readable JSON snapshot committed to git
+
+        Args:
+            data: State to export, read from the database when omitted
+        """
+        if data is None:
+            data = self.load_snapshot()
+        write_json_atomic(self.snapshot_file, data)
+        with self.lock, self.connection:
+            self._set_meta('snapshot_digest', self._snapshot_digest())
+            self._set_meta('unexported_changes', '0')
+        self.changed_since_export = False
+
+    def select(self, data: Dict[str, Any], predicate: Callable[[Dict[str, Any]], bool],
+               status: Optional[str] = None, scheduled_before: Optional[float] = None,
+               completed_before: Optional[float] = None) -> List[str]:
+        """
+        Select keys through the indexes, evaluating unflushed changes in memory
+
+        Args:
+            data: Current in-memory state
+            predicate: Same filter applied to entries changed since the last flush
+            status: Required status
+            scheduled_before: Upper bound (inclusive) of the scheduled timestamp
+            completed_before: Upper bound (inclusive) of the completion timestamp
+
+        Returns:
+            Matching keys
+        """
+        clauses, params = [], []
+        if status is not None:
+            clauses.append('status = ?')
+            params.append(status)
+        if scheduled_before is not None:
+            clauses.append('scheduled_at <= ?')
+            params.append(scheduled_before)
+        if completed_before is not None:
+            clauses.append('completed_at <= ?')
+            params.append(completed_before)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self.lock:
+            keys = [key for (key,) in self.connection.execute(f'SELECT key FROM entries{where}', params)]
+        return self._merge_dirty(keys, data, predicate)
+
+    def keys_with_platform_state(self, data: Dict[str, Any], platform: str, states: Iterable[str],
+                                 predicate: Callable[[Dict[str, Any]], bool]) -> Set[str]:
+        """
+        Select keys whose platform is in one of the given states
+
+        Args:
+            data: Current in-memory state
+            platform: Platform name
+            states: Accepted platform states
+            predicate: Same filter applied to entries changed since the last flush
+
+        Returns:
+            Matching keys
+        """
+        states = list(states)
+        placeholders = ', '.join('?' for _ in states)
+        with self.lock:
+            keys = [
+                key for (key,) in self.connection.execute(
+                    f'SELECT key FROM entry_platforms WHERE platform = ? AND state IN ({placeholders})',
+                    [platform, *states]
+                )
+            ]
+        return set(self._merge_dirty(keys, data, predicate))
+
+    def _merge_dirty(self, keys: List[str], data: Dict[str, Any],
+                     predicate: Callable[[Dict[str, Any]], bool]) -> List[str]:
+        """Replace database answers for dirty keys with in-memory evaluation"""
+        if not self.dirty:
+            return keys
+        merged = [key for key in keys if key not in self.dirty]
+        merged.extend(key for key in sorted(self.dirty) if key in data and predicate(data[key]))
+        return merged
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,190 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+import json
+import os
+import threading
+import time
+from .logger import get_logger
+from ..config.settings import Settings
+
+# Attributes (file path, platform, attempt, ...) inherited by every span opened below them
+_attributes: ContextVar[Dict[str, Any]] = ContextVar('trace_attributes', default={})
+
+class Span:
+    """An open span whose arguments can still be extended, e.g. with the HTTP status"""
+    __slots__ = ('name', 'args')
+
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        """Add arguments to the span"""
+        self.args.update(args)
+
+class _NoopSpan:
+    """Span handed out while tracing is disabled"""
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Tracer:
+    """
+    Collects timed spans and exports them as Chrome trace-event JSON
+
+    Timestamps are wall-clock microseconds so spans recorded by conversion
+    worker processes line up with the parent's. The file opens in
+    chrome://tracing or https://ui.perfetto.dev, one row per thread.
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = 100000):
+        """
+        Initialize the tracer
+
+        Args:
+            enabled: Record spans (disabled tracers cost one attribute check per span)
+            max_events: Spans kept in memory, later ones are counted as dropped
+        """
+        self.enabled = enabled
+        self.max_events = max_events
+        self.lock = threading.Lock()
+        self.events: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self._named_threads = set()
+
+    def reset(self):
+        """Drop every recorded span"""
+        with self.lock:
+            self.events = []
+            self.dropped = 0
+            self._named_threads = set()
+
+    @contextmanager
+    def context(self, **attributes) -> Iterator[None]:
+        """Attach attributes to every span opened inside the block on this thread"""
+        token = _attributes.set({**_attributes.get(), **attributes})
+        try:
+            yield
+        finally:
+            _attributes.reset(token)
+
+    @contextmanager
+    def span(self, name: str, category: str = 'pipeline', **args) -> Iterator[Union[Span, _NoopSpan]]:
+        """
+        Time a block as a complete ("X") trace event
+
+        Args:
+            name: Span name, e.g. 'medium.publish'
+            category: Trace category used for filtering in the viewer
+            **args: Span arguments, merged over the inherited context attributes
+
+        Yields:
+            The span, so callers can add arguments once they are known
+        """
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        span = Span(name, {**_attributes.get(), **args})
+        start_us = time.time_ns() // 1000
+        start = time.perf_counter_ns()
+        try:
+            yield span
+        except BaseException as e:
+            span.args['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._record({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': start_us,
+                'dur': (time.perf_counter_ns() - start) / 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': span.args
+            })
+
+    def _record(self, event: Dict[str, Any]):
+        """Store an event, naming its thread the first time it is seen"""
+        with self.lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            thread_key = (event['pid'], event['tid'])
+            if thread_key not in self._named_threads:
+                self._named_threads.add(thread_key)
+                self.events.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': event['pid'], 'tid': event['tid'],
+                    'args': {'name': threading.current_thread().name}
+                })
+            self.events.append(event)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Remove and return the recorded events (used by worker processes)"""
+        with self.lock:
+            events, self.events = self.events, []
+            self._named_threads = set()
+            return events
+
+    def extend(self, events: List[Dict[str, Any]]):
+        """Add events recorded elsewhere, e.g. by a worker process"""
+        with self.lock:
+            room = max(0, self.max_events - len(self.events))
+            self.events.extend(events[:room])
+            self.dropped += max(0, len(events) - room)
+
+    def export(self, file_path: Union[str, Path]) -> Path:
+        """
+        Write the recorded spans as Chrome trace-event JSON
+
+        Args:
+            file_path: Destination file
+
+        Returns:
+            The written path
+        """
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            trace = {
+                'traceEvents': list(self.events),
+                'displayTimeUnit': 'ms',
+                'otherData': {'dropped_events': self.dropped}
+            }
+        with file_path.open('w', encoding='utf-8') as f:
+            # Span arguments may hold values such as paths, render them as strings
+            json.dump(trace, f, default=str)
+        return file_path
+
+# Process-wide tracer, switched on with TRACE_ENABLED
+tracer = Tracer(enabled=Settings.TRACE_ENABLED, max_events=Settings.TRACE_MAX_EVENTS)
+
+def export_run_trace(run: str, output_dir: Union[str, Path]) -> Optional[Path]:
+    """
+    Export the process-wide trace at the end of an entry point run
+
+    Args:
+        run: Entry point name, used in the file name
+        output_dir: Directory receiving the trace
+
+    Returns:
+        Path of the trace file, or None when tracing is off or the write failed
+    """
+    if not tracer.enabled:
+        return None
+    logger = get_logger(__name__)
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+    try:
+        trace_file = tracer.export(Path(output_dir) / f"{run}-{stamp}.trace.json")
+    except OSError as e:
+        logger.warning(f"Could not write trace: {str(e)}")
+        return None
+    logger.info(f"Wrote trace with {len(tracer.events)} events to {trace_file}")
+    return trace_file
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .exceptions import ValidationError
 
 def validate_frontmatter(metadata: Dict[str, Any]) -> bool:
@@ -73,13 +73,21 @@ def validate_html_content(content: str) -> bool:
     
     return True
 
-def validate_publication_data(data: Dict[str, Any], platform: str) -> bool:
+# Payload fields of the built-in platforms, plugins pass their own
+PLATFORM_REQUIRED_FIELDS: Dict[str, List[str]] = {
+    'medium': ['title', 'content'],
+    'devto': ['title', 'body_markdown']
+}
+
+def validate_publication_data(data: Dict[str, Any], platform: str,
+                              required_fields: Optional[List[str]] = None) -> bool:
     """
     Validate data before publication
     
     Args:
         data: Publication data dictionary
         platform: Target platform
+        required_fields: Fields the platform requires (defaults to the built-in list)
         
     Returns:
         bool: True if valid
@@ -87,17 +95,13 @@ def validate_publication_data(data: Dict[str, Any], platform: str) -> bool:
     Raises:
         ValidationError: If validation fails
     """
-    required_fields = {
-        'medium': ['title', 'content'],
-        'devto': ['title', 'body_markdown']
-    }
-    
-    if platform not in required_fields:
-        raise ValidationError(f"Unsupported platform: {platform}")
+    if required_fields is None:
+        if platform not in PLATFORM_REQUIRED_FIELDS:
+            raise ValidationError(f"Unsupported platform: {platform}")
+        required_fields = PLATFORM_REQUIRED_FIELDS[platform]
     
     # Check required fields for the platform
-    fields = required_fields[platform]
-    missing_fields = [field for field in fields if field not in data]
+    missing_fields = [field for field in required_fields if field not in data]
     
     if missing_fields:
         raise ValidationError(
@@ -105,4 +109,4 @@ def validate_publication_data(data: Dict[str, Any], platform: str) -> bool:
             {'missing_fields': missing_fields}
         )
     
-    return True
\ No newline at end of file
+    return True
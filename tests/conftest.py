@@ -0,0 +1,52 @@
+"""Shared fixtures for the test suites
+
+The suites are unittest.TestCase classes. A class opts into a fixture with
+``@pytest.mark.usefixtures(...)`` and the fixture sets the matching attribute
+(``self.test_dir``, ``self.tracker``, ...) before ``setUp`` runs.
+"""
+import pytest
+from scripts.post_tracker import PostTracker
+from scripts.queue_manager import PostQueue
+
+def _expose(request, **attributes):
+    """Set fixture values as attributes of the running TestCase, if any"""
+    if request.instance is not None:
+        for name, value in attributes.items():
+            setattr(request.instance, name, value)
+
+@pytest.fixture
+def scratch_dir(request, tmp_path):
+    """Empty per-test directory, as self.test_dir"""
+    _expose(request, test_dir=tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def posts_dir(request, scratch_dir):
+    """Posts directory inside the scratch directory, as self.posts_dir"""
+    path = scratch_dir / "posts"
+    path.mkdir()
+    _expose(request, posts_dir=path)
+    return path
+
+@pytest.fixture
+def write_post(request, posts_dir):
+    """Factory writing a Markdown post with front matter, as self.write_post(name, body, **metadata)"""
+    def write(name, body="Body text.", **metadata):
+        metadata.setdefault('title', name)
+        front_matter = "".join(f"{key}: {value}\n" for key, value in metadata.items())
+        path = posts_dir / name
+        path.write_text(f"---\n{front_matter}---\n\n{body}\n", encoding="utf-8")
+        return path
+
+    _expose(request, write_post=write)
+    return write
+
+@pytest.fixture
+def state(request, scratch_dir):
+    """Tracker and queue kept in the scratch directory, as self.tracker and self.queue"""
+    tracker = PostTracker(base_dir=str(scratch_dir))
+    queue = PostQueue(base_dir=str(scratch_dir))
+    _expose(request, tracker=tracker, queue=queue)
+    yield tracker, queue
+    tracker.close()
+    queue.close()
@@ -0,0 +1,64 @@
+"""In-memory publishers standing in for the platform APIs"""
+import threading
+import time
+from scripts.utils.exceptions import AuthenticationError
+
+class FakePublisher:
+    """In-memory publisher recording peak concurrency"""
+    def __init__(self, name, delay=0.05):
+        self.name = name
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def publish(self, content):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return {'url': f"https://{self.name}/{content['original_file']}", 'id': content['original_file']}
+
+    def extract_reference(self, result):
+        return result.get('url'), result.get('id')
+
+    def close(self):
+        pass
+
+class LookupPublisher(FakePublisher):
+    """Fake publisher that remembers its posts and can look them up by title"""
+    supports_lookup = True
+
+    def __init__(self, name, delay=0):
+        super().__init__(name, delay)
+        self.posts = {}
+
+    def publish(self, content):
+        result = super().publish(content)
+        self.posts[content['metadata']['title']] = result
+        return result
+
+    def find_existing(self, title):
+        return self.posts.get(title)
+
+class FailingPublisher(FakePublisher):
+    """Fake publisher whose publications are always rejected"""
+    def publish(self, content):
+        raise AuthenticationError(self.name)
+
+class UploadingPublisher(FakePublisher):
+    """Fake publisher hosting uploaded images"""
+    def __init__(self, name, delay=0):
+        super().__init__(name, delay)
+        self.uploads = []
+        self.published = []
+
+    def upload_image(self, image_path):
+        self.uploads.append(image_path.name)
+        return f"https://cdn.{self.name}/{image_path.name}"
+
+    def publish(self, content):
+        self.published.append(content)
+        return super().publish(content)
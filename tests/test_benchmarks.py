@@ -0,0 +1,69 @@
+import unittest
+import shutil
+import pytest
+from scripts.benchmarks.corpus import generate_corpus
+from scripts.benchmarks.suite import BENCHMARKS, compare_reports, run_benchmark, stub_publishers
+from scripts.convert_markdown import MarkdownConverter
+from scripts.post_tracker import PostTracker
+from scripts.publisher_registry import PUBLISHER_CLASSES, load_publisher_class
+
+@pytest.mark.usefixtures("scratch_dir")
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        """Set up a small synthetic corpus"""
+        self.files = generate_corpus(self.test_dir / "posts", 4, seed=7, image_count=2)
+
+    def test_corpus_is_reproducible(self):
+        """Test generated posts are deterministic and convert cleanly"""
+        texts = [path.read_text(encoding="utf-8") for path in self.files]
+        shutil.rmtree(self.test_dir / "posts")
+        regenerated = generate_corpus(self.test_dir / "posts", 4, seed=7, image_count=2)
+        self.assertEqual([path.read_text(encoding="utf-8") for path in regenerated], texts)
+        self.assertTrue((self.test_dir / "posts" / "images" / "figure-1.png").exists())
+
+        converter = MarkdownConverter(str(self.test_dir / "posts"), str(self.test_dir / "dist"), use_cache=False)
+        posts = converter.convert(workers=1)
+        self.assertEqual(len(posts), 4)
+        self.assertEqual(converter.errors, {})
+
+    def test_corpus_only_touches_generated_files(self):
+        """Test regeneration keeps foreign files and unknown directories are refused"""
+        (self.test_dir / "posts" / "notes.md").write_text("mine", encoding="utf-8")
+        generate_corpus(self.test_dir / "posts", 2, seed=8, image_count=0)
+        self.assertTrue((self.test_dir / "posts" / "notes.md").exists())
+        self.assertFalse((self.test_dir / "posts" / "post-00003.md").exists())
+
+        real_posts = self.test_dir / "real"
+        real_posts.mkdir()
+        (real_posts / "draft.md").write_text("draft", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            generate_corpus(real_posts, 2)
+        self.assertEqual([path.name for path in real_posts.iterdir()], ["draft.md"])
+
+    def test_publish_benchmark_uses_stub_publishers(self):
+        """Test the full publish benchmark publishes everything and restores the registry"""
+        result = run_benchmark(BENCHMARKS['publish'], self.files, self.test_dir / "workspace", repeat=1)
+        self.assertEqual(len(result['runs']), 1)
+        tracker = PostTracker(base_dir=str(self.test_dir / "workspace"))
+        self.assertEqual(tracker.get_unpublished_files({path.name for path in self.files}, ['medium', 'devto']),
+                         {'medium': set(), 'devto': set()})
+        self.assertNotIn('medium', PUBLISHER_CLASSES)
+        with stub_publishers():
+            self.assertEqual(load_publisher_class('devto').__name__, 'StubDevToPublisher')
+        self.assertEqual(load_publisher_class('devto').__name__, 'DevToPublisher')
+
+    def test_compare_reports(self):
+        """Test regressions, improvements and noise are told apart"""
+        def report(**medians):
+            return {'tiers': {'1k': {'benchmarks': {name: {'median': value} for name, value in medians.items()}}}}
+
+        rows = compare_reports(
+            report(convert=1.0, queue_add=0.5, queue_ready=0.0001, dropped=1.0),
+            report(convert=1.5, queue_add=0.2, queue_ready=0.0005, added=1.0),
+            threshold=0.2, min_delta=0.001
+        )
+        status = {row['benchmark']: row['status'] for row in rows}
+        self.assertEqual(status, {
+            'convert': 'regression', 'queue_add': 'improvement', 'queue_ready': 'unchanged',
+            'added': 'new', 'dropped': 'missing'
+        })
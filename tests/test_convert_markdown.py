@@ -0,0 +1,151 @@
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from scripts.convert_markdown import MarkdownConverter, available_renderers, get_renderer, normalize_html
+from scripts.compare_renderers import compare_renderers, load_corpus, pick_fastest_compatible
+from scripts.publish_devto import DevToPublisher
+
+@pytest.mark.usefixtures("write_post")
+class TestMarkdownConverter(unittest.TestCase):
+    def setUp(self):
+        """Set up a small post and a converter writing to the scratch directory"""
+        self.post_file = self.write_post("cached_post.md", "# Hello", title="Cached",
+                                         description="Cache test", tags="a, b")
+        self.converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"))
+
+    def test_cache_hit_skips_parsing(self):
+        """Test unchanged files are served from the conversion cache"""
+        first = self.converter.convert_single_file(self.post_file)
+
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"))
+        with patch("scripts.convert_markdown.frontmatter.load") as mock_load:
+            second = converter.convert_single_file(self.post_file)
+            mock_load.assert_not_called()
+
+        self.assertEqual(first, second)
+
+    def test_cache_invalidated_on_change(self):
+        """Test modified files are converted again"""
+        self.converter.convert_single_file(self.post_file)
+        self.post_file.write_text(
+            "---\ntitle: Changed\ndescription: Cache test\n---\n\nNew body\n",
+            encoding="utf-8"
+        )
+
+        converted = self.converter.convert_single_file(self.post_file)
+        self.assertEqual(converted["metadata"]["title"], "Changed")
+
+    def test_markdown_only_conversion_skips_rendering(self):
+        """Test HTML is rendered only when a platform asks for it"""
+        with patch.object(self.converter.renderer, "render") as mock_render:
+            converted = self.converter.convert_single_file(self.post_file, formats=["markdown"])
+            mock_render.assert_not_called()
+        self.assertEqual(converted["markdown"].strip(), "# Hello")
+        self.assertNotIn("content", converted)
+
+        # A cached markdown-only conversion is completed when HTML is needed later
+        converted = self.converter.convert_single_file(self.post_file, formats=["html", "markdown"])
+        self.assertIn("<h1>Hello</h1>", converted["content"])
+
+    def test_devto_receives_raw_markdown(self):
+        """Test Dev.to gets the Markdown body and metadata fields, not HTML behind front matter"""
+        converted = self.converter.convert_single_file(self.post_file, formats=["markdown"])
+        converted["metadata"]["title"] = "Cached: a title with a colon"
+        publisher = DevToPublisher("key")
+        try:
+            article = publisher._prepare_content(converted)["article"]
+        finally:
+            publisher.close()
+
+        self.assertEqual(article["body_markdown"], converted["markdown"])
+        self.assertEqual(article["title"], "Cached: a title with a colon")
+        self.assertEqual(article["description"], "Cache test")
+        self.assertEqual(article["tags"], ["a", "b"])
+
+    def test_convert_many_in_worker_processes(self):
+        """Test batch conversion yields every post and collects per-file errors"""
+        for i in range(5):
+            self.write_post(f"batch{i}.md", f"Body {i}", title=f"Batch {i}", description="Pool test")
+        self.write_post("broken.md", "Body", title="Broken")
+
+        converted = list(self.converter.convert_many(workers=2, chunk_size=2))
+
+        self.assertEqual(
+            sorted(post["original_file"] for post in converted),
+            ["batch0.md", "batch1.md", "batch2.md", "batch3.md", "batch4.md", "cached_post.md"]
+        )
+        self.assertEqual(list(self.converter.errors), [str(self.posts_dir / "broken.md")])
+        self.assertTrue((self.test_dir / "dist" / "batch3.json").exists())
+
+        # Conversions done by workers are cached by the parent
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"))
+        with patch("scripts.convert_markdown.ProcessPoolExecutor") as mock_pool:
+            again = list(converter.convert_many(
+                [self.posts_dir / f"batch{i}.md" for i in range(5)], workers=2
+            ))
+            mock_pool.assert_not_called()
+        self.assertEqual(len(again), 5)
+
+FEATURE_MARKDOWN = """Some ~~struck~~ *and* **bold** text.
+
+```python
+print("hi")
+```
+
+| Left | Right |
+|:-----|------:|
+| 1    | 2     |
+
+- [ ] todo
+- [x] done
+"""
+
+class TestMarkdownRenderers(unittest.TestCase):
+    def test_backends_render_features_equivalently(self):
+        """Test every installed backend renders the features posts rely on the same way"""
+        for name in available_renderers():
+            with self.subTest(renderer=name):
+                html = normalize_html(get_renderer(name).render(FEATURE_MARKDOWN))
+                self.assertIn('<del>struck</del> <em>and</em> <strong>bold</strong>', html)
+                self.assertIn('<pre><code class="language-python">print("hi")', html)
+                self.assertIn('<th style="text-align: left">Left</th>', html)
+                self.assertIn('<td style="text-align: right">2</td>', html)
+                self.assertIn('<input type="checkbox" disabled> todo', html)
+                self.assertIn('<input type="checkbox" disabled checked> done', html)
+
+    def test_default_renderer_output(self):
+        """Test the default backend's code block and task list markup, which changed from the Pygments/text form"""
+        html = normalize_html(get_renderer('markdown2').render(FEATURE_MARKDOWN))
+        self.assertNotIn('codehilite', html)
+        self.assertNotIn('<span', html)
+        self.assertNotIn('[x]', html)
+        self.assertIn('<pre><code class="language-python">print("hi")\n</code></pre>', html)
+        self.assertIn('<li><input type="checkbox" disabled checked> done</li>', html)
+
+    def test_normalize_html_unifies_backend_markup(self):
+        """Test markup variants from different backends normalize to one form"""
+        variants = [
+            '<p><s>x</s><br /></p>\n\n<pre><code class="python language-python">a\n\n</code></pre>',
+            '<p><strike>x</strike><br/></p>\n<pre><code class="language-python">a\n\n</code></pre>\n',
+        ]
+        self.assertEqual({normalize_html(v) for v in variants},
+                         {'<p><del>x</del><br></p>\n<pre><code class="language-python">a\n\n</code></pre>'})
+
+        task_item = ('<ul class="contains-task-list">\n<li class="task-list-item">'
+                     '<input class="task-list-item-checkbox" checked="checked" disabled="disabled" type="checkbox"> done</li>\n</ul>')
+        self.assertEqual(normalize_html(task_item), '<ul>\n<li><input type="checkbox" disabled checked> done</li>\n</ul>')
+
+    def test_unknown_renderer_rejected(self):
+        """Test configuring a missing backend fails clearly"""
+        with self.assertRaises(ValueError):
+            get_renderer('no-such-renderer')
+
+    def test_compare_posts_corpus(self):
+        """Test the comparison reports throughput and no diffs against itself"""
+        corpus = load_corpus(Path('posts'))
+        results = compare_renderers(corpus, ['markdown2'], 'markdown2', repeat=1)
+
+        self.assertEqual(results['markdown2']['mismatches'], [])
+        self.assertGreater(results['markdown2']['posts_per_second'], 0)
+        self.assertEqual(pick_fastest_compatible(results), 'markdown2')
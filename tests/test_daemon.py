@@ -0,0 +1,117 @@
+import unittest
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
+import pytest
+from scripts.config.settings import Settings
+from scripts.daemon import PublisherDaemon
+from .publishers import FailingPublisher, FakePublisher, LookupPublisher
+
+@pytest.mark.usefixtures("state", "write_post")
+class TestPublisherDaemon(unittest.TestCase):
+    def setUp(self):
+        """Set up a daemon watching the scratch posts directory"""
+        self.publishers = {'medium': FakePublisher('medium', delay=0), 'devto': FakePublisher('devto', delay=0)}
+        self.daemon = PublisherDaemon(
+            self.tracker, self.queue, self.publishers,
+            markdown_dir=str(self.posts_dir), output_dir=str(self.test_dir / "dist"),
+            poll_interval=60, retry_interval=60
+        )
+
+    def add_post(self, name):
+        self.write_post(name, f"# {name}\n\nBody text.", description="Daemon test", tags="[python]")
+
+    def make_due(self, name):
+        past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+        self.queue.add_to_queue(name, list(self.queue.queued_posts[name]['platforms']), past)
+
+    def test_new_post_is_queued_then_published_when_due(self):
+        """Test posts are picked up from the directory and published once their slot arrives"""
+        self.add_post("daemon.md")
+
+        stats = self.daemon.run_once()
+        self.assertEqual((stats['queued'], stats['dispatched']), (1, 0))
+        self.assertGreater(self.daemon.seconds_until_next_wake(), 0)
+
+        self.make_due("daemon.md")
+        self.assertEqual(self.daemon.seconds_until_next_wake(), 0)
+        stats = self.daemon.run_once()
+
+        self.assertEqual(stats['published'], 2)
+        self.assertEqual(self.tracker.check_platform_status("daemon.md"), {"medium": True, "devto": True})
+        self.assertEqual(self.queue.queued_posts["daemon.md"]["status"], "completed")
+
+    def test_failed_post_waits_for_retry_interval(self):
+        """Test a failed post is not dispatched again until its retry time"""
+        self.publishers['devto'] = FailingPublisher('devto')
+        self.add_post("flaky.md")
+        self.daemon.run_once()
+        self.make_due("flaky.md")
+
+        stats = self.daemon.run_once()
+        self.assertEqual((stats['published'], stats['failed']), (1, 1))
+        self.assertEqual(self.queue.queued_posts["flaky.md"]["platforms"], ["devto"])
+        self.assertEqual(self.daemon.run_once()['dispatched'], 0)
+
+        # Once the retry time passes the post is claimed again, for devto only
+        self.daemon._retry_at["flaky.md"] = time.monotonic() - 1
+        self.publishers['devto'] = FakePublisher('devto', delay=0)
+        stats = self.daemon.run_once()
+        self.assertEqual((stats['dispatched'], stats['published']), (1, 1))
+
+    def test_platforms_published_elsewhere_are_settled(self):
+        """Test platforms published outside the daemon are completed without publishing again"""
+        self.add_post("cron.md")
+        self.daemon.run_once()
+        self.tracker.mark_platform_published("cron.md", "medium", "https://medium.com/p/cron", "cron")
+        self.make_due("cron.md")
+
+        stats = self.daemon.run_once()
+        self.assertEqual(stats['published'], 1)
+        medium = self.tracker.published_posts["cron.md"]["platforms"]["medium"]
+        self.assertEqual(medium["url"], "https://medium.com/p/cron")
+        self.assertEqual(self.queue.queued_posts["cron.md"]["status"], "completed")
+
+    def test_pending_post_is_held_not_retried(self):
+        """Test a post left with only pending publications stays claimed instead of being retried"""
+        self.add_post("pending.md")
+        self.daemon.run_once()
+        self.tracker.mark_platform_published("pending.md", "medium", "https://medium.com/p/pending", "pending")
+        self.tracker.mark_pending("pending.md", "devto", "pending.md")
+        self.make_due("pending.md")
+
+        stats = self.daemon.run_once()
+        self.assertEqual((stats['dispatched'], stats['published']), (1, 0))
+        self.assertEqual(self.queue.queued_posts["pending.md"]["platforms"], ["devto"])
+        self.assertNotIn("pending.md", self.daemon._retry_at)
+        self.assertEqual(self.daemon.run_once()['dispatched'], 0)
+
+    def test_housekeeping_releases_reconciled_posts(self):
+        """Test a held post is dispatched again once housekeeping reconciles its pending publication"""
+        self.add_post("held.md")
+        self.daemon.run_once()
+        self.tracker.mark_platform_published("held.md", "medium", "https://medium.com/p/held", "held")
+        self.tracker.mark_pending("held.md", "devto", "held.md")
+        self.make_due("held.md")
+        self.daemon.run_once()
+        self.assertIn("held.md", self.daemon._held)
+
+        # devto can now be searched and has no such post, so the intent is cleared
+        self.publishers['devto'] = LookupPublisher('devto')
+        self.daemon._last_housekeeping = time.monotonic() - self.daemon.housekeeping_interval
+        with patch.object(Settings, 'METRICS_DIR', self.test_dir / "metrics"):
+            stats = self.daemon.run_once()
+
+        self.assertEqual(stats['published'], 1)
+        self.assertEqual(self.daemon._held, set())
+        self.assertEqual(self.queue.queued_posts["held.md"]["status"], "completed")
+        self.assertTrue((self.test_dir / "metrics" / "daemon.json").exists())
+
+    def test_run_stops_on_request(self):
+        """Test the loop exits promptly when stopped"""
+        thread = threading.Thread(target=self.daemon.run)
+        thread.start()
+        self.daemon.stop()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
@@ -0,0 +1,84 @@
+import unittest
+import random
+import pytest
+import requests
+from scripts.benchmarks.fake_api import FakeApiConfig, FakeApiServer, LatencyModel
+from scripts.benchmarks.suite import override_settings
+from scripts.publish_devto import DevToPublisher
+from scripts.publish_engine import PublishEngine
+from scripts.publish_medium import MediumPublisher
+from scripts.utils.retry import RetryPolicy
+
+@pytest.mark.usefixtures("state")
+class TestFakeApi(unittest.TestCase):
+    def setUp(self):
+        """Set up a post to publish"""
+        self.content = {
+            'original_file': "fake.md", 'content': "<p>Hi</p>", 'markdown': "Hi",
+            'metadata': {'title': "Fake", 'description': "Fake API", 'tags': ["test"]}
+        }
+
+    def test_publishers_use_configured_base_urls(self):
+        """Test the real publishers reach the fake API through the Settings base URLs"""
+        with FakeApiServer() as server, override_settings(**server.settings()):
+            with MediumPublisher('token') as medium, DevToPublisher('key') as devto:
+                self.assertEqual(medium.api_base, server.medium_base)
+                medium_url, _ = medium.extract_reference(medium.publish(self.content))
+                devto.publish(self.content)
+                self.assertEqual(devto.find_existing("Fake")['title'], "Fake")
+            self.assertTrue(medium_url.startswith(server.url))
+            self.assertEqual(server.count(method='GET', path='/medium/v1/me'), 1)
+            self.assertEqual(len(server.posts['devto']), 1)
+
+    def test_engine_retries_through_error_burst(self):
+        """Test a burst of 503s is retried until the post goes through"""
+        with FakeApiServer() as server:
+            publisher = DevToPublisher('key', api_base=server.devto_base)
+            engine = PublishEngine({'devto': publisher}, self.tracker, self.queue,
+                                   retry_policy=RetryPolicy(max_retries=3, base_delay=0.01))
+            server.start_error_burst(2)
+            engine.submit("fake.md", self.content, ['devto'])
+            self.assertEqual(engine.wait(), {'published': 1, 'failed': 0})
+            publisher.close()
+            self.assertEqual(server.count(status=503), 2)
+            self.assertEqual(server.count(status=201), 1)
+            self.assertTrue(self.tracker.check_platform_status("fake.md", ['devto'])['devto'])
+
+    def test_quota_and_rate_limit_headers(self):
+        """Test per-key quotas and random 429s carry the headers the rate limiter reads"""
+        with FakeApiServer(FakeApiConfig(quota=2, quota_window=30)) as server, requests.Session() as session:
+            statuses = [
+                session.get(f"{server.medium_base}/me", headers={'Authorization': "Bearer a"}).status_code
+                for _ in range(3)
+            ]
+            other = session.get(f"{server.medium_base}/me", headers={'Authorization': "Bearer b"})
+            limited = session.get(f"{server.medium_base}/me", headers={'Authorization': "Bearer a"})
+        self.assertEqual(statuses, [200, 200, 429])
+        self.assertEqual(other.status_code, 200)
+        self.assertEqual(limited.headers['X-RateLimit-Remaining'], '0')
+        self.assertLessEqual(int(limited.headers['Retry-After']), 30)
+
+        with FakeApiServer(FakeApiConfig(rate_limit_probability=1.0, retry_after=7)) as server:
+            response = requests.post(f"{server.devto_base}/articles", json={}, headers={'api-key': "k"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '7')
+
+    def test_timeouts_and_auth(self):
+        """Test held requests time out on the client and missing credentials are rejected"""
+        with FakeApiServer(FakeApiConfig(timeout_probability=1.0, hang_seconds=5)) as server:
+            with self.assertRaises(requests.Timeout):
+                requests.get(f"{server.medium_base}/me", headers={'Authorization': "Bearer a"}, timeout=0.2)
+        with FakeApiServer() as server:
+            self.assertEqual(requests.get(f"{server.medium_base}/me").status_code, 401)
+
+    def test_latency_models(self):
+        """Test latency distributions keep their mean and bounds"""
+        rng = random.Random(1)
+        for spec in ("0.05", "uniform:0.05:0.5", "exponential:0.05", "lognormal:0.05:0.8"):
+            model = LatencyModel.parse(spec)
+            samples = [model.sample(rng) for _ in range(4000)]
+            self.assertAlmostEqual(sum(samples) / len(samples), 0.05, delta=0.01, msg=spec)
+        capped = LatencyModel('exponential', 1.0, max_delay=0.5)
+        self.assertLessEqual(max(capped.sample(rng) for _ in range(100)), 0.5)
+        with self.assertRaises(ValueError):
+            LatencyModel('pareto', 1.0)
@@ -0,0 +1,131 @@
+import unittest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+import pytest
+from scripts.convert_markdown import MarkdownConverter
+from scripts.images import (
+    ImageOptimizer, ImageUploadCache, find_image_references, resolve_images, rewrite_image_urls
+)
+from scripts.publish_engine import PublishEngine
+from scripts.publish_medium import MediumPublisher
+from scripts.utils.exceptions import PublishError
+from scripts.utils.retry import RetryPolicy
+from .publishers import UploadingPublisher
+
+@pytest.mark.usefixtures("state", "write_post")
+class TestImagePipeline(unittest.TestCase):
+    def setUp(self):
+        """Set up a post referencing a local image"""
+        from PIL import Image
+        (self.posts_dir / "img").mkdir()
+        self.image_file = self.posts_dir / "img" / "photo.png"
+        Image.new("RGB", (800, 400), (200, 40, 40)).save(self.image_file)
+        self.post_file = self.write_post(
+            "images_post.md",
+            "![Photo](./img/photo.png \"A photo\")\n\n![Remote](https://example.com/a.png)",
+            title="Images", description="Image test"
+        )
+
+    def test_find_and_rewrite_references(self):
+        """Test only local references are found and rewritten in Markdown and HTML"""
+        text = '![a](./img/a.png "t") ![b](https://x.org/b.png) <img alt="c" src="img/c.jpg">'
+        self.assertEqual(find_image_references(text), ['./img/a.png', 'img/c.jpg'])
+
+        rewritten = rewrite_image_urls(text, {'./img/a.png': 'https://cdn/a', 'img/c.jpg': 'https://cdn/c'})
+        self.assertEqual(rewritten, '![a](https://cdn/a "t") ![b](https://x.org/b.png) <img alt="c" src="https://cdn/c">')
+
+    def test_optimizer_resizes_and_reuses_output(self):
+        """Test large images are scaled down once and then served from disk"""
+        from PIL import Image
+        optimizer = ImageOptimizer(self.test_dir / "out", max_width=200, output_format='original')
+        output = optimizer.optimize(self.image_file)
+        with Image.open(output) as image:
+            self.assertEqual(image.size, (200, 100))
+
+        with patch("scripts.images.Image.open") as mock_open_image:
+            self.assertEqual(optimizer.optimize(self.image_file), output)
+            mock_open_image.assert_not_called()
+
+        # Different settings produce a different content address
+        other = ImageOptimizer(self.test_dir / "out", max_width=300, output_format='original')
+        self.assertNotEqual(other.image_key(self.image_file), optimizer.image_key(self.image_file))
+
+    def test_converter_attaches_images(self):
+        """Test converted posts carry their optimized local images"""
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"), process_images=True)
+        converted = converter.convert_single_file(self.post_file)
+
+        self.assertEqual(list(converted["images"]), ["./img/photo.png"])
+        self.assertTrue(Path(converted["images"]["./img/photo.png"]["file"]).exists())
+
+    def test_upload_cache_uploads_once(self):
+        """Test each optimized image is uploaded once per platform, across runs"""
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"), process_images=True)
+        converted = converter.convert_single_file(self.post_file)
+        publisher = UploadingPublisher('medium')
+
+        first = resolve_images(converted, 'medium', publisher, ImageUploadCache(str(self.test_dir)))
+        second = resolve_images(converted, 'medium', publisher, ImageUploadCache(str(self.test_dir)))
+
+        self.assertEqual(len(publisher.uploads), 1)
+        self.assertEqual(first["markdown"], second["markdown"])
+        self.assertIn("https://cdn.medium/", first["content"])
+        self.assertIn("https://example.com/a.png", first["content"])
+        self.assertNotIn("./img/photo.png", first["markdown"])
+
+    def test_engine_publishes_resolved_images(self):
+        """Test the engine hands publishers posts with hosted image URLs"""
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"), process_images=True)
+        converted = converter.convert_single_file(self.post_file)
+        publisher = UploadingPublisher('medium')
+        engine = PublishEngine({'medium': publisher}, self.tracker, self.queue,
+                               image_cache=ImageUploadCache(str(self.test_dir)))
+        engine.submit("images_post.md", converted, ['medium'])
+
+        self.assertEqual(engine.wait(), {'published': 1, 'failed': 0})
+        self.assertIn("https://cdn.medium/", publisher.published[0]["content"])
+
+    def engine_for(self, publisher):
+        return PublishEngine({'medium': publisher}, self.tracker, self.queue,
+                             image_cache=ImageUploadCache(str(self.test_dir)),
+                             retry_policy=RetryPolicy(max_retries=1, base_delay=0.01))
+
+    def test_unexpected_upload_result_clears_pending(self):
+        """Test an upload_image returning garbage fails the post without leaving it pending"""
+        class EmptyUploadPublisher(UploadingPublisher):
+            def upload_image(self, image_path):
+                return {}
+
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"), process_images=True)
+        publisher = EmptyUploadPublisher('medium')
+        engine = self.engine_for(publisher)
+        engine.submit("images_post.md", converter.convert_single_file(self.post_file), ['medium'])
+
+        self.assertEqual(engine.wait(), {'published': 0, 'failed': 1})
+        self.assertEqual(publisher.published, [])
+        self.assertEqual(self.tracker.get_pending(), [])
+        self.assertEqual(self.tracker.get_unpublished_files({"images_post.md"}, ['medium'])['medium'], {"images_post.md"})
+
+    def test_malformed_medium_upload_response(self):
+        """Test an upload response without a URL is a PublishError and the post stays publishable"""
+        response = MagicMock(status_code=201, text="{}")
+        response.json.return_value = {}
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"), process_images=True)
+        publisher = MediumPublisher('token')
+        with patch.object(publisher, '_request', return_value=response):
+            with self.assertRaises(PublishError):
+                publisher.upload_image(self.image_file)
+
+            engine = self.engine_for(publisher)
+            engine.submit("images_post.md", converter.convert_single_file(self.post_file), ['medium'])
+            self.assertEqual(engine.wait(), {'published': 0, 'failed': 1})
+        publisher.close()
+        self.assertEqual(self.tracker.get_pending(), [])
+
+    def test_upload_cache_write_failure_is_not_fatal(self):
+        """Test an unwritable upload cache still returns the uploaded URL"""
+        cache = ImageUploadCache(str(self.test_dir))
+        with patch("scripts.images.write_json_atomic", side_effect=OSError("read-only")):
+            url = cache.get_or_upload('medium', 'key', lambda: "https://cdn.medium/key.png")
+        self.assertEqual(url, "https://cdn.medium/key.png")
+        self.assertEqual(cache.get_or_upload('medium', 'key', lambda: "unused"), url)
@@ -0,0 +1,74 @@
+import unittest
+import json
+import pytest
+from scripts.convert_markdown import MarkdownConverter
+from scripts.utils.metrics import Histogram, MetricsRegistry, metrics
+
+@pytest.mark.usefixtures("write_post")
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        """Start from a clean process-wide registry"""
+        metrics.reset()
+
+    def tearDown(self):
+        """Leave a clean registry for other tests"""
+        metrics.reset()
+
+    def test_histogram_quantiles_and_merge(self):
+        """Test quantile estimates stay within the observed range and merging adds samples"""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.2, 0.3, 0.4, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 3, 1])
+        self.assertTrue(0.1 <= histogram.quantile(0.5) <= 1.0)
+        self.assertEqual(histogram.quantile(1.0), 2.0)
+
+        other = Histogram(buckets=(0.1, 1.0))
+        other.observe(0.01)
+        histogram.merge(other.to_dict())
+        self.assertEqual((histogram.count, histogram.min), (6, 0.01))
+
+    def test_timer_records_outcome(self):
+        """Test stage timers record successful and failed executions separately"""
+        registry = MetricsRegistry()
+        with registry.timer('render'):
+            pass
+        with self.assertRaises(ValueError):
+            with registry.timer('render'):
+                raise ValueError("boom")
+
+        series = registry.report('test')['histograms']['stage_seconds']
+        outcomes = {entry['labels']['outcome']: entry['value']['count'] for entry in series}
+        self.assertEqual(outcomes, {'ok': 1, 'error': 1})
+
+    def test_prometheus_textfile_and_report(self):
+        """Test the run report and textfile are written with cumulative buckets"""
+        registry = MetricsRegistry()
+        registry.inc('publications', platform='medium', outcome='published')
+        registry.set_gauge('queue_size', 3, status='queued')
+        registry.observe('http_request_seconds', 0.02, platform='medium', method='POST', status='201')
+        registry.observe('http_request_seconds', 5.0, platform='medium', method='POST', status='201')
+
+        report_file, prom_file = registry.write('publish_posts', self.test_dir)
+        report = json.loads(report_file.read_text())
+        self.assertEqual(report['run'], 'publish_posts')
+        self.assertEqual(report['counters']['publications'][0]['value'], 1)
+
+        text = prom_file.read_text()
+        self.assertIn('blog_automation_publications_total{outcome="published",platform="medium",run="publish_posts"} 1', text)
+        self.assertIn('blog_automation_queue_size{status="queued",run="publish_posts"} 3', text)
+        self.assertIn('le="+Inf",run="publish_posts"} 2', text)
+        self.assertIn('le="0.025",run="publish_posts"} 1', text)
+        self.assertEqual(len(list(self.test_dir.glob('publish_posts-*.json'))), 1)
+
+    def test_worker_metrics_merged(self):
+        """Test stage timings recorded in conversion worker processes reach the parent"""
+        for i in range(4):
+            self.write_post(f"m{i}.md", f"Body {i}", title=f"M {i}", description="Metrics")
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"), use_cache=False)
+        self.assertEqual(len(list(converter.convert_many(workers=2, chunk_size=2))), 4)
+
+        series = metrics.report('test')['histograms']['stage_seconds']
+        parsed = sum(entry['value']['count'] for entry in series if entry['labels']['stage'] == 'parse')
+        self.assertEqual(parsed, 4)
+        self.assertEqual(metrics.report('test')['counters']['posts'][0]['value'], 4)
@@ -0,0 +1,105 @@
+import unittest
+import json
+import pstats
+import sys
+import threading
+from unittest.mock import patch
+import pytest
+from scripts.benchmarks.corpus import generate_corpus
+from scripts.benchmarks.suite import publish_environment, stub_publishers
+from scripts.post_tracker import PostTracker
+from scripts.publish_posts import main as publish_main, parse_args as parse_publish_args
+from scripts.queue_posts import parse_args as parse_queue_args
+from scripts.utils import profiling
+from scripts.utils.profiling import RunProfiler, library_of, profile_stage, profiling_active
+
+@pytest.mark.usefixtures("scratch_dir")
+class TestProfiling(unittest.TestCase):
+    def test_profile_covers_threads_and_stages(self):
+        """Test worker threads are merged into the pstats file and stage allocations are reported"""
+        def worker_task():
+            return json.dumps({'items': list(range(100))}, indent=2)
+
+        with RunProfiler('unit', self.test_dir, top_n=5) as profiler:
+            self.assertTrue(profiling_active())
+            with profile_stage('build'):
+                retained = [str(i) * 10 for i in range(2000)]
+            worker = threading.Thread(target=worker_task)
+            worker.start()
+            worker.join()
+        self.assertFalse(profiling_active())
+
+        stats = pstats.Stats(str(profiler.files['pstats']))
+        self.assertIn('worker_task', {function for (_, _, function) in stats.stats})
+        self.assertGreater(profiler.stages['build']['size_diff'], 0)
+        self.assertLessEqual(len(profiler.stages['build']['top']), 5)
+        report = profiler.files['report'].read_text(encoding='utf-8')
+        self.assertIn("Self time by library", report)
+        self.assertIn("build:", report)
+        self.assertTrue(retained)
+
+    def test_profile_publish_through_engine(self):
+        """Test publish_posts --profile completes with the engine's worker threads profiled"""
+        workspace = self.test_dir / "workspace"
+        files = generate_corpus(workspace / "posts", 3, seed=3, image_count=1)
+        done = threading.Event()
+
+        def run():
+            with stub_publishers(), publish_environment(files, workspace, LOG_DIR=workspace / "logs"):
+                publish_main(['--profile'])
+            done.set()
+
+        runner = threading.Thread(target=run, daemon=True)
+        runner.start()
+        runner.join(timeout=60)
+        self.assertTrue(done.is_set(), "profiled publish run did not finish")
+
+        stats = pstats.Stats(*(str(path) for path in (workspace / "logs").glob("publish_posts-*.pstats")))
+        # Publisher API calls only happen on the engine's pool threads
+        self.assertIn('_request', {function for (_, _, function) in stats.stats})
+        tracker = PostTracker(base_dir=str(workspace))
+        self.assertEqual(tracker.get_unpublished_files({path.name for path in files}, ['medium', 'devto']),
+                         {'medium': set(), 'devto': set()})
+
+    def test_thread_hook_failure_keeps_thread_running(self):
+        """Test a thread whose profile cannot be enabled still runs its target"""
+        profiler = RunProfiler('unit', self.test_dir)
+        results = []
+        with patch('scripts.utils.profiling.cProfile.Profile.enable',
+                   side_effect=ValueError("Another profiling tool is already active")):
+            threading.setprofile(profiler._thread_hook)
+            try:
+                worker = threading.Thread(target=lambda: results.append(sum(range(10))))
+                worker.start()
+                worker.join(timeout=5)
+            finally:
+                threading.setprofile(None)
+        self.assertEqual(results, [45])
+        self.assertEqual(profiler.profiles, [])
+
+    def test_profile_stage_inactive(self):
+        """Test profile_stage is a no-op without a running profiler"""
+        with profile_stage('ignored'):
+            pass
+        self.assertFalse(profiling_active())
+
+    def test_library_of(self):
+        """Test profiled functions are attributed to their library"""
+        self.assertEqual(library_of(json.__file__), 'json')
+        self.assertEqual(library_of(profiling.__file__), 'scripts')
+        self.assertEqual(library_of('~', "<built-in method time.sleep>"), 'time')
+        self.assertEqual(library_of('~', "<method 'acquire' of '_thread.lock' objects>"), '_thread')
+        self.assertEqual(library_of('/venv/lib/site-packages/markdown2.py'), 'markdown2')
+
+    def test_entry_points_accept_profile(self):
+        """Test both entry points expose --profile"""
+        self.assertTrue(parse_publish_args(['--profile']).profile)
+        self.assertFalse(parse_publish_args([]).profile)
+        self.assertTrue(parse_queue_args(['--profile']).profile)
+
+    def test_programmatic_main_ignores_command_line(self):
+        """Test calling main() from code does not parse the host process's flags"""
+        with patch.object(sys, 'argv', ['pytest', '-q', '--foreign-flag']), \
+                patch('scripts.publish_posts.publish') as mock_publish:
+            publish_main()
+        mock_publish.assert_called_once_with()
@@ -0,0 +1,68 @@
+import unittest
+import pytest
+from scripts.publish_engine import PublishEngine, reconcile_pending
+from scripts.utils.exceptions import RateLimitError
+from .publishers import FakePublisher, LookupPublisher
+
+@pytest.mark.usefixtures("state")
+class TestPublishEngine(unittest.TestCase):
+    def test_concurrent_publish_respects_limits(self):
+        """Test posts fan out across platforms within per-platform limits"""
+        publishers = {'medium': FakePublisher('medium'), 'devto': FakePublisher('devto')}
+        engine = PublishEngine(publishers, self.tracker, self.queue,
+                               concurrency={'medium': 2, 'devto': 3})
+
+        for i in range(6):
+            engine.submit(f"post{i}.md", {'original_file': f"post{i}.md"}, ['medium', 'devto'])
+        results = engine.wait()
+
+        self.assertEqual(results, {'published': 12, 'failed': 0})
+        self.assertLessEqual(publishers['medium'].peak, 2)
+        self.assertLessEqual(publishers['devto'].peak, 3)
+        for i in range(6):
+            self.assertEqual(self.tracker.check_platform_status(f"post{i}.md"), {"medium": True, "devto": True})
+
+    def test_rate_limited_post_is_redispatched(self):
+        """Test a 429 is waited out and the post published within the run budget"""
+        publisher = FakePublisher('devto', delay=0)
+        original_publish = publisher.publish
+        calls = []
+
+        def flaky_publish(content):
+            calls.append(content['original_file'])
+            if len(calls) == 1:
+                raise RateLimitError('devto', retry_after=0)
+            return original_publish(content)
+
+        publisher.publish = flaky_publish
+        engine = PublishEngine({'devto': publisher}, self.tracker, self.queue, time_budget=5)
+        engine.submit("limited.md", {'original_file': "limited.md"}, ['devto'])
+
+        self.assertEqual(engine.wait(), {'published': 1, 'failed': 0})
+        self.assertEqual(len(calls), 2)
+
+    def test_reconcile_recovers_published_intent(self):
+        """Test a post published before a crash is recorded instead of re-published"""
+        publisher = LookupPublisher('devto')
+        content = {'original_file': "crashed.md", 'metadata': {'title': "Crashed"}}
+        publisher.publish(content)
+        self.tracker.mark_pending("crashed.md", "devto", "Crashed")
+        self.tracker.mark_pending("lost.md", "devto", "Lost")
+        self.tracker.mark_pending("unknown.md", "medium", "Unknown")
+
+        stats = reconcile_pending(self.tracker, {'devto': publisher, 'medium': FakePublisher('medium')})
+
+        self.assertEqual(stats, {'recovered': 1, 'cleared': 1, 'unresolved': 1})
+        self.assertEqual(self.tracker.check_platform_status("crashed.md"), {"medium": False, "devto": True})
+        self.assertNotIn("lost.md", self.tracker.published_posts)
+        needs = self.tracker.get_unpublished_files({"unknown.md"})
+        self.assertNotIn("unknown.md", needs['medium'])
+
+    def test_pending_cleared_after_publish(self):
+        """Test the publish intent is resolved once the platform confirms"""
+        publisher = LookupPublisher('devto')
+        engine = PublishEngine({'devto': publisher}, self.tracker, self.queue)
+        engine.submit("fresh.md", {'original_file': "fresh.md", 'metadata': {'title': "Fresh"}}, ['devto'])
+
+        self.assertEqual(engine.wait(), {'published': 1, 'failed': 0})
+        self.assertEqual(self.tracker.get_pending(), [])
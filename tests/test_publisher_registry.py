@@ -0,0 +1,160 @@
+import unittest
+import subprocess
+import sys
+from unittest.mock import patch, MagicMock
+import pytest
+from scripts.account_cache import AccountCache
+from scripts.base_publisher import BasePublisher
+from scripts.config.settings import Settings
+from scripts.publish_devto import DevToPublisher
+from scripts.publish_engine import PublishEngine
+from scripts.publish_medium import MediumPublisher
+from scripts.publisher_registry import PublisherRegistry, load_publisher_class, register_publisher
+from scripts.queue_posts import plan_enqueue
+from scripts.utils.exceptions import ValidationError
+from .publishers import FakePublisher
+
+@pytest.mark.usefixtures("scratch_dir")
+class TestPublisherRegistry(unittest.TestCase):
+    def test_publishers_created_on_first_use(self):
+        """Test only platforms that are accessed get a publisher"""
+        def fake_class(platform):
+            class Fake(FakePublisher):
+                @classmethod
+                def from_settings(cls, account_cache=None):
+                    return cls(platform, delay=0)
+            return Fake
+
+        with patch("scripts.publisher_registry.load_publisher_class", side_effect=fake_class) as mock_load:
+            registry = PublisherRegistry(base_dir=str(self.test_dir))
+            self.assertEqual(list(registry), ['medium', 'devto'])
+            self.assertIn('medium', registry)
+            self.assertEqual(registry.loaded(), [])
+
+            self.assertIs(registry['devto'], registry['devto'])
+            self.assertEqual(registry.loaded(), ['devto'])
+            mock_load.assert_called_once_with('devto')
+            registry.close()
+            self.assertEqual(registry.loaded(), [])
+
+    def test_load_publisher_class(self):
+        """Test registered classes are imported on demand and unknown platforms rejected"""
+        self.assertIs(load_publisher_class('medium'), MediumPublisher)
+        self.assertIs(load_publisher_class('devto'), DevToPublisher)
+        with self.assertRaises(ValueError):
+            load_publisher_class('nowhere')
+
+    def test_package_import_is_lazy(self):
+        """Test importing one module leaves the publisher modules unloaded until requested"""
+        code = (
+            "import sys, scripts.post_tracker, scripts\n"
+            "loaded = [m for m in ('scripts.publish_medium', 'scripts.publish_devto') if m in sys.modules]\n"
+            "assert not loaded, loaded\n"
+            "assert scripts.MediumPublisher.__name__ == 'MediumPublisher'\n"
+            "assert 'scripts.publish_medium' in sys.modules\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_account_cache_ttl_and_token_scope(self):
+        """Test cached values expire and are scoped to the credential"""
+        cache = AccountCache(str(self.test_dir), ttl=3600)
+        cache.set('medium', 'token-a', 'user_id', 'u1')
+
+        reloaded = AccountCache(str(self.test_dir), ttl=3600)
+        self.assertEqual(reloaded.get('medium', 'token-a', 'user_id'), 'u1')
+        self.assertIsNone(reloaded.get('medium', 'token-b', 'user_id'))
+        self.assertIsNone(AccountCache(str(self.test_dir), ttl=-1).get('medium', 'token-a', 'user_id'))
+        self.assertNotIn('token-a', (self.test_dir / '.tracking' / 'account_cache.json').read_text())
+
+    def test_medium_user_id_persisted(self):
+        """Test the Medium user ID is fetched once and reused by later runs"""
+        response = MagicMock(status_code=200)
+        response.json.return_value = {'data': {'id': 'user-42'}}
+        first = MediumPublisher('token', account_cache=AccountCache(str(self.test_dir)))
+        with patch.object(first, '_request', return_value=response) as mock_request:
+            self.assertEqual(first._get_user_id(), 'user-42')
+            mock_request.assert_called_once()
+        first.close()
+
+        second = MediumPublisher('token', account_cache=AccountCache(str(self.test_dir)))
+        with patch.object(second, '_request') as mock_request:
+            self.assertEqual(second._get_user_id(), 'user-42')
+            mock_request.assert_not_called()
+        second.close()
+
+class EchoPublisher(BasePublisher):
+    """Async-only plugin publisher for a self-hosted target"""
+    platform = 'selfhosted'
+    required_fields = ['title']
+
+    def __init__(self, api_key, pool_size=1):
+        super().__init__({'api-key': api_key or ''}, pool_size=pool_size, api_base='http://localhost/api/')
+
+    async def publish_async(self, content):
+        payload = {'title': content['metadata']['title']}
+        self.validate_payload(payload)
+        return {'url': f"{self.api_base}/{content['original_file']}", 'id': content['original_file']}
+
+    def extract_reference(self, result):
+        return result['url'], result['id']
+
+@pytest.mark.usefixtures("state")
+class TestPublisherPlugins(unittest.TestCase):
+    def test_async_only_publisher_supports_sync_publish(self):
+        """Test a plugin implementing only publish_async can be called synchronously"""
+        with EchoPublisher('key') as publisher:
+            result = publisher.publish({'original_file': 'a.md', 'metadata': {'title': 'A'}})
+            self.assertEqual(result['url'], "http://localhost/api/a.md")
+            with self.assertRaises(ValidationError):
+                publisher.validate_payload({})
+
+    def test_registry_loads_plugin_from_config(self):
+        """Test a platform listed in PLATFORMS gets its registered publisher"""
+        with patch.object(Settings, 'PLATFORMS', ['devto', 'selfhosted']), \
+                patch.dict('scripts.publisher_registry.PUBLISHER_CLASSES'), \
+                patch.dict('scripts.publisher_registry._loaded_classes'):
+            register_publisher('selfhosted', f"{__name__}:EchoPublisher")
+            registry = PublisherRegistry(base_dir=str(self.test_dir))
+            self.assertEqual(list(registry), ['devto', 'selfhosted'])
+            self.assertIsInstance(registry['selfhosted'], EchoPublisher)
+            self.assertEqual(registry.loaded(), ['selfhosted'])
+            registry.close()
+
+    def test_tracker_and_queue_generic_over_platforms(self):
+        """Test tracking and queuing work with any number of platforms"""
+        platforms = ['medium', 'devto', 'hashnode', 'selfhosted']
+        self.tracker.mark_platform_published("post.md", "hashnode", "https://hashnode/post")
+
+        needs = self.tracker.get_unpublished_files({"post.md"}, platforms)
+        self.assertEqual(set(needs), set(platforms))
+        self.assertEqual(needs['hashnode'], set())
+        self.assertEqual(needs['selfhosted'], {"post.md"})
+        self.assertEqual(
+            self.tracker.check_platform_status("post.md", platforms),
+            {'medium': False, 'devto': False, 'hashnode': True, 'selfhosted': False}
+        )
+
+        with patch.object(Settings, 'PLATFORMS', platforms):
+            to_queue, _ = plan_enqueue(self.queue, self.tracker, self.test_dir, set())
+            self.assertEqual(to_queue, {})
+            (self.test_dir / "post.md").write_text("---\ntitle: Post\n---\n\nBody\n", encoding="utf-8")
+            to_queue, _ = plan_enqueue(self.queue, self.tracker, self.test_dir, {"post.md"})
+        self.assertEqual(to_queue, {('medium', 'devto', 'selfhosted'): ["post.md"]})
+
+    def test_engine_fans_out_to_every_platform(self):
+        """Test one post is published to every configured platform"""
+        publishers = {
+            'medium': FakePublisher('medium', delay=0),
+            'hashnode': FakePublisher('hashnode', delay=0),
+            'selfhosted': EchoPublisher('key')
+        }
+        engine = PublishEngine(publishers, self.tracker, self.queue)
+        engine.submit("fan.md", {'original_file': "fan.md", 'metadata': {'title': 'Fan'}}, list(publishers))
+
+        self.assertEqual(engine.wait(), {'published': 3, 'failed': 0})
+        self.assertEqual(
+            self.tracker.check_platform_status("fan.md", list(publishers)),
+            {'medium': True, 'hashnode': True, 'selfhosted': True}
+        )
+        publishers['selfhosted'].close()
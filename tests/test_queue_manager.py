@@ -0,0 +1,121 @@
+import unittest
+import json
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
+import pytest
+from scripts.queue_manager import PostQueue
+from scripts.scheduler import ScheduleCalculator
+
+@pytest.mark.usefixtures("state")
+class TestQueueIndexAndJournal(unittest.TestCase):
+    def test_schedule_index(self):
+        """Test ready posts and the next due time come from the scheduled-time index"""
+        now = datetime.now(timezone.utc)
+        self.queue.add_to_queue("later.md", ["medium"], (now + timedelta(hours=1)).isoformat())
+        self.queue.add_to_queue("due.md", ["medium"], (now - timedelta(hours=1)).isoformat())
+        self.queue.add_to_queue("overdue.md", ["devto"], (now - timedelta(days=1)).isoformat())
+
+        ready = [post["file_path"] for post in self.queue.get_ready_posts()]
+        self.assertEqual(ready, ["overdue.md", "due.md"])
+        self.assertEqual(self.queue.next_due_time().isoformat(), (now - timedelta(days=1)).isoformat())
+
+        # Completed posts leave the index, rescheduled posts move within it
+        self.queue.mark_completed("overdue.md", "devto")
+        self.queue.add_to_queue("due.md", ["medium"], (now + timedelta(hours=2)).isoformat())
+        self.assertEqual(self.queue.get_ready_posts(), [])
+        self.assertEqual(self.queue.next_due_time().isoformat(), (now + timedelta(hours=1)).isoformat())
+
+        # The index is rebuilt from persisted state
+        reloaded = PostQueue(base_dir=str(self.test_dir))
+        self.assertEqual(reloaded.next_due_time(), self.queue.next_due_time())
+
+    def test_add_many_spreads_across_slots(self):
+        """Test bulk queueing fills each slot up to its capacity before moving on"""
+        self.queue.scheduler = ScheduleCalculator([{'hour': 13, 'days': [1, 3]}], slot_capacity=2)
+        self.queue.add_to_queue("existing.md", ["medium"])
+
+        scheduled = self.queue.add_many([f"post{i}.md" for i in range(5)], ["medium", "devto"])
+
+        slots = sorted(set(scheduled.values()) | {self.queue.queued_posts["existing.md"]["scheduled_time"]})
+        self.assertEqual(len(slots), 3)
+        counts = [list(scheduled.values()).count(slot) for slot in slots]
+        # The existing post already takes one place in the first slot
+        self.assertEqual(counts, [1, 2, 2])
+        self.assertEqual(self.queue.queued_posts["post0.md"]["platforms"], ["medium", "devto"])
+
+        reloaded = PostQueue(base_dir=str(self.test_dir))
+        self.assertEqual(reloaded.queued_posts["post4.md"]["scheduled_time"], scheduled["post4.md"])
+
+    def test_pop_ready_and_release(self):
+        """Test claimed posts are not handed out twice until released"""
+        past = (datetime.now(timezone.utc) - timedelta(minutes=5)).isoformat()
+        for name in ("a.md", "b.md", "c.md"):
+            self.queue.add_to_queue(name, ["medium"], past)
+
+        first = self.queue.pop_ready(limit=2)
+        self.assertEqual(len(first), 2)
+        rest = self.queue.pop_ready()
+        self.assertEqual(len(rest), 1)
+        self.assertEqual(self.queue.pop_ready(), [])
+
+        # Claimed posts stay queued on disk
+        self.assertEqual(self.queue.queued_posts[rest[0]["file_path"]]["status"], "queued")
+
+        self.queue.release(rest[0]["file_path"])
+        self.assertEqual(self.queue.pop_ready(), rest)
+
+        self.queue.mark_completed(first[0]["file_path"], "medium")
+        self.queue.release(first[0]["file_path"])
+        self.assertEqual(self.queue.pop_ready(), [])
+
+    def test_mutations_are_journaled(self):
+        """Test mutations append to the journal instead of rewriting the snapshot"""
+        snapshot_before = self.queue.queue_file.read_text()
+        self.queue.add_to_queue("journaled.md", ["medium"])
+
+        self.assertEqual(self.queue.queue_file.read_text(), snapshot_before)
+        self.assertTrue(self.queue.store.journal_file.exists())
+
+        reloaded = PostQueue(base_dir=str(self.test_dir))
+        self.assertIn("journaled.md", reloaded.queued_posts)
+        self.assertFalse(reloaded.store.journal_file.exists())
+
+    def test_torn_journal_line_ignored(self):
+        """Test a partial trailing journal line from a crash is skipped"""
+        self.queue.add_to_queue("kept.md", ["devto"])
+        with self.queue.store.journal_file.open("a") as f:
+            f.write('{"op": "set", "key": "torn.md", "val')
+
+        reloaded = PostQueue(base_dir=str(self.test_dir))
+        self.assertIn("kept.md", reloaded.queued_posts)
+        self.assertNotIn("torn.md", reloaded.queued_posts)
+
+    def test_close_compacts_journal(self):
+        """Test closing the queue writes a complete snapshot"""
+        self.queue.add_to_queue("compacted.md", ["medium"])
+        self.queue.close()
+
+        self.assertFalse(self.queue.store.journal_file.exists())
+        with self.queue.queue_file.open() as f:
+            self.assertIn("compacted.md", json.load(f))
+
+    def test_batch_flushes_once(self):
+        """Test a batch defers journal writes until it commits"""
+        with patch.object(self.queue.store, 'flush', wraps=self.queue.store.flush) as mock_flush:
+            with self.queue.batch():
+                for i in range(5):
+                    self.queue.add_to_queue(f"batched{i}.md", ["medium"])
+                    self.queue.mark_completed(f"batched{i}.md", "medium")
+                self.assertFalse(self.queue.store.journal_file.exists())
+            self.assertEqual(mock_flush.call_count, 1)
+
+        reloaded = PostQueue(base_dir=str(self.test_dir))
+        self.assertEqual(reloaded.queued_posts["batched4.md"]["status"], "completed")
+
+    def test_batch_flushes_on_dirty_count(self):
+        """Test a batch flushes early once enough entries are dirty"""
+        with self.queue.batch(max_dirty=2):
+            self.queue.add_to_queue("first.md", ["medium"])
+            self.assertFalse(self.queue.store.journal_file.exists())
+            self.queue.add_to_queue("second.md", ["medium"])
+            self.assertTrue(self.queue.store.journal_file.exists())
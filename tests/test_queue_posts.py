@@ -0,0 +1,58 @@
+import unittest
+import pytest
+from scripts.queue_posts import plan_enqueue, enqueue_changes
+
+@pytest.mark.usefixtures("state", "write_post")
+class TestQueuePosts(unittest.TestCase):
+    def queue_changes(self, candidates):
+        to_queue, _ = plan_enqueue(self.queue, self.tracker, self.posts_dir, candidates)
+        stats = enqueue_changes(self.queue, self.tracker, self.posts_dir, candidates)
+        self.assertEqual(stats['queued'], sum(len(files) for files in to_queue.values()))
+        return to_queue
+
+    def test_only_new_or_changed_posts_are_queued(self):
+        """Test unchanged, published and already queued posts are left alone"""
+        for name in ("a.md", "b.md", "c.md"):
+            self.write_post(name, "first")
+        self.tracker.mark_platform_published("c.md", "medium", "https://medium.com/c")
+        self.tracker.mark_platform_published("c.md", "devto", "https://dev.to/c")
+
+        first = self.queue_changes({"a.md", "b.md", "c.md"})
+        self.assertEqual(first, {("medium", "devto"): ["a.md", "b.md"]})
+        slot = self.queue.queued_posts["a.md"]["scheduled_time"]
+
+        # Nothing changed, nothing to do
+        self.assertEqual(self.queue_changes({"a.md", "b.md", "c.md"}), {})
+
+        # An edit to a queued post refreshes its hash but keeps its slot
+        self.write_post("a.md", "edited")
+        self.assertEqual(self.queue_changes({"a.md"}), {})
+        self.assertEqual(self.queue.queued_posts["a.md"]["scheduled_time"], slot)
+
+        # A completed post still unpublished somewhere is queued again, even unchanged
+        self.queue.mark_completed("b.md", "medium")
+        self.queue.mark_completed("b.md", "devto")
+        self.assertEqual(self.queue_changes({"b.md"}), {("medium", "devto"): ["b.md"]})
+        self.assertEqual(self.queue.queued_posts["b.md"]["status"], "queued")
+
+    def test_legacy_completed_entry_is_requeued(self):
+        """Test a completed entry without a content hash is queued for its unpublished platforms"""
+        self.write_post("legacy.md", "body")
+        self.tracker.mark_platform_published("legacy.md", "medium", "https://medium.com/legacy")
+        self.queue.add_to_queue("legacy.md", ["medium", "devto"])
+        self.queue.mark_completed("legacy.md", "medium")
+        self.queue.mark_completed("legacy.md", "devto")
+        self.assertNotIn('content_hash', self.queue.queued_posts["legacy.md"])
+
+        self.assertEqual(self.queue_changes({"legacy.md"}), {("devto",): ["legacy.md"]})
+        self.assertEqual(self.queue.queued_posts["legacy.md"]["platforms"], ["devto"])
+
+        # Once queued with its hash, an unchanged post is left alone
+        self.assertEqual(self.queue_changes({"legacy.md"}), {})
+
+    def test_partially_published_post_keeps_missing_platform(self):
+        """Test a post published on one platform is queued only for the other"""
+        self.write_post("half.md", "body")
+        self.tracker.mark_platform_published("half.md", "medium", "https://medium.com/half")
+
+        self.assertEqual(self.queue_changes({"half.md"}), {("devto",): ["half.md"]})
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from scripts.publish_devto import DevToPublisher
+from scripts.utils.exceptions import RateLimitError
+from scripts.utils.rate_limiter import TokenBucket, parse_retry_after
+
+class TestRateLimiter(unittest.TestCase):
+    def test_token_bucket_waits_for_refill(self):
+        """Test the bucket sleeps once the burst is spent"""
+        now = [0.0]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=0.5, capacity=2, clock=lambda: now[0], sleep=fake_sleep)
+        for _ in range(3):
+            self.assertTrue(bucket.acquire())
+
+        self.assertEqual(sleeps, [2.0])
+
+    def test_token_bucket_honours_block(self):
+        """Test block_for delays tokens and acquire gives up at its timeout"""
+        now = [0.0]
+        bucket = TokenBucket(rate=10, capacity=5, clock=lambda: now[0], sleep=lambda s: None)
+        bucket.block_for(30)
+
+        self.assertFalse(bucket.acquire(timeout=10))
+        self.assertAlmostEqual(bucket.wait_time(), 30)
+
+    def test_parse_retry_after(self):
+        """Test Retry-After seconds and reset headers are understood"""
+        self.assertEqual(parse_retry_after({'Retry-After': '12'}), 12.0)
+        self.assertEqual(parse_retry_after({'X-RateLimit-Reset': '7'}), 7.0)
+        self.assertIsNone(parse_retry_after({}))
+
+    def test_publisher_raises_rate_limit_error(self):
+        """Test a 429 from Dev.to surfaces as RateLimitError with the server delay"""
+        publisher = DevToPublisher("key")
+        response = MagicMock(status_code=429, headers={'Retry-After': '42'})
+        with patch.object(publisher.session, 'request', return_value=response):
+            with self.assertRaises(RateLimitError) as context:
+                publisher.publish({'metadata': {'title': 'T', 'description': 'D', 'tags': []},
+                                   'content': '<p>x</p>'})
+
+        self.assertEqual(context.exception.retry_after, 42)
+        publisher.close()
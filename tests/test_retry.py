@@ -0,0 +1,65 @@
+import unittest
+import pytest
+from scripts.publish_engine import PublishEngine
+from scripts.utils.exceptions import NetworkError, AuthenticationError
+from scripts.utils.retry import RetryPolicy
+from .publishers import FakePublisher
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.sleeps = []
+        self.policy = RetryPolicy(max_retries=2, base_delay=1, sleep=self.sleeps.append)
+
+    def test_retries_transient_errors(self):
+        """Test network errors are retried with growing backoff"""
+        outcomes = [NetworkError('medium'), NetworkError('medium'), 'ok']
+
+        def attempt():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        self.assertEqual(self.policy.call(attempt), 'ok')
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(0.5 <= self.sleeps[0] <= 1)
+        self.assertTrue(1 <= self.sleeps[1] <= 2)
+
+    def test_gives_up_after_max_retries(self):
+        """Test the last error is raised once retries are exhausted"""
+        def attempt():
+            raise NetworkError('devto', status_code=503)
+
+        with self.assertRaises(NetworkError):
+            self.policy.call(attempt)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_does_not_retry_permanent_errors(self):
+        """Test authentication failures are raised immediately"""
+        def attempt():
+            raise AuthenticationError('medium')
+
+        with self.assertRaises(AuthenticationError):
+            self.policy.call(attempt)
+        self.assertEqual(self.sleeps, [])
+
+    @pytest.mark.usefixtures("state")
+    def test_attempts_recorded_in_queue(self):
+        """Test the engine stores attempt counts on the queue entry"""
+        self.queue.add_to_queue("retry.md", ["devto"])
+        publisher = FakePublisher('devto', delay=0)
+        original_publish = publisher.publish
+        failures = [NetworkError('devto')]
+
+        def flaky_publish(content):
+            if failures:
+                raise failures.pop()
+            return original_publish(content)
+
+        publisher.publish = flaky_publish
+        engine = PublishEngine({'devto': publisher}, self.tracker, self.queue, retry_policy=self.policy)
+        engine.submit("retry.md", {'original_file': "retry.md"}, ['devto'])
+
+        self.assertEqual(engine.wait(), {'published': 1, 'failed': 0})
+        self.assertEqual(self.queue.queued_posts["retry.md"]["attempts"], {'devto': 2})
+        self.assertEqual(self.queue.queued_posts["retry.md"]["status"], "completed")
@@ -0,0 +1,43 @@
+import unittest
+from datetime import datetime, timezone, timedelta
+from scripts.scheduler import ScheduleCalculator
+
+class TestScheduleCalculator(unittest.TestCase):
+    def setUp(self):
+        """Tuesday/Thursday 13:00 and Saturday 15:00 UTC, like the default schedule"""
+        self.calculator = ScheduleCalculator(
+            [{'hour': 13, 'days': [1, 3]}, {'hour': 15, 'days': [5], 'capacity': 3}],
+            slot_capacity=1
+        )
+        # Wednesday
+        self.now = datetime(2024, 1, 3, 9, 30, tzinfo=timezone.utc)
+
+    def test_next_slot(self):
+        """Test the next slot is computed without scanning days"""
+        self.assertEqual(self.calculator.next_slot(self.now), datetime(2024, 1, 4, 13, tzinfo=timezone.utc))
+        # A slot at exactly now is already taken
+        exact = datetime(2024, 1, 4, 13, tzinfo=timezone.utc)
+        self.assertEqual(self.calculator.next_slot(exact), datetime(2024, 1, 6, 15, tzinfo=timezone.utc))
+        # Sunday wraps into next week
+        sunday = datetime(2024, 1, 7, 23, tzinfo=timezone.utc)
+        self.assertEqual(self.calculator.next_slot(sunday), datetime(2024, 1, 9, 13, tzinfo=timezone.utc))
+
+    def test_slot_time_far_ahead(self):
+        """Test the k-th slot is found arithmetically across weeks"""
+        slot = self.calculator.slot_time(3 * 100 + 1, self.now)
+        self.assertEqual(slot, datetime(2024, 1, 4, 13, tzinfo=timezone.utc) + timedelta(weeks=100))
+
+    def test_assign_respects_capacity_and_occupancy(self):
+        """Test posts fill free places slot by slot"""
+        thursday = datetime(2024, 1, 4, 13, tzinfo=timezone.utc)
+        saturday = datetime(2024, 1, 6, 15, tzinfo=timezone.utc)
+        tuesday = datetime(2024, 1, 9, 13, tzinfo=timezone.utc)
+
+        slots = self.calculator.assign(5, {saturday.timestamp(): 1}, now=self.now)
+
+        self.assertEqual(slots, [thursday, saturday, saturday, tuesday, tuesday + timedelta(days=2)])
+
+    def test_requires_schedule(self):
+        """Test an empty schedule is rejected"""
+        with self.assertRaises(ValueError):
+            ScheduleCalculator([])
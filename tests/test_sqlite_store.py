@@ -0,0 +1,108 @@
+import unittest
+import json
+import sqlite3
+from datetime import datetime, timezone, timedelta
+import pytest
+from scripts.post_tracker import PostTracker
+from scripts.queue_manager import PostQueue
+from scripts.utils.exceptions import StateConflictError
+
+@pytest.mark.usefixtures("scratch_dir")
+class TestSqliteBackend(unittest.TestCase):
+    def setUp(self):
+        """Set up a directory with existing JSON state to migrate"""
+        (self.test_dir / ".queue").mkdir()
+        now = datetime.now(timezone.utc)
+        with (self.test_dir / ".queue" / "post_queue.json").open("w") as f:
+            json.dump({
+                "due.md": {"added_at": now.isoformat(), "platforms": ["medium"], "status": "queued",
+                           "scheduled_time": (now - timedelta(hours=1)).isoformat()},
+                "later.md": {"added_at": now.isoformat(), "platforms": ["devto"], "status": "queued",
+                             "scheduled_time": (now + timedelta(days=1)).isoformat()},
+                "old.md": {"added_at": now.isoformat(), "platforms": [], "status": "completed",
+                           "scheduled_time": now.isoformat(),
+                           "completed_at": (now - timedelta(days=9)).isoformat()}
+            }, f)
+
+    def test_migrates_and_queries_indexes(self):
+        """Test JSON state is migrated and served through indexed queries"""
+        queue = PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+
+        self.assertEqual(len(queue.queued_posts), 3)
+        self.assertEqual([post['file_path'] for post in queue.get_ready_posts()], ["due.md"])
+
+        queue.clean_completed(days_old=7)
+        self.assertNotIn("old.md", queue.queued_posts)
+        queue.close()
+
+        reloaded = PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+        self.assertEqual(set(reloaded.queued_posts), {"due.md", "later.md"})
+        reloaded.close()
+
+    def test_unflushed_changes_visible_to_queries(self):
+        """Test queries inside a batch see changes not yet written to the database"""
+        queue = PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+        with queue.batch():
+            queue.mark_completed("due.md", "medium")
+            self.assertEqual(queue.get_ready_posts(), [])
+
+    def test_close_exports_json(self):
+        """Test closing writes the readable JSON snapshot"""
+        tracker = PostTracker(base_dir=str(self.test_dir), backend='sqlite')
+        tracker.mark_platform_published("due.md", "devto", "https://dev.to/x", 1)
+        tracker.mark_pending("later.md", "medium", "Later")
+
+        needs = tracker.get_unpublished_files({"due.md", "later.md"})
+        self.assertEqual(needs['devto'], {"later.md"})
+        self.assertEqual(needs['medium'], {"due.md"})
+
+        tracker.close()
+        with tracker.tracking_file.open() as f:
+            self.assertIn("due.md", json.load(f))
+
+    def test_reimports_updated_snapshot(self):
+        """Test a snapshot changed outside the store (e.g. by git pull) replaces the database contents"""
+        queue = PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+        queue.close()
+
+        snapshot = self.test_dir / ".queue" / "post_queue.json"
+        data = json.loads(snapshot.read_text())
+        data["due.md"]["status"] = "completed"
+        del data["later.md"]
+        snapshot.write_text(json.dumps(data))
+
+        reloaded = PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+        self.assertEqual(set(reloaded.queued_posts), {"due.md", "old.md"})
+        self.assertEqual(reloaded.get_ready_posts(), [])
+        reloaded.close()
+
+    def test_diverged_snapshot_and_database_conflict(self):
+        """Test loading refuses to pick a side when both copies changed"""
+        queue = PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+        queue.mark_completed("due.md", "medium")
+        # Simulate a crash: the change reached the database but was never exported
+        queue.store.close()
+
+        snapshot = self.test_dir / ".queue" / "post_queue.json"
+        data = json.loads(snapshot.read_text())
+        data["pulled.md"] = dict(data["later.md"])
+        snapshot.write_text(json.dumps(data))
+
+        with self.assertRaises(StateConflictError):
+            PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+        self.assertIn("pulled.md", json.loads(snapshot.read_text()))
+
+    def test_close_releases_connection(self):
+        """Test closing the tracker and queue closes their database connections"""
+        tracker = PostTracker(base_dir=str(self.test_dir), backend='sqlite')
+        queue = PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+        queue.mark_completed("due.md", "medium")
+        tracker.close()
+        queue.close()
+        for store in (tracker.store, queue.store):
+            with self.assertRaises(sqlite3.ProgrammingError):
+                store.connection.execute('SELECT 1')
+
+        reloaded = PostQueue(base_dir=str(self.test_dir), backend='sqlite')
+        self.assertEqual(reloaded.queued_posts["due.md"]["status"], "completed")
+        reloaded.close()
@@ -0,0 +1,91 @@
+import unittest
+import json
+import os
+from unittest.mock import patch, MagicMock
+import pytest
+from scripts.convert_markdown import MarkdownConverter
+from scripts.publish_engine import PublishEngine
+from scripts.publish_medium import MediumPublisher
+from scripts.utils.tracing import Tracer, tracer
+
+@pytest.mark.usefixtures("state", "write_post")
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        """Enable the process-wide tracer"""
+        self.enabled = tracer.enabled
+        tracer.enabled = True
+        tracer.reset()
+
+    def tearDown(self):
+        """Restore the tracer"""
+        tracer.enabled = self.enabled
+        tracer.reset()
+
+    def spans(self, name):
+        return [event for event in tracer.events if event['ph'] == 'X' and event['name'] == name]
+
+    def test_spans_inherit_context_and_export(self):
+        """Test spans carry context attributes and export as trace-event JSON"""
+        local = Tracer(enabled=True)
+        with local.context(file_path="a.md", platform="medium"):
+            with local.span('outer') as span:
+                with local.context(attempt=2), local.span('inner', category='http'):
+                    pass
+                span.set(http_status=201)
+        with self.assertRaises(ValueError):
+            with local.span('failing'):
+                raise ValueError("boom")
+
+        trace = json.loads(local.export(self.test_dir / "run.trace.json").read_text())
+        events = {event['name']: event for event in trace['traceEvents']}
+        self.assertEqual(events['thread_name']['ph'], 'M')
+        self.assertEqual(events['inner']['args'], {'file_path': "a.md", 'platform': "medium", 'attempt': 2})
+        self.assertEqual(events['outer']['args']['http_status'], 201)
+        self.assertNotIn('attempt', events['outer']['args'])
+        self.assertIn('ValueError', events['failing']['args']['error'])
+        self.assertLessEqual(events['outer']['ts'], events['inner']['ts'])
+
+    def test_disabled_tracer_records_nothing(self):
+        """Test a disabled tracer hands out no-op spans"""
+        local = Tracer(enabled=False)
+        with local.span('ignored') as span:
+            span.set(http_status=200)
+        self.assertEqual(local.events, [])
+
+    def test_publish_spans_carry_post_details(self):
+        """Test HTTP spans of a publication carry the post, platform, attempt and status"""
+        def fake_request(session, bucket, platform, method, url, **kwargs):
+            response = MagicMock(status_code=200 if method == 'GET' else 201)
+            response.json.return_value = {'data': {'id': 'u1', 'url': f"https://medium/{method}"}}
+            return response
+
+        publisher = MediumPublisher('token')
+        with patch("scripts.base_publisher.rate_limited_request", side_effect=fake_request):
+            engine = PublishEngine({'medium': publisher}, self.tracker, self.queue)
+            engine.submit("traced.md", {
+                'original_file': "traced.md", 'content': "<p>Hi</p>",
+                'metadata': {'title': "Traced", 'tags': []}
+            }, ['medium'])
+            self.assertEqual(engine.wait(), {'published': 1, 'failed': 0})
+        publisher.close()
+
+        post_requests = [span for span in self.spans('http') if span['args']['method'] == 'POST']
+        self.assertEqual(len(post_requests), 1)
+        self.assertEqual(post_requests[0]['args']['file_path'], "traced.md")
+        self.assertEqual(post_requests[0]['args']['platform'], "medium")
+        self.assertEqual(post_requests[0]['args']['attempt'], 1)
+        self.assertEqual(post_requests[0]['args']['http_status'], "201")
+        self.assertEqual(len(self.spans('medium.get_user_id')), 1)
+        self.assertTrue(self.spans('tracker.save'))
+        self.assertTrue(self.spans('publish.post')[0]['args']['published'])
+
+    def test_worker_spans_merged(self):
+        """Test conversion spans recorded in worker processes reach the parent trace"""
+        for i in range(4):
+            self.write_post(f"t{i}.md", f"Body {i}", title=f"T {i}", description="Trace")
+        converter = MarkdownConverter(str(self.posts_dir), str(self.test_dir / "dist"), use_cache=False)
+        list(converter.convert_many(workers=2, chunk_size=2))
+
+        spans = self.spans('convert')
+        self.assertEqual(sorted(span['args']['file_path'] for span in spans), ["t0.md", "t1.md", "t2.md", "t3.md"])
+        self.assertNotIn(os.getpid(), {span['pid'] for span in spans})